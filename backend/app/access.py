@@ -0,0 +1,66 @@
+"""
+Alcance de lectura del usuario autenticado.
+
+Una sola regla para todos los endpoints: administradores (is_admin o rol
+"admin") ven todo; supervisores, el equipo asignado a su usuario (claim
+team_id); jugadores, el equipo de su perfil de jugador; invitados y roles
+desconocidos, nada.
+
+El alcance se entrega como expresiones SQL que se agregan a la consulta del
+endpoint. El equipo del jugador se resuelve con una subconsulta escalar dentro
+de esa misma sentencia: no hay una consulta previa por el perfil y el filtro
+no queda desactualizado si el jugador cambia de equipo.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import false, select
+
+from . import models
+
+
+@dataclass(frozen=True)
+class AccessContext:
+    user_id: int
+    role: str
+    is_admin: bool
+    team_id: Optional[int] = None  # Equipo asignado al usuario (supervisores)
+
+    @classmethod
+    def from_principal(cls, principal) -> "AccessContext":
+        role = principal.role or "player"  # mismo valor por defecto que users.role
+        return cls(
+            user_id=principal.id,
+            role=role,
+            is_admin=bool(principal.is_admin) or role == "admin",
+            team_id=principal.team_id,
+        )
+
+    @property
+    def sees_all(self) -> bool:
+        return self.is_admin
+
+    @property
+    def team(self):
+        """Equipo visible: entero, subconsulta escalar o None si no ve ninguno"""
+        if self.role == "supervisor":
+            return self.team_id
+        if self.role == "player":
+            return (
+                select(models.Player.team_id)
+                .where(models.Player.user_id == self.user_id)
+                .limit(1)
+                .correlate(None)  # no correlacionar con la tabla players de la consulta externa
+                .scalar_subquery()
+            )
+        return None
+
+    def team_filter(self, column):
+        """Filtro para una columna con id de equipo; None si no hay que filtrar"""
+        if self.sees_all:
+            return None
+        team = self.team
+        if team is None:
+            return false()
+        return column == team
@@ -1,23 +1,53 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional
+
 from jose import jwt, JWTError
-from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache import token_cache
+from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def create_refresh_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+def create_refresh_token(email: str, record: models.RefreshToken):
+    """Refresh token: solo identifica la sesión (sub, jti y familia), sin claims de
+    autorización. /auth/refresh lee el usuario de la base para emitir el access token"""
+    to_encode = {"sub": email, "jti": record.jti, "fam": record.family_id, "exp": record.expires_at, "type": "refresh"}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def decode_token(token: str) -> dict:
+    """jwt.decode con caché por sha256 del token; lanza JWTError si no es válido.
+
+    Solo se guardan payloads ya verificados y nunca más allá de su `exp`, así que
+    un acierto equivale a volver a decodificar. El dict se comparte: no modificarlo.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp") is None or payload["exp"] > time.time():
+            return payload
+        token_cache.invalidate(key)
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    ttl = token_cache.ttl
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return payload
+
 def verify_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return decode_token(token)
     except JWTError:
         return None
 
@@ -28,3 +58,173 @@ def is_token_expired(payload: dict):
     if not exp:
         return True
     return datetime.utcnow().timestamp() > exp
+
+
+# ===== CLAIMS Y PRINCIPAL =====
+
+def user_claims(user: models.User) -> dict:
+    """Claims del token: lo necesario para autorizar sin leer la tabla users"""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "role": user.role,
+        "team_id": user.team_id,
+        "adm": bool(user.is_admin),
+        "ver": user.token_version or 0,
+    }
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Usuario autenticado según los claims del token.
+
+    Tiene los mismos atributos que usan los endpoints de models.User para
+    autorizar (id, email, role, team_id, is_admin).
+    """
+    id: int
+    email: str
+    role: Optional[str]
+    team_id: Optional[int]
+    is_admin: bool
+    token_version: int = 0
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        # Tokens emitidos antes de los claims extendidos solo traen "sub"
+        if payload.get("uid") is None or payload.get("sub") is None:
+            return None
+        return cls(
+            id=payload["uid"],
+            email=payload["sub"],
+            role=payload.get("role"),
+            team_id=payload.get("team_id"),
+            is_admin=bool(payload.get("adm")),
+            token_version=payload.get("ver", 0),
+        )
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            team_id=user.team_id,
+            is_admin=bool(user.is_admin),
+            token_version=user.token_version or 0,
+        )
+
+
+# ===== VERSIONES DE TOKEN =====
+
+class TokenVersions:
+    """Versión vigente de token por usuario, en memoria.
+
+    Solo guarda los usuarios con versión > 0 (los que alguna vez fueron
+    revocados), así que el mapa es pequeño. Se carga al arrancar, se actualiza
+    al confirmar cambios en este proceso y se recarga periódicamente para ver
+    los de otros workers.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def current(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def is_current(self, user_id: int, version: int) -> bool:
+        return (version or 0) >= self.current(user_id)
+
+    def set(self, user_id: int, version: int):
+        with self._lock:
+            if version > self._versions.get(user_id, 0):
+                self._versions[user_id] = version
+
+    def load(self, conn):
+        rows = conn.execute(
+            select(models.User.id, models.User.token_version).where(models.User.token_version > 0)
+        ).all()
+        with self._lock:
+            self._versions = {user_id: version for user_id, version in rows}
+        return len(rows)
+
+    def __len__(self):
+        return len(self._versions)
+
+
+token_versions = TokenVersions()
+
+# Cambiar estos campos cambia los claims: los tokens anteriores dejan de valer
+CLAIM_FIELDS = ("email", "role", "team_id", "is_admin")
+
+
+def bump_token_version(user: models.User):
+    """Revoca los tokens emitidos para el usuario (se aplica al hacer commit)"""
+    user.token_version = (user.token_version or 0) + 1
+
+
+@event.listens_for(models.User, "before_update")
+def _bump_on_claim_change(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.token_version.history.added:
+        return
+    if any(state.attrs[field].history.has_changes() for field in CLAIM_FIELDS):
+        bump_token_version(target)
+
+
+@event.listens_for(models.User, "after_update")
+def _remember_token_version(mapper, connection, target):
+    session = inspect(target).session
+    if session is not None and target.token_version:
+        session.info.setdefault("token_versions", {})[target.id] = target.token_version
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_token_versions(session):
+    for user_id, version in session.info.pop("token_versions", {}).items():
+        token_versions.set(user_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_token_versions(session):
+    session.info.pop("token_versions", None)
+
+
+# ===== REFRESH TOKENS REVOCADOS =====
+
+class RevokedRefreshFamilies:
+    """Sesiones (familias de refresh tokens) revocadas, en memoria.
+
+    /auth/refresh rechaza un token de una sesión revocada sin ir a la base. La
+    tabla refresh_tokens sigue mandando: la rotación solo acepta filas sin usar
+    ni revocar, así que un worker que aún no vio una revocación también responde
+    401. Cada familia se guarda hasta que vence su último token.
+    """
+
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, family_id) -> bool:
+        return family_id in self._families
+
+    def __len__(self):
+        return len(self._families)
+
+    def add(self, family_id: str, expires_at: datetime):
+        with self._lock:
+            self._families[family_id] = max(expires_at, self._families.get(family_id, expires_at))
+
+    def load(self, conn):
+        token = models.RefreshToken
+        rows = conn.execute(
+            select(token.family_id, func.max(token.expires_at))
+            .where(token.revoked_at.isnot(None), token.expires_at > datetime.utcnow())
+            .group_by(token.family_id)
+        ).all()
+        with self._lock:
+            self._families = {family_id: expires_at for family_id, expires_at in rows}
+        return len(rows)
+
+
+revoked_refresh_families = RevokedRefreshFamilies()
@@ -0,0 +1,132 @@
+"""
+Cachés en memoria del proceso.
+
+`user_cache` guarda una copia de los usuarios autenticados por email (el `sub`
+del JWT) para que get_current_user no consulte la base en cada petición. Cada
+worker tiene su propia caché: un cambio hecho en otro proceso se ve, como
+máximo, después de USER_CACHE_TTL_SECONDS.
+
+`token_cache` evita verificar firma y parsear el mismo JWT en cada petición.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS
+
+
+class TTLCache:
+    """LRU acotado con expiración por entrada, seguro entre hilos"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+user_cache = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+# Payloads de JWT ya verificados, por sha256 del token (ver auth.decode_token)
+token_cache = TTLCache(TOKEN_CACHE_MAX_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
+
+def snapshot_user(user: models.User) -> models.User:
+    """Copia transitoria (sin sesión) con las columnas del usuario.
+
+    Los endpoints solo leen atributos de current_user; la copia se puede
+    compartir entre peticiones sin quedar ligada a una sesión cerrada.
+    """
+    columns = inspect(models.User).column_attrs
+    return models.User(**{attr.key: getattr(user, attr.key) for attr in columns})
+
+
+# ===== INVALIDACIÓN =====
+# Cualquier cambio de un usuario (rol, equipo, is_admin, contraseña...) lo saca de
+# la caché al hacer flush y otra vez al confirmar, para que una petición concurrente
+# no vuelva a guardar la versión anterior mientras la transacción sigue abierta.
+
+def _invalidate_user(mapper, connection, target):
+    emails = {target.email}
+    history = inspect(target).attrs.email.history
+    emails.update(email for email in history.deleted or () if email)
+    session = inspect(target).session
+    for email in emails:
+        user_cache.invalidate(email)
+        if session is not None:
+            session.info.setdefault("invalidated_users", set()).add(email)
+
+
+event.listen(models.User, "after_update", _invalidate_user)
+event.listen(models.User, "after_delete", _invalidate_user)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for email in session.info.pop("invalidated_users", ()):
+        user_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated_users(session):
+    session.info.pop("invalidated_users", None)
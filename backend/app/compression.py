@@ -0,0 +1,198 @@
+"""
+Compresión de respuestas (gzip y, si está instalado, brotli).
+
+Middleware ASGI propio en vez del GZipMiddleware de Starlette porque necesitamos:
+- lista de tipos de contenido comprimibles (JSON, NDJSON, CSV, texto);
+- umbral de tamaño y nivel configurables por algoritmo;
+- brotli opcional (`pip install brotli`), elegido según Accept-Encoding;
+- respuestas en streaming comprimidas por bloque (flush por cada mensaje), para
+  que un export largo siga llegando a medida que se genera.
+
+Las respuestas de un solo mensaje bajo el umbral, las que ya traen
+Content-Encoding y los 204/304 pasan sin cambios.
+"""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # opcional
+    brotli = None
+
+from .config import (
+    COMPRESSION_BROTLI_LEVEL,
+    COMPRESSION_CONTENT_TYPES,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+
+
+# Contadores del proceso (GET /admin/compression)
+compression_stats = {"compressed": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """{"gzip": 1.0, "br": 0.8, ...} según los valores q de Accept-Encoding"""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS: cabecera y trailer gzip (no zlib)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def compress_once(coding: str, data: bytes, level: int) -> bytes:
+    """Respuesta completa en memoria: sin flush intermedios"""
+    if coding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_level: int = COMPRESSION_BROTLI_LEVEL,
+        content_types=COMPRESSION_CONTENT_TYPES,
+        stats: dict = compression_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level}
+        if brotli is not None and brotli_level > 0:
+            self.levels["br"] = brotli_level
+        self.content_types = tuple(content_types)
+        self.stats = stats
+
+    def choose(self, accept_encoding: str):
+        """Algoritmo a usar: brotli si el cliente lo acepta con igual o más q que gzip"""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for coding in ("br", "gzip"):  # a igual q, brotli primero
+            quality = accepted.get(coding, wildcard)
+            if coding in self.levels and quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def compressible(self, headers: dict) -> bool:
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return (
+            "content-encoding" not in headers
+            and media_type.startswith(self.content_types)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        coding = self.choose(request_headers.get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, coding)(self.app, scope, receive, send)
+
+
+class _CompressedResponse:
+    """Estado de una respuesta: decide al ver el primer bloque del cuerpo"""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str):
+        self.middleware = middleware
+        self.coding = coding
+        self.level = middleware.levels[coding]
+        self.start = None
+        self.compressor = None  # solo en streaming
+        self.passthrough = False
+
+    async def __call__(self, app, scope, receive, send):
+        self.send = send
+        await app(scope, receive, self.on_message)
+
+    async def on_message(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in message.get("headers", [])}
+            self.passthrough = message["status"] in (204, 304) or not self.middleware.compressible(headers)
+            if self.passthrough:
+                self.middleware.stats["skipped"] += 1
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        stats = self.middleware.stats
+        if self.compressor is None and self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                stats["skipped"] += 1
+                await self.send(start)
+                await self.send(message)
+                return
+            stats["compressed"] += 1
+            if not more_body:
+                compressed = compress_once(self.coding, body, self.level)
+                stats["bytes_in"] += len(body)
+                stats["bytes_out"] += len(compressed)
+                await self.send(self._start(start, len(compressed)))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            self.compressor = _Brotli(self.level) if self.coding == "br" else _Gzip(self.level)
+            await self.send(self._start(start, None))
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        stats["bytes_in"] += len(body)
+        stats["bytes_out"] += len(chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _start(self, start: dict, length):
+        headers = [(key, value) for key, value in start.get("headers", []) if key.lower() not in (b"content-length", b"vary")]
+        vary = [value.decode("latin-1") for key, value in start.get("headers", []) if key.lower() == b"vary"]
+        if not any("accept-encoding" in value.lower() for value in vary):
+            vary.append("Accept-Encoding")
+        headers.append((b"vary", ", ".join(vary).encode("latin-1")))
+        headers.append((b"content-encoding", self.coding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**start, "headers": headers}
@@ -0,0 +1,61 @@
+"""
+GET condicional (ETag / If-None-Match) en los listados.
+
+La versión de un listado sale de una consulta de agregados (filas y última
+modificación de la tabla y de las que anida, ver crud.get_list_version_async)
+con los mismos filtros y alcance que el listado. El ETag débil es un hash de esa
+versión, la ruta con su query string y el alcance de quien pregunta. Si coincide
+con If-None-Match se responde 304 sin cargar ni serializar filas.
+
+Last-Modified se envía como referencia, pero solo se evalúa If-None-Match: una
+fecha no refleja filas borradas.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+class NotModified(Exception):
+    """Respuesta 304 con las cabeceras de validación"""
+
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+def weak_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil (RFC 9110): W/"x" y "x" son el mismo validador"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def last_modified(version: tuple) -> Optional[datetime]:
+    stamps = [value for value in version if isinstance(value, datetime)]
+    if not stamps:
+        return None
+    # SQLite devuelve fechas sin zona (UTC por CURRENT_TIMESTAMP)
+    return max(stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc) for stamp in stamps)
+
+
+def check_not_modified(request: Request, response: Response, version: tuple, scope) -> None:
+    """Agrega ETag y Last-Modified a la respuesta; lanza NotModified si el cliente ya la tiene"""
+    etag = weak_etag(request.url.path, request.url.query, scope, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}  # depende del token: nunca en cachés compartidas
+    modified = last_modified(version)
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified.astimezone(timezone.utc), usegmt=True)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModified(headers)
+    response.headers.update(headers)
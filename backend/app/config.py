@@ -3,8 +3,101 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _env_int(name: str, default=None):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+def _env_bool(name: str, default=None):
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./prosoccer.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")  # None = derivar de DATABASE_URL
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 día
 REFRESH_TOKEN_EXPIRE_DAYS = 30  # 30 días para refresh token
+
+# Comprobación de versión del esquema al arrancar: "strict" (falla si faltan
+# migraciones), "warn" (solo avisa) u "off". Las migraciones se aplican con migrate.py.
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn")
+
+# Pool de conexiones (None = usar el perfil del dialecto en database.py)
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE")
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW")
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT")  # segundos esperando una conexión libre
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE")  # segundos antes de reciclar una conexión (-1 = nunca)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING")
+
+# Perfil SQLite (se aplica en cada conexión nueva)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # WAL: lectores y escritor no se bloquean
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL es seguro con WAL
+SQLITE_MMAP_SIZE = _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)  # bytes
+SQLITE_CACHE_SIZE = _env_int("SQLITE_CACHE_SIZE", -64000)  # negativo = KiB (64 MB)
+SQLITE_BUSY_TIMEOUT_MS = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)  # espera por locks antes de "database is locked"
+SQLITE_FOREIGN_KEYS = _env_bool("SQLITE_FOREIGN_KEYS", True)
+
+# Réplica de lectura (opcional). Sin réplica todas las lecturas van al primario.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL")  # None = derivar de DATABASE_REPLICA_URL
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))  # sobre este retraso se lee del primario
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "10"))  # segundos entre mediciones
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))  # lecturas al primario tras una escritura
+
+# Operaciones masivas (/players/bulk, /matches/{id}/attendance/bulk, /matches/{id}/events/bulk)
+BULK_MAX_ROWS = _env_int("BULK_MAX_ROWS", 1000)  # filas por petición
+
+# Caché de usuarios autenticados en get_current_user (0 = desactivada)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = _env_int("USER_CACHE_MAX_SIZE", 10000)
+
+# Versiones de token: cada worker recarga el mapa de revocaciones cada N segundos
+TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv("TOKEN_VERSION_REFRESH_SECONDS", "30"))
+
+# Pool de procesos para bcrypt (0 workers = hashear en el threadpool compartido)
+HASH_POOL_WORKERS = _env_int("HASH_POOL_WORKERS", min(4, os.cpu_count() or 1))
+HASH_POOL_MAX_PENDING = _env_int("HASH_POOL_MAX_PENDING", 64)  # por encima se responde 503
+HASH_POOL_RETRY_AFTER = _env_int("HASH_POOL_RETRY_AFTER", 1)  # segundos en la cabecera Retry-After
+
+# Caché de tokens decodificados (sha256 del token -> payload validado; 0 = desactivada)
+TOKEN_CACHE_MAX_SIZE = _env_int("TOKEN_CACHE_MAX_SIZE", 4096)
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))  # tope; nunca más allá de exp
+
+# Refresh tokens: cada N segundos se borran los vencidos y se recargan las sesiones revocadas
+REFRESH_TOKEN_PURGE_SECONDS = float(os.getenv("REFRESH_TOKEN_PURGE_SECONDS", "3600"))
+
+# Listados grandes (/players/, /matches/, /teams/{id}) serializados sin response_model (ver app/serialization.py)
+FAST_JSON_RESPONSES = _env_bool("FAST_JSON_RESPONSES", False)
+
+# Exports en streaming: filas por bloque leído de la base y enviado al cliente
+EXPORT_BATCH_SIZE = _env_int("EXPORT_BATCH_SIZE", 1000)
+
+# /players/search: candidatos por etapa, umbral de coincidencia aproximada y máximo de resultados
+SEARCH_CANDIDATES = _env_int("SEARCH_CANDIDATES", 200)
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.5"))  # 0-1, parte de los trigramas en común
+SEARCH_MAX_LIMIT = _env_int("SEARCH_MAX_LIMIT", 100)
+# Topes de la búsqueda aproximada: por encima se usan solo prefijo y contenido
+SEARCH_MAX_QUERY_LENGTH = _env_int("SEARCH_MAX_QUERY_LENGTH", 64)  # caracteres de q (más = 422)
+SEARCH_FUZZY_MAX_WORDS = _env_int("SEARCH_FUZZY_MAX_WORDS", 4)
+SEARCH_FUZZY_MAX_CLAUSES = _env_int("SEARCH_FUZZY_MAX_CLAUSES", 200)  # combinaciones de trigramas en el MATCH
+
+# Compresión de respuestas (gzip; brotli si está instalado y el nivel es > 0)
+COMPRESSION_ENABLED = _env_bool("COMPRESSION_ENABLED", True)
+COMPRESSION_MIN_SIZE = _env_int("COMPRESSION_MIN_SIZE", 1024)  # bytes; respuestas menores van sin comprimir
+COMPRESSION_GZIP_LEVEL = _env_int("COMPRESSION_GZIP_LEVEL", 6)  # 1-9
+COMPRESSION_BROTLI_LEVEL = _env_int("COMPRESSION_BROTLI_LEVEL", 4)  # 1-11; 0 = solo gzip
+COMPRESSION_CONTENT_TYPES = tuple(  # prefijos de Content-Type comprimibles
+    prefix.strip() for prefix in os.getenv("COMPRESSION_CONTENT_TYPES", "application/json,application/x-ndjson,text/").split(",") if prefix.strip()
+)
+
+# Límite de intentos de login y registro (token bucket): "local", "redis" u "off"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "local")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_IP_BURST = _env_int("RATE_LIMIT_IP_BURST", 20)  # intentos seguidos por IP
+RATE_LIMIT_IP_PER_MINUTE = _env_int("RATE_LIMIT_IP_PER_MINUTE", 10)  # ritmo sostenido por IP
+RATE_LIMIT_ACCOUNT_BURST = _env_int("RATE_LIMIT_ACCOUNT_BURST", 5)  # por email
+RATE_LIMIT_ACCOUNT_PER_MINUTE = _env_int("RATE_LIMIT_ACCOUNT_PER_MINUTE", 2)
+RATE_LIMIT_MAX_KEYS = _env_int("RATE_LIMIT_MAX_KEYS", 100000)  # backend local: claves en memoria
+RATE_LIMIT_TRUST_FORWARDED = _env_bool("RATE_LIMIT_TRUST_FORWARDED", False)  # IP desde X-Forwarded-For (detrás de un proxy)
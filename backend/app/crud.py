@@ -1,40 +1,136 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from . import models, schemas
-from passlib.context import CryptContext
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, cast, func, lambda_stmt, literal, select, text, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from pydantic import ValidationError
+from . import auth, hashing, models, schemas, search
+from .config import REFRESH_TOKEN_EXPIRE_DAYS, SEARCH_CANDIDATES, SEARCH_FUZZY_MAX_CLAUSES, SEARCH_FUZZY_MAX_WORDS, SEARCH_MIN_SIMILARITY
+from .database import save, unit_of_work
+from .pagination import apply_keyset
 from typing import List, Optional
-from datetime import datetime
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from datetime import datetime, timedelta
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+pwd_context = hashing.pwd_context
+
+# Orden estable de los listados paginados: (clave de orden, id)
+PLAYER_PAGE_KEYS = (models.Player.name, models.Player.id)
+TEAM_PAGE_KEYS = (models.Team.name, models.Team.id)
+MATCH_PAGE_KEYS = (models.Match.date, models.Match.id)
+VENUE_PAGE_KEYS = (models.Venue.id,)
+EXTERNAL_TEAM_PAGE_KEYS = (models.ExternalTeam.id,)
+
+# Relaciones que anidan los esquemas de salida (PlayerOut, MatchOut...), cargadas
+# por adelantado: un SELECT ... IN por relación en vez de uno por fila al serializar.
+# Por relación, para cargar solo las pedidas con ?fields= (ver app/fields.py)
+PLAYER_RELATION_OPTIONS = {
+    "user": selectinload(models.Player.user),
+    "team": selectinload(models.Player.team),
+    "position_zone": selectinload(models.Player.position_zone),
+    "position_specific": selectinload(models.Player.position_specific).selectinload(models.PositionSpecific.zone),
+}
+PLAYER_OUT_OPTIONS = tuple(PLAYER_RELATION_OPTIONS.values())
+
+MATCH_RELATION_OPTIONS = {
+    "venue": selectinload(models.Match.venue),
+    "home_team": selectinload(models.Match.home_team),
+    "away_team": selectinload(models.Match.away_team),
+    "generated_team_a": selectinload(models.Match.generated_team_a),
+    "generated_team_b": selectinload(models.Match.generated_team_b),
+    "creator": selectinload(models.Match.creator),
+}
+MATCH_OUT_OPTIONS = tuple(MATCH_RELATION_OPTIONS.values())
+
+ATTENDANCE_OUT_OPTIONS = (
+    selectinload(models.PlayerAttendance.player).options(*PLAYER_OUT_OPTIONS),
+    selectinload(models.PlayerAttendance.match).options(*MATCH_OUT_OPTIONS),
+)
+
+NOTIFICATION_OUT_OPTIONS = (
+    selectinload(models.Notification.recipient),
+    selectinload(models.Notification.match).options(*MATCH_OUT_OPTIONS),
+)
+
+MATCH_EVENT_OUT_OPTIONS = (
+    selectinload(models.MatchEvent.player).options(*PLAYER_OUT_OPTIONS),
+    selectinload(models.MatchEvent.match).options(*MATCH_OUT_OPTIONS),
+)
+
+CHAMPIONSHIP_TEAM_OUT_OPTIONS = (
+    selectinload(models.ChampionshipTeam.championship),
+    selectinload(models.ChampionshipTeam.team),
+)
+
+TEAM_WITH_PLAYERS_OPTIONS = (
+    selectinload(models.Team.players).options(*PLAYER_OUT_OPTIONS),
+)
+
+
+# Consultas más frecuentes (autenticación y posiciones) como lambda_stmt: la
+# construcción y la compilación quedan en caché y los argumentos viajan como
+# parámetros enlazados. Se comparten entre Session y AsyncSession.
+def user_by_email_stmt(email: str):
+    return lambda_stmt(lambda: select(models.User).where(models.User.email == email).limit(1))
+
+def user_by_id_stmt(user_id: int):
+    return lambda_stmt(lambda: select(models.User).where(models.User.id == user_id).limit(1))
+
+def player_by_user_id_stmt(user_id: int):
+    return lambda_stmt(lambda: select(models.Player).where(models.Player.user_id == user_id).limit(1))
+
+def position_zone_stmt(abbreviation: str = None, zone_id: int = None):
+    stmt = lambda_stmt(lambda: select(models.PositionZone).where(models.PositionZone.is_active == True))
+    if abbreviation is not None:
+        stmt += lambda s: s.where(models.PositionZone.abbreviation == abbreviation)
+    if zone_id is not None:
+        stmt += lambda s: s.where(models.PositionZone.id == zone_id)
+    return stmt + (lambda s: s.limit(1))
+
+def position_specific_stmt(abbreviation: str = None, specific_id: int = None):
+    stmt = lambda_stmt(lambda: select(models.PositionSpecific).where(models.PositionSpecific.is_active == True))
+    if abbreviation is not None:
+        stmt += lambda s: s.where(models.PositionSpecific.abbreviation == abbreviation)
+    if specific_id is not None:
+        stmt += lambda s: s.where(models.PositionSpecific.id == specific_id)
+    return stmt + (lambda s: s.limit(1))
 
 # User functions
 def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+    return db.execute(user_by_email_stmt(email)).scalars().first()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = pwd_context.hash(user.password)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: str = None):
+    """Los endpoints pasan el hash ya calculado en hashing_pool; los scripts no"""
+    hashed_password = hashed_password or hashing.hash_password(user.password)
     db_user = models.User(email=user.email, hashed_password=hashed_password, full_name=user.full_name)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    save(db, db_user)
     return db_user
 
-def create_admin_user(db: Session, email: str, password: str, full_name: str = None):
-    hashed_password = pwd_context.hash(password)
+def create_admin_user(db: Session, email: str, password: str, full_name: str = None, hashed_password: str = None):
+    hashed_password = hashed_password or hashing.hash_password(password)
     db_user = models.User(email=email, hashed_password=hashed_password, full_name=full_name, is_admin=True)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    save(db, db_user)
     return db_user
 
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user_by_email(db, email)
-    if not user or not pwd_context.verify(password, user.hashed_password):
+    if not user or not hashing.verify_password(password, user.hashed_password):
+        return None
+    return user
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """Como authenticate_user, con bcrypt en el pool de procesos de hashing"""
+    user = await get_user_by_email_async(db, email)
+    if not user or not await hashing.hashing_pool.verify(password, user.hashed_password):
         return None
     return user
 
 def get_user_by_id(db: Session, user_id: int):
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return db.execute(user_by_id_stmt(user_id)).scalars().first()
 
 # Position functions
 def get_position_zones(db: Session, skip: int = 0, limit: int = 100):
@@ -43,10 +139,7 @@ def get_position_zones(db: Session, skip: int = 0, limit: int = 100):
 
 def get_position_zone_by_abbreviation(db: Session, abbreviation: str):
     """Get position zone by abbreviation"""
-    return db.query(models.PositionZone).filter(
-        models.PositionZone.abbreviation == abbreviation,
-        models.PositionZone.is_active == True
-    ).first()
+    return db.execute(position_zone_stmt(abbreviation=abbreviation)).scalars().first()
 
 def get_position_specifics(db: Session, skip: int = 0, limit: int = 100):
     """Get all position specifics"""
@@ -61,38 +154,29 @@ def get_position_specifics_by_zone(db: Session, zone_id: int):
 
 def get_position_specific_by_abbreviation(db: Session, abbreviation: str):
     """Get position specific by abbreviation"""
-    return db.query(models.PositionSpecific).filter(
-        models.PositionSpecific.abbreviation == abbreviation,
-        models.PositionSpecific.is_active == True
-    ).first()
+    return db.execute(position_specific_stmt(abbreviation=abbreviation)).scalars().first()
 
 def get_position_specific_by_id(db: Session, specific_id: int):
     """Get position specific by ID"""
-    return db.query(models.PositionSpecific).filter(
-        models.PositionSpecific.id == specific_id,
-        models.PositionSpecific.is_active == True
-    ).first()
+    return db.execute(position_specific_stmt(specific_id=specific_id)).scalars().first()
 
 def get_position_zone_by_id(db: Session, zone_id: int):
     """Get position zone by ID"""
-    return db.query(models.PositionZone).filter(
-        models.PositionZone.id == zone_id,
-        models.PositionZone.is_active == True
-    ).first()
+    return db.execute(position_zone_stmt(zone_id=zone_id)).scalars().first()
 
 # Team functions
 def create_team(db: Session, team: schemas.TeamCreate):
     db_team = models.Team(**team.dict())
     db.add(db_team)
-    db.commit()
-    db.refresh(db_team)
+    save(db, db_team)
     return db_team
 
 def get_team(db: Session, team_id: int):
     return db.query(models.Team).filter(models.Team.id == team_id).first()
 
-def get_teams(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Team).offset(skip).limit(limit).all()
+def get_teams(db: Session, skip: int = 0, limit: int = 100, cursor: str = None):
+    query = apply_keyset(db.query(models.Team), TEAM_PAGE_KEYS, cursor)
+    return query.offset(skip).limit(limit).all()
 
 def update_team(db: Session, team_id: int, team: schemas.TeamUpdate):
     db_team = get_team(db, team_id)
@@ -100,52 +184,54 @@ def update_team(db: Session, team_id: int, team: schemas.TeamUpdate):
         update_data = team.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_team, field, value)
-        db.commit()
-        db.refresh(db_team)
+        save(db, db_team)
     return db_team
 
 def delete_team(db: Session, team_id: int):
     db_team = get_team(db, team_id)
     if db_team:
         db.delete(db_team)
-        db.commit()
+        save(db)
         return True
     return False
 
 def get_team_with_players(db: Session, team_id: int):
-    return db.query(models.Team).filter(models.Team.id == team_id).first()
+    return db.query(models.Team).options(*TEAM_WITH_PLAYERS_OPTIONS).filter(models.Team.id == team_id).first()
 
 # Player functions
 def create_player(db: Session, player: schemas.PlayerCreate):
     db_player = models.Player(**player.dict())
     db.add(db_player)
-    db.commit()
-    db.refresh(db_player)
+    save(db, db_player)
     return db_player
 
 def get_player(db: Session, player_id: int):
     return db.query(models.Player).filter(models.Player.id == player_id).first()
 
+def get_player_by_email(db: Session, email: str):
+    return db.query(models.Player).filter(models.Player.email == email).first()
+
 def get_players_by_team(db: Session, team_id: int):
-    return db.query(models.Player).filter(models.Player.team_id == team_id).all()
+    return db.query(models.Player).options(*PLAYER_OUT_OPTIONS).filter(models.Player.team_id == team_id).all()
 
 def get_player_by_user_id(db: Session, user_id: int):
-    return db.query(models.Player).filter(models.Player.user_id == user_id).first()
+    return db.execute(player_by_user_id_stmt(user_id)).scalars().first()
 
-def get_all_players(db: Session, skip: int = 0, limit: int = 100):
+def get_all_players(db: Session, skip: int = 0, limit: int = 100, cursor: str = None):
     """Get all players with position information"""
-    return db.query(models.Player).filter(models.Player.is_active == True).offset(skip).limit(limit).all()
+    query = db.query(models.Player).options(*PLAYER_OUT_OPTIONS).filter(models.Player.is_active == True)
+    return apply_keyset(query, PLAYER_PAGE_KEYS, cursor).offset(skip).limit(limit).all()
 
 def get_players_by_position_zone(db: Session, zone_id: int):
     """Get players by position zone"""
-    return db.query(models.Player).filter(
+    return db.query(models.Player).options(*PLAYER_OUT_OPTIONS).filter(
         models.Player.position_zone_id == zone_id,
         models.Player.is_active == True
     ).all()
 
 def get_players_by_position_specific(db: Session, specific_id: int):
     """Get players by position specific"""
-    return db.query(models.Player).filter(
+    return db.query(models.Player).options(*PLAYER_OUT_OPTIONS).filter(
         models.Player.position_specific_id == specific_id,
         models.Player.is_active == True
     ).all()
@@ -163,16 +249,14 @@ def update_player(db: Session, player_id: int, player: schemas.PlayerUpdate):
             setattr(db_player, field, value)
         
         print(f"🔍 DEBUG - CRUD nationality después de actualizar: {db_player.nationality}")
-        db.commit()
-        db.refresh(db_player)
-        print(f"🔍 DEBUG - CRUD nationality después de refresh: {db_player.nationality}")
+        save(db, db_player)
     return db_player
 
 def delete_player(db: Session, player_id: int):
     db_player = get_player(db, player_id)
     if db_player:
         db.delete(db_player)
-        db.commit()
+        save(db)
         return True
     return False
 
@@ -180,8 +264,7 @@ def assign_player_to_team(db: Session, player_id: int, team_id: int):
     db_player = get_player(db, player_id)
     if db_player:
         db_player.team_id = team_id
-        db.commit()
-        db.refresh(db_player)
+        save(db, db_player)
         return db_player
     return None
 
@@ -189,17 +272,17 @@ def remove_player_from_team(db: Session, player_id: int):
     db_player = get_player(db, player_id)
     if db_player:
         db_player.team_id = None
-        db.commit()
-        db.refresh(db_player)
+        save(db, db_player)
         return db_player
     return None
 
-def get_teams_with_player_count(db: Session, skip: int = 0, limit: int = 100):
+def get_teams_with_player_count(db: Session, skip: int = 0, limit: int = 100, cursor: str = None):
     """Get teams with player count"""
-    teams = db.query(
+    query = db.query(
         models.Team,
         func.count(models.Player.id).label('player_count')
-    ).outerjoin(models.Player).group_by(models.Team.id).offset(skip).limit(limit).all()
+    ).outerjoin(models.Player).group_by(models.Team.id)
+    teams = apply_keyset(query, TEAM_PAGE_KEYS, cursor).offset(skip).limit(limit).all()
     
     result = []
     for team, player_count in teams:
@@ -221,54 +304,52 @@ def get_teams_with_player_count(db: Session, skip: int = 0, limit: int = 100):
 def create_venue(db: Session, venue: schemas.VenueCreate):
     db_venue = models.Venue(**venue.dict())
     db.add(db_venue)
-    db.commit()
-    db.refresh(db_venue)
+    save(db, db_venue)
     return db_venue
 
 def get_venue(db: Session, venue_id: int):
     return db.query(models.Venue).filter(models.Venue.id == venue_id).first()
 
-def get_venues(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Venue).offset(skip).limit(limit).all()
+def get_venues(db: Session, skip: int = 0, limit: int = 100, cursor: str = None):
+    query = apply_keyset(db.query(models.Venue), VENUE_PAGE_KEYS, cursor)
+    return query.offset(skip).limit(limit).all()
 
 def update_venue(db: Session, venue_id: int, venue: schemas.VenueUpdate):
     db_venue = db.query(models.Venue).filter(models.Venue.id == venue_id).first()
     if db_venue:
         for field, value in venue.dict(exclude_unset=True).items():
             setattr(db_venue, field, value)
-        db.commit()
-        db.refresh(db_venue)
+        save(db, db_venue)
     return db_venue
 
 def delete_venue(db: Session, venue_id: int):
     db_venue = db.query(models.Venue).filter(models.Venue.id == venue_id).first()
     if db_venue:
         db.delete(db_venue)
-        db.commit()
+        save(db)
     return db_venue
 
 def create_match(db: Session, match: schemas.MatchCreate):
     db_match = models.Match(**match.dict())
     db.add(db_match)
-    db.commit()
-    db.refresh(db_match)
+    save(db, db_match)
     return db_match
 
 def get_match(db: Session, match_id: int):
     return db.query(models.Match).filter(models.Match.id == match_id).first()
 
-def get_matches(db: Session, skip: int = 0, limit: int = 100, match_type: str = None, status: str = None):
-    query = db.query(models.Match)
+def get_matches(db: Session, skip: int = 0, limit: int = 100, match_type: str = None, status: str = None, cursor: str = None):
+    query = db.query(models.Match).options(*MATCH_OUT_OPTIONS)
     
     if match_type:
         query = query.filter(models.Match.match_type == match_type)
     if status:
         query = query.filter(models.Match.status == status)
     
-    return query.offset(skip).limit(limit).all()
+    return apply_keyset(query, MATCH_PAGE_KEYS, cursor).offset(skip).limit(limit).all()
 
 def get_matches_by_team(db: Session, team_id: int):
-    return db.query(models.Match).filter(
+    return db.query(models.Match).options(*MATCH_OUT_OPTIONS).filter(
         (models.Match.home_team_id == team_id) | 
         (models.Match.away_team_id == team_id) |
         (models.Match.generated_team_a_id == team_id) |
@@ -280,26 +361,31 @@ def update_match(db: Session, match_id: int, match: schemas.MatchUpdate):
     if db_match:
         for field, value in match.dict(exclude_unset=True).items():
             setattr(db_match, field, value)
-        db.commit()
-        db.refresh(db_match)
+        save(db, db_match)
     return db_match
 
 def delete_match(db: Session, match_id: int):
     db_match = db.query(models.Match).filter(models.Match.id == match_id).first()
     if db_match:
         db.delete(db_match)
-        db.commit()
+        save(db)
     return db_match
 
+def get_attendance(db: Session, match_id: int, player_id: int):
+    """Asistencia de un jugador a un partido (única por uq_player_attendance_match_player)"""
+    return db.query(models.PlayerAttendance).filter(
+        models.PlayerAttendance.match_id == match_id,
+        models.PlayerAttendance.player_id == player_id,
+    ).first()
+
 def create_player_attendance(db: Session, attendance: schemas.PlayerAttendanceCreate):
     db_attendance = models.PlayerAttendance(**attendance.dict())
     db.add(db_attendance)
-    db.commit()
-    db.refresh(db_attendance)
+    save(db, db_attendance)
     return db_attendance
 
 def get_player_attendance(db: Session, match_id: int):
-    return db.query(models.PlayerAttendance).filter(models.PlayerAttendance.match_id == match_id).all()
+    return db.query(models.PlayerAttendance).options(*ATTENDANCE_OUT_OPTIONS).filter(models.PlayerAttendance.match_id == match_id).all()
 
 def update_player_attendance(db: Session, attendance_id: int, attendance: schemas.PlayerAttendanceUpdate):
     db_attendance = db.query(models.PlayerAttendance).filter(models.PlayerAttendance.id == attendance_id).first()
@@ -308,12 +394,11 @@ def update_player_attendance(db: Session, attendance_id: int, attendance: schema
             setattr(db_attendance, field, value)
         if attendance.status == 'confirmed':
             db_attendance.confirmed_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_attendance)
+        save(db, db_attendance)
     return db_attendance
 
 def get_confirmed_players_for_match(db: Session, match_id: int):
-    return db.query(models.PlayerAttendance).filter(
+    return db.query(models.PlayerAttendance).options(*ATTENDANCE_OUT_OPTIONS).filter(
         models.PlayerAttendance.match_id == match_id,
         models.PlayerAttendance.status == 'confirmed'
     ).all()
@@ -321,18 +406,18 @@ def get_confirmed_players_for_match(db: Session, match_id: int):
 def create_match_event(db: Session, event: schemas.MatchEventCreate):
     db_event = models.MatchEvent(**event.dict())
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    save(db, db_event)
     return db_event
 
 def get_match_events(db: Session, match_id: int):
-    return db.query(models.MatchEvent).filter(models.MatchEvent.match_id == match_id).order_by(models.MatchEvent.minute).all()
+    return db.query(models.MatchEvent).options(*MATCH_EVENT_OUT_OPTIONS).filter(
+        models.MatchEvent.match_id == match_id
+    ).order_by(models.MatchEvent.minute).all()
 
 def create_championship(db: Session, championship: schemas.ChampionshipCreate):
     db_championship = models.Championship(**championship.dict())
     db.add(db_championship)
-    db.commit()
-    db.refresh(db_championship)
+    save(db, db_championship)
     return db_championship
 
 def get_championship(db: Session, championship_id: int):
@@ -349,19 +434,17 @@ def update_championship(db: Session, championship_id: int, championship: schemas
     if db_championship:
         for field, value in championship.dict(exclude_unset=True).items():
             setattr(db_championship, field, value)
-        db.commit()
-        db.refresh(db_championship)
+        save(db, db_championship)
     return db_championship
 
 def create_championship_team(db: Session, championship_team: schemas.ChampionshipTeamCreate):
     db_championship_team = models.ChampionshipTeam(**championship_team.dict())
     db.add(db_championship_team)
-    db.commit()
-    db.refresh(db_championship_team)
+    save(db, db_championship_team)
     return db_championship_team
 
 def get_championship_standings(db: Session, championship_id: int):
-    return db.query(models.ChampionshipTeam).filter(
+    return db.query(models.ChampionshipTeam).options(*CHAMPIONSHIP_TEAM_OUT_OPTIONS).filter(
         models.ChampionshipTeam.championship_id == championship_id
     ).order_by(models.ChampionshipTeam.points.desc(), 
                (models.ChampionshipTeam.goals_for - models.ChampionshipTeam.goals_against).desc()).all()
@@ -369,34 +452,32 @@ def get_championship_standings(db: Session, championship_id: int):
 def create_external_team(db: Session, external_team: schemas.ExternalTeamCreate):
     db_external_team = models.ExternalTeam(**external_team.dict())
     db.add(db_external_team)
-    db.commit()
-    db.refresh(db_external_team)
+    save(db, db_external_team)
     return db_external_team
 
 def get_external_team(db: Session, external_team_id: int):
     return db.query(models.ExternalTeam).filter(models.ExternalTeam.id == external_team_id).first()
 
-def get_external_teams(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.ExternalTeam).offset(skip).limit(limit).all()
+def get_external_teams(db: Session, skip: int = 0, limit: int = 100, cursor: str = None):
+    query = apply_keyset(db.query(models.ExternalTeam), EXTERNAL_TEAM_PAGE_KEYS, cursor)
+    return query.offset(skip).limit(limit).all()
 
 def update_external_team(db: Session, external_team_id: int, external_team: schemas.ExternalTeamUpdate):
     db_external_team = db.query(models.ExternalTeam).filter(models.ExternalTeam.id == external_team_id).first()
     if db_external_team:
         for field, value in external_team.dict(exclude_unset=True).items():
             setattr(db_external_team, field, value)
-        db.commit()
-        db.refresh(db_external_team)
+        save(db, db_external_team)
     return db_external_team
 
 def create_notification(db: Session, notification: schemas.NotificationCreate):
     db_notification = models.Notification(**notification.dict())
     db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
+    save(db, db_notification)
     return db_notification
 
 def get_user_notifications(db: Session, user_id: int, unread_only: bool = False):
-    query = db.query(models.Notification).filter(models.Notification.recipient_id == user_id)
+    query = db.query(models.Notification).options(*NOTIFICATION_OUT_OPTIONS).filter(models.Notification.recipient_id == user_id)
     if unread_only:
         query = query.filter(models.Notification.read == False)
     return query.order_by(models.Notification.created_at.desc()).all()
@@ -405,18 +486,21 @@ def mark_notification_as_read(db: Session, notification_id: int):
     db_notification = db.query(models.Notification).filter(models.Notification.id == notification_id).first()
     if db_notification:
         db_notification.read = True
-        db.commit()
-        db.refresh(db_notification)
+        save(db, db_notification)
     return db_notification
 
 # ===== FUNCIONES DE INTEGRACIÓN CON TEAM GENERATOR =====
 
 def get_available_players_for_match(db: Session, match_id: int, team_id: int = None):
     """Obtiene jugadores disponibles para un partido, considerando asistencia confirmada"""
-    confirmed_attendance = get_confirmed_players_for_match(db, match_id)
-    confirmed_player_ids = [att.player_id for att in confirmed_attendance]
+    confirmed_player_ids = db.execute(
+        select(models.PlayerAttendance.player_id).where(
+            models.PlayerAttendance.match_id == match_id,
+            models.PlayerAttendance.status == 'confirmed'
+        )
+    ).scalars().all()
     
-    query = db.query(models.Player).filter(models.Player.is_active == True)
+    query = db.query(models.Player).options(*PLAYER_OUT_OPTIONS).filter(models.Player.is_active == True)
     
     if team_id:
         query = query.filter(models.Player.team_id == team_id)
@@ -428,37 +512,555 @@ def get_available_players_for_match(db: Session, match_id: int, team_id: int = N
 
 def create_match_with_teams(db: Session, match_data: dict, team_a_players: list, team_b_players: list):
     """Crea un partido con equipos generados automáticamente"""
-    # Crear el partido
-    db_match = models.Match(**match_data)
-    db.add(db_match)
-    db.commit()
-    db.refresh(db_match)
-    
-    # Crear equipos temporales para el partido
-    team_a = models.Team(name=f"Equipo A - {db_match.title}", description="Equipo generado automáticamente")
-    team_b = models.Team(name=f"Equipo B - {db_match.title}", description="Equipo generado automáticamente")
-    
-    db.add(team_a)
-    db.add(team_b)
-    db.commit()
-    db.refresh(team_a)
-    db.refresh(team_b)
-    
-    # Asignar jugadores a los equipos
-    for player_id in team_a_players:
-        player = db.query(models.Player).filter(models.Player.id == player_id).first()
-        if player:
-            player.team_id = team_a.id
-    
-    for player_id in team_b_players:
-        player = db.query(models.Player).filter(models.Player.id == player_id).first()
-        if player:
-            player.team_id = team_b.id
-    
-    # Actualizar el partido con los equipos generados
-    db_match.generated_team_a_id = team_a.id
-    db_match.generated_team_b_id = team_b.id
-    db.commit()
-    db.refresh(db_match)
-    
+    with unit_of_work(db):
+        # Crear el partido y los equipos temporales en un solo flush
+        db_match = models.Match(**match_data)
+        team_a = models.Team(name=f"Equipo A - {db_match.title}", description="Equipo generado automáticamente")
+        team_b = models.Team(name=f"Equipo B - {db_match.title}", description="Equipo generado automáticamente")
+        db.add_all([db_match, team_a, team_b])
+        db.flush()
+
+        # Asignar jugadores a los equipos: un UPDATE por equipo
+        for team, player_ids in ((team_a, team_a_players), (team_b, team_b_players)):
+            if player_ids:
+                db.query(models.Player).filter(models.Player.id.in_(player_ids)).update(
+                    {models.Player.team_id: team.id}, synchronize_session="evaluate"
+                )
+
+        # Actualizar el partido con los equipos generados
+        db_match.generated_team_a_id = team_a.id
+        db_match.generated_team_b_id = team_b.id
+        save(db, db_match)
+
     return db_match
+
+
+# ===== OPERACIONES MASIVAS =====
+# Un INSERT ... VALUES (...), (...) por bloque con ON CONFLICT del dialecto, todo en
+# una transacción. Las filas inválidas se informan por índice y no se insertan.
+
+def _validate_rows(rows: list, schema, overrides: dict = None):
+    """Valida cada fila con el esquema; devuelve (filas válidas, errores por índice)"""
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        # El cuerpo es List[Any]: una fila que no es objeto se informa aquí y no anula el lote
+        if not isinstance(row, dict):
+            errors.append(schemas.BulkRowError(index=index, errors=["la fila debe ser un objeto"]))
+            continue
+        try:
+            item = schema(**{**row, **(overrides or {})})
+        except ValidationError as e:
+            errors.append(schemas.BulkRowError(index=index, errors=[
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            ]))
+        else:
+            # Solo los campos enviados: el upsert no pisa columnas que la fila no trae
+            valid.append((index, item.dict(exclude_unset=True)))
+    return valid, errors
+
+
+def _check_references(db: Session, valid: list, errors: list, references: dict):
+    """Descarta las filas cuyas FK no existen, con una consulta por tabla referenciada"""
+    missing = {}
+    for field, column in references.items():
+        ids = {row[field] for _, row in valid if row.get(field) is not None}
+        if ids:
+            existing = set(db.execute(select(column).where(column.in_(ids))).scalars())
+            missing[field] = ids - existing
+    kept = []
+    for index, row in valid:
+        row_errors = [f"{field}: {row[field]} no existe" for field, ids in missing.items() if row.get(field) in ids]
+        if row_errors:
+            errors.append(schemas.BulkRowError(index=index, errors=row_errors))
+        else:
+            kept.append((index, row))
+    return kept
+
+
+def _drop_duplicates(valid: list, errors: list, key_fields: tuple):
+    """ON CONFLICT no admite dos filas con la misma clave en un INSERT: se conserva la primera"""
+    seen, kept = set(), []
+    for index, row in valid:
+        key = tuple(row[field] for field in key_fields)
+        if key in seen:
+            errors.append(schemas.BulkRowError(index=index, errors=[f"{', '.join(key_fields)} duplicado en el lote"]))
+        else:
+            seen.add(key)
+            kept.append((index, row))
+    return kept
+
+
+def _insert_chunks(db: Session, table, rows: list, conflict: tuple = None, update_set=None):
+    """INSERT multi-VALUES por bloques que respetan el límite de parámetros del dialecto.
+
+    Un VALUES exige las mismas columnas en todas las filas, así que se agrupan
+    por conjunto de campos; `update_set(excluded, campos)` arma el SET del upsert.
+    """
+    dialect = db.get_bind().dialect
+    max_params = 32766 if dialect.name != "sqlite" or dialect.dbapi.sqlite_version_info >= (3, 32) else 999
+    insert = postgresql.insert if dialect.name == "postgresql" else sqlite.insert
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    for fields, group in groups.items():
+        chunk_size = max(1, max_params // len(fields))
+        for start in range(0, len(group), chunk_size):
+            stmt = insert(table).values(group[start:start + chunk_size])
+            if conflict:
+                stmt = stmt.on_conflict_do_update(index_elements=list(conflict), set_=update_set(stmt.excluded, fields))
+            db.execute(stmt)
+
+
+def _bulk_result(rows: list, errors: list):
+    errors.sort(key=lambda error: error.index)
+    return schemas.BulkResult(processed=len(rows), failed=len(errors), errors=errors)
+
+
+def bulk_upsert_players(db: Session, rows: list):
+    """Crea jugadores o actualiza los existentes (clave: email)"""
+    valid, errors = _validate_rows(rows, schemas.PlayerCreate)
+    valid = _check_references(db, valid, errors, {
+        "user_id": models.User.id,
+        "team_id": models.Team.id,
+        "position_zone_id": models.PositionZone.id,
+        "position_specific_id": models.PositionSpecific.id,
+    })
+    valid = _drop_duplicates(valid, errors, ("email",))
+    # INSERT de Core: sin el @validates del modelo, search_name se calcula aquí
+    values = [{**row, "search_name": search.normalize_name(row["name"])} for _, row in valid]
+    table = models.Player.__table__
+
+    def update_set(excluded, fields):
+        changes = {name: excluded[name] for name in fields if name != "email"}
+        changes["updated_at"] = func.now()
+        return changes
+
+    with unit_of_work(db):
+        _insert_chunks(db, table, values, conflict=("email",), update_set=update_set)
+    return _bulk_result(values, errors)
+
+
+def bulk_upsert_attendance(db: Session, match_id: int, rows: list):
+    """Registra o actualiza la asistencia de varios jugadores a un partido"""
+    valid, errors = _validate_rows(rows, schemas.PlayerAttendanceCreate, {"match_id": match_id})
+    valid = _check_references(db, valid, errors, {"player_id": models.Player.id})
+    valid = _drop_duplicates(valid, errors, ("player_id",))
+    # confirmed_at solo cambia cuando la fila confirma, igual que update_player_attendance
+    now = datetime.utcnow()
+    values = [{**row, "confirmed_at": now} if row.get("status") == "confirmed" else row for _, row in valid]
+
+    def update_set(excluded, fields):
+        changes = {name: excluded[name] for name in fields if name not in ("match_id", "player_id")}
+        changes["updated_at"] = func.now()
+        return changes
+
+    with unit_of_work(db):
+        _insert_chunks(db, models.PlayerAttendance.__table__, values, conflict=("match_id", "player_id"), update_set=update_set)
+    return _bulk_result(values, errors)
+
+
+def bulk_create_match_events(db: Session, match_id: int, rows: list):
+    """Registra varios eventos de un partido"""
+    valid, errors = _validate_rows(rows, schemas.MatchEventCreate, {"match_id": match_id})
+    valid = _check_references(db, valid, errors, {"player_id": models.Player.id})
+    values = [row for _, row in valid]
+
+    with unit_of_work(db):
+        _insert_chunks(db, models.MatchEvent.__table__, values)
+    return _bulk_result(values, errors)
+
+
+# ===== REFRESH TOKENS =====
+
+def new_refresh_token(user_id: int, family_id: str = None) -> models.RefreshToken:
+    """Fila de un refresh token nuevo; sin family_id abre una sesión nueva"""
+    jti = uuid.uuid4().hex
+    return models.RefreshToken(
+        jti=jti,
+        family_id=family_id or jti,
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+async def issue_refresh_token_async(db: AsyncSession, user_id: int) -> models.RefreshToken:
+    record = new_refresh_token(user_id)
+    db.add(record)
+    await db.commit()
+    return record
+
+def rotate_refresh_token(db: Session, jti: str, family_id: str, user_id: int) -> Optional[models.RefreshToken]:
+    """Marca el token como usado y emite el siguiente de la misma familia.
+
+    El UPDATE condicional es atómico: con dos peticiones con el mismo token solo
+    una lo rota. Devuelve None si el token no sirve; si ya se había usado (copia
+    robada o reintento del cliente) se revoca la sesión completa.
+    """
+    token = models.RefreshToken
+    now = datetime.utcnow()
+    rotated = db.execute(
+        update(token)
+        .where(token.jti == jti, token.used_at.is_(None), token.revoked_at.is_(None), token.expires_at > now)
+        .values(used_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if rotated:
+        record = new_refresh_token(user_id, family_id)
+        db.add(record)
+        save(db, record)
+        return record
+
+    record = db.get(token, jti)
+    if record is not None and record.used_at is not None and record.revoked_at is None:
+        logger.warning("Refresh token %s reutilizado: se revoca la sesión %s", jti, record.family_id)
+        revoke_refresh_family(db, record.family_id)
+    else:
+        db.rollback()
+    return None
+
+def revoke_refresh_family(db: Session, family_id: str):
+    """Revoca todos los refresh tokens de una sesión"""
+    token = models.RefreshToken
+    db.execute(
+        update(token)
+        .where(token.family_id == family_id, token.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    expires_at = db.execute(select(func.max(token.expires_at)).where(token.family_id == family_id)).scalar()
+    save(db)
+    if expires_at is not None:
+        auth.revoked_refresh_families.add(family_id, expires_at)
+
+def revoke_user_refresh_tokens(db: Session, user_id: int):
+    """Revoca todas las sesiones vigentes de un usuario (POST /admin/users/{id}/revoke-tokens)"""
+    token = models.RefreshToken
+    active = (token.user_id == user_id, token.revoked_at.is_(None))
+    families = db.execute(
+        select(token.family_id, func.max(token.expires_at)).where(*active).group_by(token.family_id)
+    ).all()
+    db.execute(
+        update(token).where(*active).values(revoked_at=datetime.utcnow()).execution_options(synchronize_session=False)
+    )
+    save(db)
+    for family_id, expires_at in families:
+        auth.revoked_refresh_families.add(family_id, expires_at)
+
+def purge_refresh_tokens(conn) -> int:
+    """Borra los refresh tokens vencidos (usados, revocados o no)"""
+    token = models.RefreshToken.__table__
+    return conn.execute(token.delete().where(token.c.expires_at <= datetime.utcnow())).rowcount
+
+
+# ===== LECTURAS ASÍNCRONAS =====
+# AsyncSession no permite lazy loading: todas usan las opciones *_OUT_OPTIONS.
+
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(user_by_email_stmt(email))
+    return result.scalars().first()
+
+async def get_player_async(db: AsyncSession, player_id: int, scope=None):
+    query = select(models.Player).options(*PLAYER_OUT_OPTIONS).where(models.Player.id == player_id)
+    if scope is not None:
+        query = query.where(scope)
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def get_player_by_user_id_async(db: AsyncSession, user_id: int):
+    result = await db.execute(player_by_user_id_stmt(user_id))
+    return result.scalars().first()
+
+async def get_players_async(db: AsyncSession, team_id: int = None, skip: int = 0, limit: int = None, cursor: str = None, scope=None, options=PLAYER_OUT_OPTIONS):
+    """Get players (optionally of one team) with nested relations loaded"""
+    query = select(models.Player).options(*options)
+    if team_id is not None:
+        query = query.where(models.Player.team_id == team_id)
+    if scope is not None:
+        query = query.where(scope)
+    query = apply_keyset(query, PLAYER_PAGE_KEYS, cursor)
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return result.scalars().all()
+
+# Solo las columnas de PlayerSummary: filas planas, sin hidratar objetos ni relaciones
+PLAYER_SUMMARY_COLUMNS = (
+    models.Player.id,
+    models.Player.name,
+    models.Player.team_id,
+    models.Player.jersey_number,
+    models.Player.skill_level,
+    models.Player.rit,
+    models.Player.tir,
+    models.Player.pas,
+    models.Player.reg,
+    models.Player.defense,
+    models.Player.fis,
+    models.PositionZone.abbreviation.label("position_zone"),
+    models.PositionSpecific.abbreviation.label("position_specific"),
+)
+
+async def get_player_summaries_async(db: AsyncSession, team_id: int = None, match_id: int = None, skip: int = 0, limit: int = None, cursor: str = None, scope=None):
+    """Resumen de jugadores en una consulta; con match_id, solo los confirmados para el partido"""
+    query = (
+        select(*PLAYER_SUMMARY_COLUMNS)
+        .select_from(models.Player)
+        .join(models.PositionZone, models.Player.position_zone_id == models.PositionZone.id)
+        .outerjoin(models.PositionSpecific, models.Player.position_specific_id == models.PositionSpecific.id)
+    )
+    if team_id is not None:
+        query = query.where(models.Player.team_id == team_id)
+    if match_id is not None:
+        query = query.join(models.PlayerAttendance, models.PlayerAttendance.player_id == models.Player.id).where(
+            models.PlayerAttendance.match_id == match_id,
+            models.PlayerAttendance.status == 'confirmed'
+        )
+    if scope is not None:
+        query = query.where(scope)
+    query = apply_keyset(query, PLAYER_PAGE_KEYS, cursor)
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    result = await db.execute(query)
+    return result.all()
+
+PLAYER_SKILLS = ("rit", "tir", "pas", "reg", "defense", "fis")
+
+async def search_players_async(
+    db: AsyncSession, q: str = None, nationality: str = None, position_zone_id: int = None,
+    skill_min: int = None, skill_max: int = None, minimums: dict = None, scope=None, limit: int = 20,
+):
+    """Jugadores activos por nombre (ver app/search.py) y filtros; [(fila, tipo, puntaje)]"""
+    player = models.Player
+    query = (
+        select(*PLAYER_SUMMARY_COLUMNS, player.search_name)
+        .select_from(player)
+        .join(models.PositionZone, player.position_zone_id == models.PositionZone.id)
+        .outerjoin(models.PositionSpecific, player.position_specific_id == models.PositionSpecific.id)
+        .where(player.is_active == true())
+    )
+    if nationality:
+        query = query.where(player.nationality == nationality)
+    if position_zone_id is not None:
+        query = query.where(player.position_zone_id == position_zone_id)
+    if skill_min is not None:
+        query = query.where(player.skill_level >= skill_min)
+    if skill_max is not None:
+        query = query.where(player.skill_level <= skill_max)
+    for skill, minimum in (minimums or {}).items():
+        query = query.where(getattr(player, skill) >= minimum)
+    if scope is not None:
+        query = query.where(scope)
+
+    normalized = search.normalize_name(q) if q else ""
+    if not normalized:
+        result = await db.execute(query.order_by(*PLAYER_PAGE_KEYS).limit(limit))
+        return [(row, None, None) for row in result.all()]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Mismo umbral que el orden final (el de pg_trgm por defecto es 0.6)
+        await db.execute(text(f"SET LOCAL pg_trgm.word_similarity_threshold = {float(SEARCH_MIN_SIMILARITY)}"))
+    # Etapas de la más barata y precisa a la más amplia; cada una solo si faltan filas
+    candidates = []
+    for stage in _search_stages(dialect, query, normalized, limit):
+        result = await db.execute(stage)
+        candidates.extend(result.all())
+        if len({row.id for row in candidates}) >= limit:
+            break
+    return search.rank(normalized, candidates, limit, SEARCH_MIN_SIMILARITY)
+
+def _search_stages(dialect: str, query, normalized: str, limit: int):
+    player = models.Player
+    # 1. El nombre empieza con la búsqueda: rango sobre ix_players_search_name
+    if dialect == "postgresql":
+        yield query.where(player.search_name.like(normalized + "%")).order_by(player.search_name).limit(limit)
+    else:
+        yield query.where(player.search_name >= normalized, player.search_name < normalized + "\U0010ffff").order_by(player.search_name).limit(limit)
+
+    if dialect == "postgresql":
+        # 2 y 3 juntas: el operador <% (word_similarity) usa el índice GIN de trigramas
+        similarity = func.word_similarity(normalized, player.search_name)
+        yield (
+            query.where(literal(normalized).op("<%")(player.search_name))
+            .order_by(similarity.desc()).limit(SEARCH_CANDIDATES)
+        )
+        return
+
+    # 2. Contiene todas las palabras; 3. comparte trigramas con cada palabra. Sin ORDER BY:
+    # ordenar por bm25 recorre todas las coincidencias y el orden final es el de search.rank
+    fuzzy = search.fts_fuzzy_query(normalized, SEARCH_FUZZY_MAX_WORDS, SEARCH_FUZZY_MAX_CLAUSES)
+    for match in (search.fts_contains_query(normalized), fuzzy):
+        if match is None:
+            return
+        yield (
+            query.join(search.players_search, search.players_search.c.rowid == player.id)
+            .where(search.players_search.c.search_name.op("MATCH")(match))
+            .limit(SEARCH_CANDIDATES)
+        )
+
+async def get_players_by_team_async(db: AsyncSession, team_id: int):
+    return await get_players_async(db, team_id=team_id)
+
+async def get_team_async(db: AsyncSession, team_id: int):
+    result = await db.execute(select(models.Team).where(models.Team.id == team_id))
+    return result.scalars().first()
+
+async def get_teams_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str = None, scope=None):
+    query = select(models.Team)
+    if scope is not None:
+        query = query.where(scope)
+    query = apply_keyset(query, TEAM_PAGE_KEYS, cursor)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_team_with_players_async(db: AsyncSession, team_id: int, scope=None):
+    query = (
+        select(models.Team)
+        .options(*TEAM_WITH_PLAYERS_OPTIONS)
+        .where(models.Team.id == team_id)
+    )
+    if scope is not None:
+        query = query.where(scope)
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def get_teams_with_player_count_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str = None):
+    """Get teams with player count"""
+    query = (
+        select(models.Team, func.count(models.Player.id).label('player_count'))
+        .outerjoin(models.Player)
+        .group_by(models.Team.id)
+    )
+    result = await db.execute(apply_keyset(query, TEAM_PAGE_KEYS, cursor).offset(skip).limit(limit))
+    return [
+        {
+            'id': team.id,
+            'name': team.name,
+            'description': team.description,
+            'logo_url': team.logo_url,
+            'created_at': team.created_at,
+            'updated_at': team.updated_at,
+            'player_count': player_count
+        }
+        for team, player_count in result.all()
+    ]
+
+async def get_match_async(db: AsyncSession, match_id: int):
+    result = await db.execute(
+        select(models.Match).options(*MATCH_OUT_OPTIONS).where(models.Match.id == match_id)
+    )
+    return result.scalars().first()
+
+async def get_matches_async(db: AsyncSession, skip: int = 0, limit: int = 100, match_type: str = None, status: str = None, cursor: str = None, options=MATCH_OUT_OPTIONS):
+    query = select(models.Match).options(*options)
+
+    if match_type:
+        query = query.where(models.Match.match_type == match_type)
+    if status:
+        query = query.where(models.Match.status == status)
+
+    query = apply_keyset(query, MATCH_PAGE_KEYS, cursor)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_player_attendance_async(db: AsyncSession, match_id: int):
+    result = await db.execute(
+        select(models.PlayerAttendance)
+        .options(*ATTENDANCE_OUT_OPTIONS)
+        .where(models.PlayerAttendance.match_id == match_id)
+    )
+    return result.scalars().all()
+
+async def get_confirmed_players_for_match_async(db: AsyncSession, match_id: int):
+    """Jugadores (no filas de asistencia) confirmados para un partido"""
+    result = await db.execute(
+        select(models.Player)
+        .options(*PLAYER_OUT_OPTIONS)
+        .join(models.PlayerAttendance, models.PlayerAttendance.player_id == models.Player.id)
+        .where(
+            models.PlayerAttendance.match_id == match_id,
+            models.PlayerAttendance.status == 'confirmed'
+        )
+    )
+    return result.scalars().all()
+
+async def get_user_notifications_async(db: AsyncSession, user_id: int, unread_only: bool = False):
+    query = (
+        select(models.Notification)
+        .options(*NOTIFICATION_OUT_OPTIONS)
+        .where(models.Notification.recipient_id == user_id)
+    )
+    if unread_only:
+        query = query.where(models.Notification.read == False)
+    result = await db.execute(query.order_by(models.Notification.created_at.desc()))
+    return result.scalars().all()
+
+
+# ===== VERSIONES DE LISTADOS (ETag) =====
+
+def _last_change(model):
+    """Última modificación de una tabla: updated_at si la tiene, si no created_at"""
+    updated_at = getattr(model, "updated_at", None)
+    if updated_at is None:
+        return func.max(model.created_at)
+    return func.max(func.coalesce(updated_at, model.created_at))
+
+def _table_version(model):
+    # Filas y última modificación de una tabla anidada, como subconsultas escalares
+    return (
+        select(func.count()).select_from(model).scalar_subquery(),
+        select(_last_change(model)).scalar_subquery(),
+    )
+
+async def get_list_version_async(db: AsyncSession, model, *where, related=(), extra=()):
+    """Versión de un listado en una sola consulta de agregados: filas y última
+    modificación de `model` con los filtros del listado, más las de las tablas
+    anidadas en la respuesta (`related`) y agregados propios (`extra`)"""
+    columns = [func.count(), _last_change(model), *extra]
+    for related_model in related:
+        columns.extend(_table_version(related_model))
+    query = select(*columns).select_from(model)
+    for clause in where:
+        if clause is not None:
+            query = query.where(clause)
+    result = await db.execute(query)
+    return tuple(result.one())
+
+# PlayerOut anida la zona y la posición específica. Ese catálogo no tiene updated_at:
+# solo lo escriben las migraciones, que agregan filas y no editan las existentes
+async def get_players_version_async(db: AsyncSession, scope=None):
+    return await get_list_version_async(
+        db, models.Player, scope,
+        related=(models.Team, models.User, models.PositionZone, models.PositionSpecific),
+    )
+
+async def get_teams_version_async(db: AsyncSession, scope=None):
+    # player_count depende de los jugadores
+    return await get_list_version_async(db, models.Team, scope, related=(models.Player,))
+
+async def get_team_version_async(db: AsyncSession, team_id: int, scope=None):
+    return await get_list_version_async(
+        db, models.Team, models.Team.id == team_id, scope,
+        related=(models.Player, models.User, models.PositionZone, models.PositionSpecific),
+    )
+
+async def get_matches_version_async(db: AsyncSession, match_type: str = None, status: str = None):
+    return await get_list_version_async(
+        db, models.Match,
+        models.Match.match_type == match_type if match_type else None,
+        models.Match.status == status if status else None,
+        related=(models.Team, models.User, models.Venue),
+    )
+
+async def get_notifications_version_async(db: AsyncSession, user_id: int, unread_only: bool = False):
+    # Las notificaciones no tienen updated_at: marcar como leída cambia la suma de `read`
+    return await get_list_version_async(
+        db, models.Notification,
+        models.Notification.recipient_id == user_id,
+        models.Notification.read == False if unread_only else None,
+        related=(models.Match,),
+        extra=(func.coalesce(func.sum(cast(models.Notification.read, Integer)), 0),),
+    )
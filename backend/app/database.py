@@ -1,8 +1,502 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+
+from sqlalchemy import create_engine, event, exc, inspect, text
+from sqlalchemy.engine import default, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import functions
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DATABASE_REPLICA_URL,
+    ASYNC_DATABASE_REPLICA_URL,
+    REPLICA_MAX_LAG_SECONDS,
+    REPLICA_STICKY_SECONDS,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_FOREIGN_KEYS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Perfiles de pool por dialecto. SQLite es local y barato de abrir, Postgres
+# necesita pre-ping y reciclado para sobrevivir reinicios del servidor.
+POOL_PROFILES = {
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+}
+
+
+# Drivers asíncronos equivalentes a los síncronos de DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+class _PoolStatsMixin:
+    """Mide cuánto esperan los checkouts por una conexión"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            # Sin conexión no hay checkout: se cuenta aparte y no entra en los promedios
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "idle": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_total * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(url: str) -> str:
+    """Convierte una URL síncrona (psycopg2, pysqlite) en su variante asyncio"""
+    parsed = make_url(url)
+    dialect = parsed.get_backend_name()
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para {dialect}")
+    return str(parsed.set(drivername=ASYNC_DRIVERS[dialect]))
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Argumentos de create_engine según el dialecto y la configuración"""
+    parsed = make_url(url)
+    dialect = parsed.get_backend_name()
+    options = {}
+
+    if dialect == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            # Base en memoria: una única conexión compartida, el pool no aplica
+            return {"connect_args": {"check_same_thread": False}}
+        options["connect_args"] = {"check_same_thread": False}
+
+    profile = dict(POOL_PROFILES.get(dialect, POOL_PROFILES["postgresql"]))
+    overrides = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+
+    options.update(profile)
+    options["poolclass"] = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    return options
+
+
+def sqlite_pragmas() -> dict:
+    """PRAGMAs del perfil SQLite, en el orden en que se aplican"""
+    pragmas = {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "foreign_keys": "ON" if SQLITE_FOREIGN_KEYS else "OFF",
+    }
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def configure_sqlite(bind, pragmas: dict = None):
+    """Aplica los PRAGMAs en cada conexión nueva del engine (sync o async)"""
+    sync_engine = getattr(bind, "sync_engine", bind)
+    if sync_engine.dialect.name != "sqlite":
+        return bind
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return bind
+
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP tiene resolución de segundos: dos escrituras en el mismo segundo
+    # dejarían igual updated_at (y el ETag de los listados). %f da milisegundos; "000"
+    # completa los microsegundos que espera el DateTime de SQLAlchemy.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def get_pool_stats(bind=None) -> dict:
+    """Estado del pool: conexiones en uso, libres, overflow y tiempos de espera"""
+    pool = (bind or engine).pool
+    if isinstance(pool, _PoolStatsMixin):
+        return {"pool_class": type(pool).__name__, **pool.stats()}
+    return {"pool_class": type(pool).__name__, "status": pool.status()}
+
+
+class StatementCacheStats:
+    """Aciertos de la caché de sentencias compiladas de un motor"""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0  # texto SQL, DDL y sentencias sin clave de caché
+        event.listen(bind, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, "cache_hit", None)
+        with self._lock:
+            if cache_hit is default.CACHE_HIT:
+                self.hits += 1
+            elif cache_hit is default.CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def stats(self) -> dict:
+        cache = self.bind._compiled_cache
+        with self._lock:
+            cached = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_ratio": round(self.hits / cached, 4) if cached else 0.0,
+                "entries": len(cache) if cache is not None else 0,
+                "capacity": cache.capacity if cache is not None else 0,
+            }
+
+
+_statement_cache_stats = {}
+
+
+def track_statement_cache(bind):
+    if bind not in _statement_cache_stats:
+        _statement_cache_stats[bind] = StatementCacheStats(bind)
+    return bind
+
+
+def get_statement_cache_stats(bind=None) -> dict:
+    tracker = _statement_cache_stats.get(bind or engine)
+    return tracker.stats() if tracker else {}
+
+
+engine = configure_sqlite(create_engine(DATABASE_URL, **engine_options(DATABASE_URL)))
+# Sin expirar en commit: crud no necesita refresh() para devolver lo que escribió
+track_statement_cache(engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Motor asíncrono para los endpoints de lectura (async def)
+_async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = configure_sqlite(create_async_engine(_async_url, **engine_options(_async_url, is_async=True)))
+track_statement_cache(async_engine.sync_engine)
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+# ===== RÉPLICA DE LECTURA =====
+
+# Retraso de réplica en segundos. En Postgres se mide contra el último WAL
+# recibido, así un primario sin escrituras no aparenta retraso.
+REPLICA_LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+    "sqlite": "SELECT 0",
+}
+
+
+# Hora (epoch) de la última escritura del cliente de la petición en curso, según
+# la cookie o cabecera que deja ReadYourWritesMiddleware; None = no escribió hace poco
+client_last_write = ContextVar("client_last_write", default=None)
+# Marca de escritura de la petición en curso (la llenan los listeners de Session)
+_request_writes = ContextVar("request_writes", default=None)
+
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+class ReplicaRouter:
+    """Decide si una lectura puede ir a la réplica o debe volver al primario"""
+
+    def __init__(self, enabled: bool, max_lag: float, sticky_seconds: float):
+        self.enabled = enabled
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.lag = 0.0 if enabled else None  # None = réplica caída o sin medir
+        self.checked_at = None
+
+    def set_lag(self, lag):
+        self.lag = lag
+        self.checked_at = time.time()
+
+    def use_replica(self, last_write: float = None) -> bool:
+        if not self.enabled or self.lag is None or self.lag > self.max_lag:
+            return False
+        # Lectura después de escritura del mismo cliente: el primario tiene su versión
+        return last_write is None or time.time() - last_write >= self.sticky_seconds
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag,
+            "checked_at": self.checked_at,
+            "reading_from": "replica" if self.use_replica() else "primary",
+        }
+
+
+class RoutingSession(Session):
+    """Session que lee de la réplica y escribe en el primario.
+
+    Una vez que la sesión escribe, el resto de sus consultas van al primario; lo
+    mismo si el cliente escribió hace menos de REPLICA_STICKY_SECONDS.
+    """
+
+    _used_primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        engines = self.info["engines"]
+        if self._flushing or isinstance(clause, UpdateBase):
+            self._used_primary = True
+        if self._used_primary or not self.info["router"].use_replica(client_last_write.get()):
+            return engines["primary"]
+        return engines["replica"]
+
+
+def _parse_last_write(headers: dict):
+    value = headers.get(LAST_WRITE_HEADER.lower())
+    if value is None and "cookie" in headers:
+        try:
+            morsel = SimpleCookie(headers["cookie"]).get(LAST_WRITE_COOKIE)
+        except CookieError:
+            morsel = None
+        value = morsel.value if morsel else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """Lectura de lo propio después de escribir, por cliente y no por proceso.
+
+    La respuesta a una petición que escribió lleva la hora de la escritura en la
+    cookie `last_write` y en la cabecera X-Last-Write. Mientras el cliente la
+    devuelva (cookie o cabecera), durante REPLICA_STICKY_SECONDS sus lecturas van
+    al primario, aunque la petición llegue a otro worker. Los demás clientes
+    siguen leyendo de la réplica.
+    """
+
+    def __init__(self, app, sticky_seconds: float = REPLICA_STICKY_SECONDS):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        writes = {"at": None}
+
+        async def send_with_last_write(message):
+            if message["type"] == "http.response.start" and writes["at"] is not None:
+                value = f"{writes['at']:.3f}"
+                cookie = f"{LAST_WRITE_COOKIE}={value}; Max-Age={max(int(self.sticky_seconds), 1)}; Path=/; HttpOnly; SameSite=Lax"
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (LAST_WRITE_HEADER.lower().encode("latin-1"), value.encode("latin-1")),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]}
+            await send(message)
+
+        last_write_token = client_last_write.set(_parse_last_write(headers))
+        writes_token = _request_writes.set(writes)
+        try:
+            await self.app(scope, receive, send_with_last_write)
+        finally:
+            client_last_write.reset(last_write_token)
+            _request_writes.reset(writes_token)
+
+
+async def check_replica_lag():
+    """Mide el retraso de la réplica; si no responde, las lecturas van al primario"""
+    if not replica_router.enabled:
+        return None
+    query = REPLICA_LAG_QUERIES.get(async_replica_engine.dialect.name, "SELECT 0")
+    try:
+        async with async_replica_engine.connect() as conn:
+            lag = (await conn.execute(text(query))).scalar()
+        replica_router.set_lag(float(lag or 0))
+    except Exception as e:
+        logger.warning("Réplica no disponible, leyendo del primario: %s", e)
+        replica_router.set_lag(None)
+    return replica_router.lag
+
+
+if DATABASE_REPLICA_URL:
+    replica_engine = configure_sqlite(create_engine(DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL)))
+    _async_replica_url = ASYNC_DATABASE_REPLICA_URL or to_async_url(DATABASE_REPLICA_URL)
+    async_replica_engine = configure_sqlite(
+        create_async_engine(_async_replica_url, **engine_options(_async_replica_url, is_async=True))
+    )
+    track_statement_cache(replica_engine)
+    track_statement_cache(async_replica_engine.sync_engine)
+else:
+    replica_engine = engine
+    async_replica_engine = async_engine
+
+replica_router = ReplicaRouter(
+    enabled=bool(DATABASE_REPLICA_URL),
+    max_lag=REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=REPLICA_STICKY_SECONDS,
+)
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    info={"engines": {"primary": engine, "replica": replica_engine}, "router": replica_router},
+)
+AsyncReadSessionLocal = sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    info={"engines": {"primary": async_engine.sync_engine, "replica": async_replica_engine.sync_engine}, "router": replica_router},
+)
+
+
+def _note_request_write():
+    # Solo dentro de una petición (ReadYourWritesMiddleware); las tareas de fondo no cuentan
+    writes = _request_writes.get()
+    if writes is not None:
+        writes["at"] = time.time()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_primary_write(session, flush_context):
+    _note_request_write()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_primary_dml(orm_execute_state):
+    # INSERT/UPDATE ejecutados con session.execute() no pasan por el flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _note_request_write()
+
+
+# ===== ESCRITURAS =====
+
+@contextmanager
+def unit_of_work(db: Session):
+    """Una sola transacción para varias operaciones de crud.
+
+    Dentro del bloque las funciones de crud solo hacen flush; el commit ocurre
+    una vez al salir, o rollback si hubo una excepción. Los bloques anidados se
+    suman a la transacción exterior.
+    """
+    depth = db.info.get("unit_of_work", 0)
+    db.info["unit_of_work"] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except Exception:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info["unit_of_work"] = depth
+
+
+def save(db: Session, *instances):
+    """Escribe los cambios pendientes y confirma, salvo dentro de unit_of_work.
+
+    El flush trae created_at/updated_at en el mismo INSERT/UPDATE (RETURNING)
+    gracias a eager_defaults. Las relaciones de las instancias escritas se
+    expiran porque pueden apuntar a una FK que cambió.
+    """
+    db.flush()
+    for instance in instances:
+        relationships = inspect(instance).mapper.relationships.keys()
+        if relationships:
+            db.expire(instance, relationships)
+    if not db.info.get("unit_of_work"):
+        db.commit()
+
+
+class _Base:
+    # Columnas generadas por la base (server_default, onupdate) se leen en el flush
+    __mapper_args__ = {"eager_defaults": True}
+
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+Base = declarative_base(cls=_Base)
@@ -0,0 +1,101 @@
+"""
+Exportación en streaming (NDJSON y CSV) de jugadores, partidos, asistencia y eventos.
+
+Cada export es una sola consulta de columnas (sin objetos del ORM ni identity
+map) leída con `yield_per`: cursor del servidor en PostgreSQL y `fetchmany` en
+SQLite. Cada bloque de filas se codifica y se envía antes de pedir el siguiente,
+así que la memoria depende del tamaño de bloque y no de la tabla. La sesión se
+abre dentro del generador porque la respuesta se sigue enviando después de que
+el endpoint retorna; lee de la réplica si hay una configurada.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from . import models
+from .config import EXPORT_BATCH_SIZE
+from .database import AsyncReadSessionLocal
+from .serialization import dumps
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class UnknownExport(LookupError):
+    pass
+
+
+def _players():
+    zone = models.PositionZone.abbreviation.label("position_zone")
+    specific = models.PositionSpecific.abbreviation.label("position_specific")
+    return (
+        select(*models.Player.__table__.c, models.Team.name.label("team_name"), zone, specific)
+        .outerjoin(models.Team, models.Team.id == models.Player.team_id)
+        .outerjoin(models.PositionZone, models.PositionZone.id == models.Player.position_zone_id)
+        .outerjoin(models.PositionSpecific, models.PositionSpecific.id == models.Player.position_specific_id)
+        .order_by(models.Player.id)
+    )
+
+
+def _matches():
+    return select(*models.Match.__table__.c).order_by(models.Match.id)
+
+
+def _by_player(model):
+    # Asistencia y eventos llevan el nombre del jugador para no cruzar archivos
+    return (
+        select(*model.__table__.c, models.Player.name.label("player_name"))
+        .join(models.Player, models.Player.id == model.player_id)
+        .order_by(model.id)
+    )
+
+
+# recurso -> (consulta, columna para filtrar por partido)
+EXPORTS = {
+    "players": (_players, None),
+    "matches": (_matches, None),
+    "attendance": (lambda: _by_player(models.PlayerAttendance), models.PlayerAttendance.match_id),
+    "events": (lambda: _by_player(models.MatchEvent), models.MatchEvent.match_id),
+}
+
+
+def export_statement(resource: str, match_id: int = None):
+    if resource not in EXPORTS:
+        raise UnknownExport(resource)
+    build, match_column = EXPORTS[resource]
+    statement = build()
+    if match_id is not None:
+        if match_column is None:
+            raise ValueError(f"{resource} no se filtra por partido")
+        statement = statement.where(match_column == match_id)
+    return statement
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunk(keys, rows) -> bytes:
+    return b"".join(dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_export(statement, format: str, session_factory=AsyncReadSessionLocal, batch_size: int = EXPORT_BATCH_SIZE):
+    """Bloques de bytes (NDJSON o CSV con cabecera) de `batch_size` filas cada uno"""
+    async with session_factory() as db:
+        result = await db.stream(statement.execution_options(yield_per=batch_size))
+        keys = list(result.keys())
+        if format == "csv":
+            yield csv_chunk([keys])
+        async for rows in result.partitions():
+            yield csv_chunk(rows) if format == "csv" else ndjson_chunk(keys, rows)
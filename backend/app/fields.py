@@ -0,0 +1,81 @@
+"""
+Respuestas parciales: `?fields=id,name,team` en los listados.
+
+Cada conjunto de campos se traduce en un plan: `load_only` con las columnas
+pedidas (más la clave primaria, las claves de orden y las FK de las relaciones
+pedidas), solo los `selectinload` de las relaciones pedidas y un modelo de
+pydantic recortado para serializar. Los planes se guardan en un LRU por
+conjunto de campos: construir el modelo cuesta más que usarlo.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic import ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import ColumnProperty, RelationshipProperty, load_only
+
+
+class InvalidFields(ValueError):
+    """`fields` con campos que el esquema de salida no tiene"""
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    fields: tuple
+    options: tuple  # opciones de carga para crud (load_only + selectinload)
+    adapter: TypeAdapter  # List[modelo recortado]
+
+    def dump_json(self, items) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(items, from_attributes=True))
+
+
+class SparseFields:
+    """Planes de `fields=` para un esquema de salida y su modelo del ORM"""
+
+    def __init__(self, schema, model, relation_options: dict, always: tuple = (), max_plans: int = 256):
+        self.schema = schema
+        self.mapper = inspect(model)
+        self.relation_options = relation_options
+        primary_key = [self.mapper.get_property_by_column(column).key for column in self.mapper.primary_key]
+        self.always = tuple(always) + tuple(getattr(model, key) for key in primary_key)
+        self._plan = lru_cache(maxsize=max_plans)(self._build)
+
+    def plan(self, raw: Optional[str]) -> Optional[FieldPlan]:
+        """None si no se pidió `fields` (respuesta completa)"""
+        if not raw:
+            return None
+        fields = tuple(sorted({name.strip() for name in raw.split(",") if name.strip()}))
+        if not fields:
+            return None
+        return self._plan(fields)
+
+    def cache_info(self) -> dict:
+        return self._plan.cache_info()._asdict()
+
+    def _build(self, fields: tuple) -> FieldPlan:
+        unknown = [name for name in fields if name not in self.schema.model_fields or name not in self.mapper.attrs]
+        if unknown:
+            raise InvalidFields(", ".join(unknown))
+
+        columns = {column.key: column for column in self.always}
+        relations = []
+        for name in fields:
+            prop = self.mapper.attrs[name]
+            if isinstance(prop, ColumnProperty):
+                columns[name] = getattr(self.mapper.class_, name)
+            elif isinstance(prop, RelationshipProperty):
+                relations.append(self.relation_options[name])
+                # La FK local hace falta para resolver la relación muchos-a-uno
+                for column in prop.local_columns:
+                    columns[column.key] = getattr(self.mapper.class_, column.key)
+
+        ordered = [name for name in self.schema.model_fields if name in fields]  # orden del esquema
+        model = create_model(
+            f"{self.schema.__name__}Fields",
+            __config__=ConfigDict(from_attributes=True),
+            **{name: (self.schema.model_fields[name].annotation, self.schema.model_fields[name]) for name in ordered},
+        )
+        options = (load_only(*columns.values()), *relations)
+        return FieldPlan(fields, options, TypeAdapter(List[model]))
@@ -0,0 +1,231 @@
+"""
+Definiciones congeladas de las tablas que crean las migraciones.
+
+No se importan desde models.py a propósito: una migración ya aplicada tiene que
+crear siempre lo mismo. Los cambios posteriores del esquema (columnas, índices,
+tablas nuevas) van en su propia migración; este archivo no se edita.
+"""
+
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text
+from sqlalchemy.sql import func
+
+metadata = MetaData()
+
+
+def _timestamps():
+    return [
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True)),
+    ]
+
+
+# ===== MIGRACIÓN 1: esquema que creaba create_all antes de las migraciones =====
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("hashed_password", String, nullable=False),
+    Column("full_name", String, nullable=True),
+    Column("phone", String, nullable=True),
+    Column("is_admin", Boolean),
+    Column("is_player", Boolean),
+    Column("role", String),
+    Column("team_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("must_change_password", Boolean),
+    *_timestamps(),
+)
+
+position_zones = Table(
+    "position_zones", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("abbreviation", String(3), unique=True, nullable=False),
+    Column("name_es", String(20), nullable=False),
+    Column("name_en", String(20), nullable=False),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+position_specifics = Table(
+    "position_specifics", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("abbreviation", String(3), unique=True, nullable=False),
+    Column("name_es", String(20), nullable=False),
+    Column("name_en", String(20), nullable=False),
+    Column("zone_id", Integer, ForeignKey("position_zones.id"), nullable=False),
+    Column("description_es", Text, nullable=True),
+    Column("description_en", Text, nullable=True),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+teams = Table(
+    "teams", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False, unique=True),
+    Column("city", String, nullable=True),
+    Column("country", String, nullable=True),
+    Column("founded", Integer, nullable=True),
+    Column("description", Text, nullable=True),
+    Column("logo_url", String, nullable=True),
+    *_timestamps(),
+)
+
+players = Table(
+    "players", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("team_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("position_zone_id", Integer, ForeignKey("position_zones.id"), nullable=False),
+    Column("position_specific_id", Integer, ForeignKey("position_specifics.id"), nullable=True),
+    Column("name", String(100), nullable=False),
+    Column("email", String(100), unique=True, nullable=False),
+    Column("phone", String, nullable=True),
+    Column("date_of_birth", Date, nullable=True),
+    Column("nationality", String, nullable=True),
+    Column("jersey_number", Integer, nullable=True),
+    Column("height", Integer, nullable=True),
+    Column("weight", Integer, nullable=True),
+    Column("skill_level", Integer, nullable=False),
+    Column("photo_url", String, nullable=True),
+    Column("rit", Integer, nullable=True),
+    Column("tir", Integer, nullable=True),
+    Column("pas", Integer, nullable=True),
+    Column("reg", Integer, nullable=True),
+    Column("defense", Integer, nullable=True),
+    Column("fis", Integer, nullable=True),
+    Column("is_active", Boolean),
+    *_timestamps(),
+)
+
+venues = Table(
+    "venues", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("address", Text, nullable=True),
+    Column("capacity", Integer, nullable=True),
+    Column("surface", String(50)),
+    Column("facilities", Text, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+matches = Table(
+    "matches", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=True),
+    Column("date", DateTime(timezone=True), nullable=False),
+    Column("venue_id", Integer, ForeignKey("venues.id"), nullable=True),
+    Column("match_type", String(50), nullable=False),
+    Column("home_team_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("away_team_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("generated_team_a_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("generated_team_b_id", Integer, ForeignKey("teams.id"), nullable=True),
+    Column("status", String(50)),
+    Column("home_score", Integer, nullable=True),
+    Column("away_score", Integer, nullable=True),
+    Column("created_by", Integer, ForeignKey("users.id"), nullable=False),
+    *_timestamps(),
+)
+
+player_attendance = Table(
+    "player_attendance", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("match_id", Integer, ForeignKey("matches.id"), nullable=False),
+    Column("player_id", Integer, ForeignKey("players.id"), nullable=False),
+    Column("status", String(50)),
+    Column("confirmed_at", DateTime(timezone=True), nullable=True),
+    Column("notes", Text, nullable=True),
+    *_timestamps(),
+)
+
+match_events = Table(
+    "match_events", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("match_id", Integer, ForeignKey("matches.id"), nullable=False),
+    Column("player_id", Integer, ForeignKey("players.id"), nullable=False),
+    Column("event_type", String(50), nullable=False),
+    Column("minute", Integer, nullable=False),
+    Column("team_side", String(10), nullable=False),
+    Column("description", Text, nullable=True),
+    Column("timestamp", DateTime(timezone=True), server_default=func.now()),
+)
+
+championships = Table(
+    "championships", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("season", String(50), nullable=False),
+    Column("start_date", DateTime(timezone=True), nullable=False),
+    Column("end_date", DateTime(timezone=True), nullable=False),
+    Column("status", String(50)),
+    Column("points_for_win", Integer),
+    Column("points_for_draw", Integer),
+    Column("points_for_loss", Integer),
+    Column("max_players_per_team", Integer),
+    Column("min_players_per_team", Integer),
+    Column("substitution_limit", Integer),
+    *_timestamps(),
+)
+
+championship_teams = Table(
+    "championship_teams", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("championship_id", Integer, ForeignKey("championships.id"), nullable=False),
+    Column("team_id", Integer, ForeignKey("teams.id"), nullable=False),
+    Column("played", Integer),
+    Column("won", Integer),
+    Column("drawn", Integer),
+    Column("lost", Integer),
+    Column("goals_for", Integer),
+    Column("goals_against", Integer),
+    Column("points", Integer),
+    Column("position", Integer, nullable=True),
+    *_timestamps(),
+)
+
+external_teams = Table(
+    "external_teams", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(255), nullable=False),
+    Column("logo_url", Text, nullable=True),
+    Column("description", Text, nullable=True),
+    Column("level", String(50)),
+    Column("contact_name", String(255), nullable=False),
+    Column("contact_email", String(255), nullable=False),
+    Column("contact_phone", String(50), nullable=True),
+    *_timestamps(),
+)
+
+notifications = Table(
+    "notifications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("type", String(50), nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("recipient_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("match_id", Integer, ForeignKey("matches.id"), nullable=True),
+    Column("read", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("expires_at", DateTime(timezone=True), nullable=True),
+)
+
+BASELINE_TABLES = [
+    users, position_zones, position_specifics, teams, players, venues, matches,
+    player_attendance, match_events, championships, championship_teams, external_teams, notifications,
+]
+
+
+# ===== MIGRACIÓN 5 =====
+
+refresh_tokens = Table(
+    "refresh_tokens", metadata,
+    Column("jti", String(32), primary_key=True),
+    Column("family_id", String(32), nullable=False),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("used_at", DateTime, nullable=True),
+    Column("revoked_at", DateTime, nullable=True),
+    Index("ix_refresh_tokens_family_id", "family_id"),
+    Index("ix_refresh_tokens_expires_at", "expires_at"),
+)
@@ -0,0 +1,125 @@
+"""
+Hash y verificación de contraseñas fuera del threadpool de Starlette.
+
+bcrypt consume ~250 ms de CPU por llamada. En un pool de procesos propio, una
+ráfaga de logins antes de un partido no ocupa los hilos que atienden el resto
+de los endpoints síncronos. El pool tiene un límite de trabajos pendientes: por
+encima se responde 503 con Retry-After en vez de encolar sin fin.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import anyio
+from passlib.context import CryptContext
+
+from .config import HASH_POOL_MAX_PENDING, HASH_POOL_RETRY_AFTER, HASH_POOL_WORKERS
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Funciones de módulo: se ejecutan en los procesos del pool
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+def _warm_up():
+    return True
+
+
+class HashingPoolBusy(Exception):
+    """El pool ya tiene HASH_POOL_MAX_PENDING trabajos pendientes"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Pool de hashing saturado, reintentar en {retry_after}s")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """Pool de procesos acotado para bcrypt.
+
+    Se usa solo desde el event loop, así que los contadores no necesitan lock.
+    Con workers=0 los hashes corren en el threadpool compartido (comportamiento
+    anterior), útil en desarrollo y para comparar en el benchmark.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int = 1):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.errors = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def executor(self):
+        if self._executor is None and self.workers > 0:
+            # spawn: los procesos no heredan conexiones ni hilos del worker web
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def start(self):
+        """Levanta los procesos antes de la primera petición"""
+        if self.workers > 0:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, function, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingPoolBusy(self.retry_after)
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            if self.workers > 0:
+                return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+            return await anyio.to_thread.run_sync(function, *args)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.pending -= 1
+            self.completed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queue_depth": max(self.pending - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            # Latencia total de cada hash, incluida la espera en cola
+            "latency_avg_ms": round(self._latency_total * 1000 / self.completed, 3) if self.completed else 0.0,
+            "latency_max_ms": round(self._latency_max * 1000, 3),
+        }
+
+
+hashing_pool = HashingPool(HASH_POOL_WORKERS, HASH_POOL_MAX_PENDING, HASH_POOL_RETRY_AFTER)
@@ -1,12 +1,43 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from . import models, schemas, crud, auth, database
-from .database import SessionLocal, engine
+from . import models, schemas, crud, auth, database, migrations
+from .cache import snapshot_user, token_cache, user_cache
+from .hashing import HashingPoolBusy, hashing_pool
+from .rate_limit import RateLimited, account_key, auth_limiter, client_ip
+from .database import (
+    SessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    AsyncReadSessionLocal,
+    engine,
+    async_engine,
+    replica_engine,
+    async_replica_engine,
+    replica_router,
+    unit_of_work,
+    LAST_WRITE_HEADER,
+    ReadYourWritesMiddleware,
+)
+from .config import BULK_MAX_ROWS, COMPRESSION_ENABLED, FAST_JSON_RESPONSES, REFRESH_TOKEN_PURGE_SECONDS, REPLICA_LAG_CHECK_INTERVAL, SCHEMA_CHECK, SEARCH_MAX_LIMIT, SEARCH_MAX_QUERY_LENGTH, TOKEN_VERSION_REFRESH_SECONDS
+from .access import AccessContext
+from .compression import CompressionMiddleware, brotli, compression_stats
+from .export import MEDIA_TYPES as EXPORT_MEDIA_TYPES, UnknownExport, export_statement, stream_export
+from .conditional import NotModified, check_not_modified
+from .auth import Principal, revoked_refresh_families, token_versions
+from .fields import InvalidFields, SparseFields
+from .pagination import NEXT_CURSOR_HEADER, InvalidCursor, next_cursor
+from .serialization import ENCODER, ORMSerializer
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import Any, List
+import asyncio
+import logging
+from sqlalchemy import exc
 
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -17,8 +48,89 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, LAST_WRITE_HEADER],
 )
 
+# Con réplica: quien acaba de escribir lee del primario (cookie/cabecera last_write)
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Agregado después de CORS: queda por fuera y comprime también sus respuestas
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": "Cursor de paginación inválido"})
+
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(status_code=304, headers=exc.headers)
+
+@app.exception_handler(InvalidFields)
+async def invalid_fields_handler(request: Request, exc: InvalidFields):
+    return JSONResponse(status_code=400, content={"detail": f"Campos desconocidos en fields: {exc}"})
+
+@app.exception_handler(HashingPoolBusy)
+async def hashing_pool_busy_handler(request: Request, exc: HashingPoolBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Demasiados inicios de sesión simultáneos, intenta de nuevo"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Demasiados intentos, intenta de nuevo más tarde"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+async def limit_auth_attempts(request: Request, email: str = None):
+    """Token bucket por IP y por cuenta antes de gastar bcrypt (429 si se excede)"""
+    await auth_limiter.check(ip=client_ip(request), account=account_key(email) if email else None)
+
+def check_bulk_size(rows: list):
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Máximo {BULK_MAX_ROWS} filas por petición")
+
+def paginate(response: Response, items, keys, limit: int):
+    """Agrega el cursor de la página siguiente en la cabecera X-Next-Cursor"""
+    token = next_cursor(items, keys, limit)
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
+    return items
+
+# ?fields= en los listados principales (ver app/fields.py)
+PLAYER_FIELDS = SparseFields(schemas.PlayerOut, models.Player, crud.PLAYER_RELATION_OPTIONS, always=crud.PLAYER_PAGE_KEYS)
+MATCH_FIELDS = SparseFields(schemas.MatchOut, models.Match, crud.MATCH_RELATION_OPTIONS, always=crud.MATCH_PAGE_KEYS)
+
+# FAST_JSON_RESPONSES: serializadores prearmados para los listados grandes (ver app/serialization.py)
+PLAYER_JSON = ORMSerializer(schemas.PlayerOut)
+MATCH_JSON = ORMSerializer(schemas.MatchOut)
+TEAM_JSON = ORMSerializer(schemas.TeamWithPlayers)
+
+# Cabeceras de la respuesta inyectada que se copian cuando el endpoint devuelve su propio Response
+PASSTHROUGH_HEADERS = (NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Cache-Control")
+
+def json_bytes(content: bytes, response: Response = None) -> Response:
+    """JSON ya codificado; FastAPI no vuelve a pasarlo por response_model"""
+    headers = {key: response.headers[key] for key in PASSTHROUGH_HEADERS if key in response.headers} if response else None
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def list_page(response: Response, items, keys, limit: int, plan=None, serializer: ORMSerializer = None):
+    """Como paginate(); con `fields` serializa con el modelo recortado del plan y con
+    FAST_JSON_RESPONSES con el serializador prearmado"""
+    paginate(response, items, keys, limit)
+    if plan is not None:
+        content = plan.dump_json(items)
+    elif FAST_JSON_RESPONSES and serializer is not None:
+        content = serializer.dump_json_list(items)
+    else:
+        return items
+    return json_bytes(content, response)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 def get_db():
@@ -28,36 +140,151 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Lecturas (GET): réplica si está configurada y al día, si no el primario
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def monitor_replica_lag():
+    while True:
+        await database.check_replica_lag()
+        await asyncio.sleep(REPLICA_LAG_CHECK_INTERVAL)
+
+async def load_token_versions():
+    try:
+        async with async_engine.connect() as conn:
+            await conn.run_sync(token_versions.load)
+    except exc.SQLAlchemyError as e:
+        logger.warning("No se pudieron cargar las versiones de token: %s", e)
+
+async def refresh_token_versions():
+    while True:
+        await asyncio.sleep(TOKEN_VERSION_REFRESH_SECONDS)
+        await load_token_versions()
+
+def compact_refresh_tokens(conn):
+    purged = crud.purge_refresh_tokens(conn)
+    revoked = revoked_refresh_families.load(conn)
+    logger.info("Refresh tokens vencidos borrados: %s; sesiones revocadas vigentes: %s", purged, revoked)
+
+async def purge_refresh_tokens():
+    """Borra los refresh tokens vencidos y recarga las sesiones revocadas"""
+    while True:
+        try:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(compact_refresh_tokens)
+        except exc.SQLAlchemyError as e:
+            logger.warning("No se pudieron depurar los refresh tokens: %s", e)
+        await asyncio.sleep(REFRESH_TOKEN_PURGE_SECONDS)
+
+@app.on_event("startup")
+async def check_schema_version():
+    """El esquema se migra con migrate.py; aquí solo se compara la versión"""
+    if SCHEMA_CHECK == "off":
+        return
+    async with async_engine.connect() as conn:
+        status = await conn.run_sync(migrations.schema_status)
+    if status["pending"]:
+        message = (
+            f"Esquema en versión {status['current']}, última {status['latest']}: "
+            "ejecuta 'python migrate.py'"
+        )
+        if SCHEMA_CHECK == "strict":
+            raise RuntimeError(message)
+        logger.warning(message)
+
+@app.on_event("startup")
+async def start_replica_monitor():
+    if replica_router.enabled:
+        await database.check_replica_lag()
+        app.state.replica_monitor = asyncio.create_task(monitor_replica_lag())
+
+@app.on_event("startup")
+async def start_token_version_refresh():
+    await load_token_versions()
+    app.state.token_version_refresh = asyncio.create_task(refresh_token_versions())
+
+@app.on_event("startup")
+async def start_refresh_token_purge():
+    app.state.refresh_token_purge = asyncio.create_task(purge_refresh_tokens())
+
+@app.on_event("startup")
+async def start_hashing_pool():
+    await hashing_pool.start()
+
+@app.on_event("startup")
+async def report_json_encoder():
+    if FAST_JSON_RESPONSES and ENCODER != "orjson":
+        logger.warning("FAST_JSON_RESPONSES activo sin orjson: se codifica con json (pip install -r requirements.txt)")
+    else:
+        logger.info("FAST_JSON_RESPONSES=%s, codificador JSON: %s", FAST_JSON_RESPONSES, ENCODER)
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    hashing_pool.shutdown()
+    for name in ("replica_monitor", "token_version_refresh", "refresh_token_purge"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    await async_engine.dispose()
+    if async_replica_engine is not async_engine:
+        await async_replica_engine.dispose()
+
+# Registro y login son async: bcrypt corre en hashing_pool y las escrituras
+# síncronas en el threadpool, sin ocupar un hilo mientras se calcula el hash.
 @app.post("/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, user.email)
+async def register(request: Request, user: schemas.UserCreate, db: Session = Depends(get_db)):
+    await limit_auth_attempts(request, user.email)
+    db_user = await run_in_threadpool(crud.get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email ya registrado")
-    return crud.create_user(db, user)
+    hashed_password = await hashing_pool.hash(user.password)
+    return await run_in_threadpool(crud.create_user, db, user, hashed_password)
 
 @app.post("/create-admin", response_model=schemas.UserOut)
-def create_admin(email: str, password: str, full_name: str = None, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email)
+async def create_admin(request: Request, email: str, password: str, full_name: str = None, db: Session = Depends(get_db)):
+    await limit_auth_attempts(request, email)
+    db_user = await run_in_threadpool(crud.get_user_by_email, db, email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email ya registrado")
-    return crud.create_admin_user(db, email, password, full_name)
+    hashed_password = await hashing_pool.hash(password)
+    return await run_in_threadpool(crud.create_admin_user, db, email, password, full_name, hashed_password)
+
+def token_response(user: models.User, refresh_record: models.RefreshToken) -> dict:
+    claims = auth.user_claims(user)
+    return {
+        "access_token": auth.create_access_token(data=claims),
+        "token_type": "bearer",
+        "user": schemas.UserOut.from_orm(user),
+        "refresh_token": auth.create_refresh_token(user.email, refresh_record),
+    }
 
 @app.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = crud.authenticate_user(db, form_data.username, form_data.password)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    await limit_auth_attempts(request, form_data.username)
+    user = await crud.authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Credenciales incorrectas")
-    access_token = auth.create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return token_response(user, await crud.issue_refresh_token_async(db, user.id))
 
 @app.post("/auth/login", response_model=schemas.Token)
-def login_with_email(login_data: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = crud.authenticate_user(db, login_data.email, login_data.password)
+async def login_with_email(request: Request, login_data: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
+    await limit_auth_attempts(request, login_data.email)
+    user = await crud.authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Credenciales incorrectas")
-    access_token = auth.create_access_token(data={"sub": user.email})
-    refresh_token = auth.create_refresh_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer", "user": schemas.UserOut.from_orm(user), "refresh_token": refresh_token}
+    return token_response(user, await crud.issue_refresh_token_async(db, user.id))
 
 @app.post("/auth/refresh", response_model=schemas.RefreshTokenResponse)
 def refresh_token(refresh_data: schemas.RefreshTokenRequest, db: Session = Depends(get_db)):
@@ -69,6 +296,11 @@ def refresh_token(refresh_data: schemas.RefreshTokenRequest, db: Session = Depen
     # Verificar que sea un refresh token
     if payload.get("type") != "refresh":
         raise HTTPException(status_code=401, detail="Token no es un refresh token")
+    # Sin jti: emitido antes de registrar los refresh tokens, no se puede rotar
+    if not payload.get("jti") or not payload.get("fam"):
+        raise HTTPException(status_code=401, detail="Refresh token inválido o expirado")
+    if payload["fam"] in revoked_refresh_families:
+        raise HTTPException(status_code=401, detail="Refresh token revocado")
     
     # Obtener el usuario
     email = payload.get("sub")
@@ -79,9 +311,15 @@ def refresh_token(refresh_data: schemas.RefreshTokenRequest, db: Session = Depen
     if not user:
         raise HTTPException(status_code=401, detail="Usuario no encontrado")
     
-    # Crear nuevos tokens
-    new_access_token = auth.create_access_token(data={"sub": user.email})
-    new_refresh_token = auth.create_refresh_token(data={"sub": user.email})
+    # Rotación: el token presentado queda usado y se emite el siguiente de la sesión
+    record = crud.rotate_refresh_token(db, payload["jti"], payload["fam"], user.id)
+    if record is None:
+        raise HTTPException(status_code=401, detail="Refresh token revocado")
+
+    # Crear nuevos tokens con los claims actuales del usuario
+    claims = auth.user_claims(user)
+    new_access_token = auth.create_access_token(data=claims)
+    new_refresh_token = auth.create_refresh_token(user.email, record)
     
     return {
         "access_token": new_access_token,
@@ -89,38 +327,158 @@ def refresh_token(refresh_data: schemas.RefreshTokenRequest, db: Session = Depen
         "refresh_token": new_refresh_token
     }
 
+@app.post("/auth/logout")
+def logout(refresh_data: schemas.RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Cierra la sesión: revoca el refresh token y todos los rotados a partir del mismo login"""
+    payload = auth.verify_token(refresh_data.refresh_token)
+    if not payload or payload.get("type") != "refresh" or not payload.get("fam"):
+        raise HTTPException(status_code=401, detail="Refresh token inválido o expirado")
+    if payload["fam"] not in revoked_refresh_families:
+        crud.revoke_refresh_family(db, payload["fam"])
+    return {"message": "Sesión cerrada"}
+
 from fastapi import Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError
 
 security = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    print(f"🔍 DEBUG - get_current_user llamado con token: {credentials.credentials[:20]}...")
-    token = credentials.credentials
+def decode_access_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
-        email: str = payload.get("sub")
-        print(f"🔍 DEBUG - Token decodificado, email: {email}")
-        if email is None:
-            print("❌ ERROR - Token no contiene email")
-            raise HTTPException(status_code=401, detail="Token inválido")
-    except JWTError as e:
-        print(f"❌ ERROR - Error decodificando token: {e}")
+        payload = auth.decode_token(token)
+    except JWTError:
         raise HTTPException(status_code=401, detail="Token inválido")
-    
-    user = crud.get_user_by_email(db, email)
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Token inválido")
+    # Un refresh token no autoriza peticiones; los access tokens anteriores a "type" no lo traen
+    if payload.get("type", "access") != "access":
+        raise HTTPException(status_code=401, detail="Token inválido")
+    # Revocación: la versión del token debe ser la vigente del usuario
+    if payload.get("uid") is not None and not token_versions.is_current(payload["uid"], payload.get("ver", 0)):
+        raise HTTPException(status_code=401, detail="Token revocado")
+    return payload
+
+async def load_current_user(email: str, db: AsyncSession) -> models.User:
+    # Copia en caché del usuario: sin consulta a la base en peticiones repetidas
+    user = user_cache.get(email)
     if user is None:
-        print(f"❌ ERROR - Usuario {email} no encontrado en BD")
-        raise HTTPException(status_code=401, detail="Usuario no encontrado")
-    
-    print(f"✅ DEBUG - Usuario autenticado: {user.email}, is_admin: {user.is_admin}")
+        db_user = await crud.get_user_by_email_async(db, email)
+        if db_user is None:
+            raise HTTPException(status_code=401, detail="Usuario no encontrado")
+        user = snapshot_user(db_user)
+        user_cache.set(email, user)
     return user
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_async_db)):
+    payload = decode_access_token(credentials.credentials)
+    return await load_current_user(payload["sub"], db)
+
+async def get_current_principal(credentials: HTTPAuthorizationCredentials = Security(security), db: AsyncSession = Depends(get_async_db)) -> Principal:
+    """Usuario autenticado a partir de los claims del token, sin leer la tabla users.
+
+    Los tokens anteriores a los claims extendidos se resuelven con get_current_user.
+    """
+    payload = decode_access_token(credentials.credentials)
+    principal = Principal.from_claims(payload)
+    if principal is None:
+        principal = Principal.from_user(await load_current_user(payload["sub"], db))
+    return principal
+
+async def get_access_context(current_user: Principal = Depends(get_current_principal)) -> AccessContext:
+    """Alcance de lectura (rol, equipo) del usuario, una vez por petición"""
+    return AccessContext.from_principal(current_user)
+
 @app.get("/me", response_model=schemas.UserOut)
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+async def read_users_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
+@app.get("/admin/db/pool")
+async def get_db_pool_stats(current_user: Principal = Depends(get_current_principal)):
+    """Estadísticas del pool de conexiones y de la caché de sentencias compiladas"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver el estado de la base de datos")
+    stats = {
+        "sync": database.get_pool_stats(engine),
+        "async": database.get_pool_stats(async_engine.sync_engine),
+        "replica": replica_router.status(),
+    }
+    stats["statement_cache"] = {
+        "sync": database.get_statement_cache_stats(engine),
+        "async": database.get_statement_cache_stats(async_engine.sync_engine),
+    }
+    if replica_router.enabled:
+        stats["replica_sync"] = database.get_pool_stats(replica_engine)
+        stats["replica_async"] = database.get_pool_stats(async_replica_engine.sync_engine)
+        stats["statement_cache"]["replica_sync"] = database.get_statement_cache_stats(replica_engine)
+        stats["statement_cache"]["replica_async"] = database.get_statement_cache_stats(async_replica_engine.sync_engine)
+    return stats
+
+@app.post("/admin/users/{user_id}/revoke-tokens")
+def revoke_user_tokens(user_id: int, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
+    """Invalida todos los tokens emitidos para un usuario: access tokens y sesiones de refresh"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden revocar tokens")
+    user = crud.get_user_by_id(db, user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    auth.bump_token_version(user)
+    crud.revoke_user_refresh_tokens(db, user.id)  # confirma también la nueva versión
+    return {"message": "Tokens revocados", "token_version": user.token_version}
+
+@app.get("/admin/hashing")
+async def get_hashing_stats(current_user: Principal = Depends(get_current_principal)):
+    """Cola, rechazos y latencia del pool de procesos de bcrypt"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver el pool de hashing")
+    return hashing_pool.stats()
+
+@app.get("/admin/rate-limit")
+async def get_rate_limit_stats(current_user: Principal = Depends(get_current_principal)):
+    """Intentos de login/registro permitidos y rechazados (429) en este worker"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver el límite de intentos")
+    return auth_limiter.stats()
+
+@app.get("/admin/compression")
+async def get_compression_stats(current_user: Principal = Depends(get_current_principal)):
+    """Respuestas comprimidas y bytes antes/después en este worker"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver la compresión")
+    stats = dict(compression_stats)
+    stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None
+    return {"enabled": COMPRESSION_ENABLED, "brotli": brotli is not None, **stats}
+
+@app.get("/admin/export/{resource}")
+async def export_table(resource: str, format: str = "ndjson", match_id: int = None, current_user: Principal = Depends(get_current_principal)):
+    """Exporta players, matches, attendance o events completos en NDJSON o CSV, en streaming"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden exportar datos")
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Formato no soportado (ndjson o csv)")
+    try:
+        statement = export_statement(resource, match_id)
+    except UnknownExport:
+        raise HTTPException(status_code=404, detail="Export no encontrado")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        stream_export(statement, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'},
+    )
+
+@app.get("/admin/cache")
+async def get_cache_stats(current_user: Principal = Depends(get_current_principal)):
+    """Aciertos y fallos de las cachés en memoria de este worker"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden ver el estado de las cachés")
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "fields": {"players": PLAYER_FIELDS.cache_info(), "matches": MATCH_FIELDS.cache_info()},
+        "json": {"fast_responses": FAST_JSON_RESPONSES, "encoder": ENCODER},
+    }
+
 # Team routes
 @app.post("/teams/", response_model=schemas.TeamOut)
 def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -129,30 +487,30 @@ def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db), current
     return crud.create_team(db, team)
 
 @app.get("/teams/", response_model=list[schemas.TeamOut])
-def get_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.is_admin:
-        return crud.get_teams_with_player_count(db, skip=skip, limit=limit)
+async def get_teams(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: str = None, db: AsyncSession = Depends(get_async_read_db), access: AccessContext = Depends(get_access_context)):
+    version = await crud.get_teams_version_async(db, scope=access.team_filter(models.Team.id))
+    check_not_modified(request, response, version, access)
+    if access.sees_all:
+        teams = await crud.get_teams_with_player_count_async(db, skip=skip, limit=limit, cursor=cursor)
     else:
-        # Jugadores solo ven su equipo
-        player = crud.get_player_by_user_id(db, current_user.id)
-        if player and player.team_id:
-            team = crud.get_team(db, player.team_id)
-            return [team] if team else []
-        return []
+        # Jugadores y supervisores solo ven su equipo
+        teams = await crud.get_teams_async(db, skip=skip, limit=limit, cursor=cursor, scope=access.team_filter(models.Team.id))
+    return paginate(response, teams, crud.TEAM_PAGE_KEYS, limit)
 
 @app.get("/teams/{team_id}", response_model=schemas.TeamWithPlayers)
-def get_team(team_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.is_admin:
-        team = crud.get_team_with_players(db, team_id)
-    else:
-        # Jugadores solo pueden ver su equipo
-        player = crud.get_player_by_user_id(db, current_user.id)
-        if not player or player.team_id != team_id:
-            raise HTTPException(status_code=403, detail="No tienes acceso a este equipo")
-        team = crud.get_team_with_players(db, team_id)
-    
+async def get_team(request: Request, response: Response, team_id: int, db: AsyncSession = Depends(get_async_read_db), access: AccessContext = Depends(get_access_context)):
+    # Jugadores y supervisores solo pueden ver su equipo
+    scope = access.team_filter(models.Team.id)
+    version = await crud.get_team_version_async(db, team_id, scope=scope)
+    if version[0]:  # sin fila no hay validador: 403/404 como siempre
+        check_not_modified(request, response, version, access)
+    team = await crud.get_team_with_players_async(db, team_id, scope=scope)
     if not team:
+        if not access.sees_all:
+            raise HTTPException(status_code=403, detail="No tienes acceso a este equipo")
         raise HTTPException(status_code=404, detail="Equipo no encontrado")
+    if FAST_JSON_RESPONSES:
+        return json_bytes(TEAM_JSON.dump_json(team), response)
     return team
 
 @app.put("/teams/{team_id}", response_model=schemas.TeamOut)
@@ -180,100 +538,89 @@ def create_player(player: schemas.PlayerCreate, db: Session = Depends(get_db), c
         raise HTTPException(status_code=403, detail="Solo administradores pueden crear jugadores")
     return crud.create_player(db, player)
 
+@app.post("/players/bulk", response_model=schemas.BulkResult)
+def bulk_upsert_players(rows: List[Any], db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    """Crear o actualizar (por email) varios jugadores en una sola petición"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Solo administradores pueden crear jugadores")
+    check_bulk_size(rows)
+    return crud.bulk_upsert_players(db, rows)
+
 @app.get("/players/", response_model=list[schemas.PlayerOut])
-def get_players(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.is_admin:
-        # Admin ve todos los jugadores
-        return db.query(models.Player).offset(skip).limit(limit).all()
-    else:
-        # Jugadores solo ven jugadores de su equipo
-        player = crud.get_player_by_user_id(db, current_user.id)
-        if player and player.team_id:
-            return crud.get_players_by_team(db, player.team_id)
-        return []
+async def get_players(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: str = None, fields: str = None, db: AsyncSession = Depends(get_async_read_db), access: AccessContext = Depends(get_access_context)):
+    # Admin ve todos los jugadores; el resto, solo los de su equipo
+    plan = PLAYER_FIELDS.plan(fields)
+    scope = access.team_filter(models.Player.team_id)
+    version = await crud.get_players_version_async(db, scope=scope)
+    check_not_modified(request, response, version, access)
+    players = await crud.get_players_async(
+        db, skip=skip, limit=limit, cursor=cursor, scope=scope,
+        options=plan.options if plan else crud.PLAYER_OUT_OPTIONS,
+    )
+    return list_page(response, players, crud.PLAYER_PAGE_KEYS, limit, plan, PLAYER_JSON)
+
+# Declarado antes de /players/{player_id} para que "summary" no se tome como id
+@app.get("/players/summary", response_model=List[schemas.PlayerSummary])
+async def get_player_summaries(response: Response, team_id: int = None, skip: int = 0, limit: int = 100, cursor: str = None, db: AsyncSession = Depends(get_async_read_db), access: AccessContext = Depends(get_access_context)):
+    """Resumen plano de jugadores (sin usuario ni equipo anidados), mismo alcance que /players/"""
+    players = await crud.get_player_summaries_async(db, team_id=team_id, skip=skip, limit=limit, cursor=cursor, scope=access.team_filter(models.Player.team_id))
+    return paginate(response, players, crud.PLAYER_PAGE_KEYS, limit)
+
+@app.get("/players/search", response_model=List[schemas.PlayerSearchResult])
+async def search_players(
+    q: str = Query(None, max_length=SEARCH_MAX_QUERY_LENGTH),
+    nationality: str = None,
+    position_zone_id: int = None,
+    skill_min: int = None,
+    skill_max: int = None,
+    rit_min: int = None,
+    tir_min: int = None,
+    pas_min: int = None,
+    reg_min: int = None,
+    defense_min: int = None,
+    fis_min: int = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_read_db),
+    access: AccessContext = Depends(get_access_context),
+):
+    """Jugadores activos por nombre (sin tildes, por prefijo o aproximado) y filtros, mismo alcance que /players/"""
+    skill_minimums = (rit_min, tir_min, pas_min, reg_min, defense_min, fis_min)
+    minimums = {skill: value for skill, value in zip(crud.PLAYER_SKILLS, skill_minimums) if value is not None}
+    results = await crud.search_players_async(
+        db, q=q, nationality=nationality, position_zone_id=position_zone_id,
+        skill_min=skill_min, skill_max=skill_max, minimums=minimums,
+        scope=access.team_filter(models.Player.team_id), limit=max(1, min(limit, SEARCH_MAX_LIMIT)),
+    )
+    return [{**row._mapping, "match": kind, "score": score} for row, kind, score in results]
 
 @app.get("/team-generator/players/", response_model=list[schemas.PlayerOut])
-def get_players_for_team_generator(
+async def get_players_for_team_generator(
     team_id: int = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    access: AccessContext = Depends(get_access_context)
 ):
     """Get players for team generator with role-based filtering"""
-    
-    # Filtrar jugadores según el rol del usuario
-    query = db.query(models.Player)
-    
-    if current_user.role == "admin":
+    if access.sees_all:
         # Administradores ven todos los jugadores
-        if team_id:
-            query = query.filter(models.Player.team_id == team_id)
-    elif current_user.role == "supervisor":
-        # Supervisores solo ven jugadores de su equipo
-        if current_user.team_id:
-            query = query.filter(models.Player.team_id == current_user.team_id)
-        else:
-            # Si no tiene equipo asignado, no puede ver jugadores
-            return []
-    elif current_user.role == "player":
-        # Jugadores solo ven jugadores de su equipo
-        player_profile = db.query(models.Player).filter(models.Player.user_id == current_user.id).first()
-        if player_profile and player_profile.team_id:
-            query = query.filter(models.Player.team_id == player_profile.team_id)
-        else:
-            return []
-    elif current_user.role == "guest":
-        # Invitados no pueden ver jugadores para generar equipos
-        return []
-    else:
-        # Rol no reconocido
-        return []
-    
-    return query.all()
+        return await crud.get_players_async(db, team_id=team_id or None)
+    # Supervisores y jugadores solo ven su equipo; invitados, ninguno
+    return await crud.get_players_async(db, scope=access.team_filter(models.Player.team_id))
 
 @app.get("/team-generator/teams/", response_model=list[schemas.TeamOut])
-def get_teams_for_team_generator(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+async def get_teams_for_team_generator(
+    db: AsyncSession = Depends(get_async_read_db),
+    access: AccessContext = Depends(get_access_context)
 ):
     """Get teams for team generator with role-based filtering"""
-    
-    if current_user.role == "admin":
-        # Administradores ven todos los equipos
-        return crud.get_teams(db)
-    elif current_user.role == "supervisor":
-        # Supervisores solo ven su equipo
-        if current_user.team_id:
-            team = crud.get_team(db, current_user.team_id)
-            return [team] if team else []
-        return []
-    elif current_user.role == "player":
-        # Jugadores solo ven su equipo
-        player_profile = db.query(models.Player).filter(models.Player.user_id == current_user.id).first()
-        if player_profile and player_profile.team_id:
-            team = crud.get_team(db, player_profile.team_id)
-            return [team] if team else []
-        return []
-    elif current_user.role == "guest":
-        # Invitados no pueden ver equipos para generar
-        return []
-    else:
-        return []
+    return await crud.get_teams_async(db, scope=access.team_filter(models.Team.id))
 
 @app.get("/players/{player_id}", response_model=schemas.PlayerOut)
-def get_player(player_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    if current_user.is_admin:
-        player = crud.get_player(db, player_id)
-    else:
-        # Jugadores solo pueden ver jugadores de su equipo
-        current_player = crud.get_player_by_user_id(db, current_user.id)
-        if not current_player or not current_player.team_id:
-            raise HTTPException(status_code=403, detail="No tienes acceso a este jugador")
-        
-        player = crud.get_player(db, player_id)
-        if not player or player.team_id != current_player.team_id:
-            raise HTTPException(status_code=403, detail="No tienes acceso a este jugador")
-    
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_read_db), access: AccessContext = Depends(get_access_context)):
+    # Jugadores y supervisores solo pueden ver jugadores de su equipo
+    player = await crud.get_player_async(db, player_id, scope=access.team_filter(models.Player.team_id))
     if not player:
+        if not access.sees_all:
+            raise HTTPException(status_code=403, detail="No tienes acceso a este jugador")
         raise HTTPException(status_code=404, detail="Jugador no encontrado")
     return player
 
@@ -415,12 +762,12 @@ def remove_player_from_team(player_id: int, db: Session = Depends(get_db), curre
 
 # Position routes
 @app.get("/positions/zones/", response_model=list[schemas.PositionZoneOut])
-def get_position_zones(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_position_zones(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """Get all position zones"""
     return crud.get_position_zones(db, skip=skip, limit=limit)
 
 @app.get("/positions/zones/{abbreviation}", response_model=schemas.PositionZoneOut)
-def get_position_zone_by_abbreviation(abbreviation: str, db: Session = Depends(get_db)):
+def get_position_zone_by_abbreviation(abbreviation: str, db: Session = Depends(get_read_db)):
     """Get position zone by abbreviation"""
     zone = crud.get_position_zone_by_abbreviation(db, abbreviation)
     if not zone:
@@ -428,18 +775,18 @@ def get_position_zone_by_abbreviation(abbreviation: str, db: Session = Depends(g
     return zone
 
 @app.get("/positions/specifics/", response_model=list[schemas.PositionSpecificOut])
-def get_position_specifics(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_position_specifics(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """Get all position specifics"""
     return crud.get_position_specifics(db, skip=skip, limit=limit)
 
 @app.get("/positions/specifics/zone/{zone_id}", response_model=list[schemas.PositionSpecificOut])
-def get_position_specifics_by_zone(zone_id: int, db: Session = Depends(get_db)):
+def get_position_specifics_by_zone(zone_id: int, db: Session = Depends(get_read_db)):
     """Get position specifics by zone"""
     specifics = crud.get_position_specifics_by_zone(db, zone_id)
     return specifics
 
 @app.get("/positions/specifics/{abbreviation}", response_model=schemas.PositionSpecificOut)
-def get_position_specific_by_abbreviation(abbreviation: str, db: Session = Depends(get_db)):
+def get_position_specific_by_abbreviation(abbreviation: str, db: Session = Depends(get_read_db)):
     """Get position specific by abbreviation"""
     specific = crud.get_position_specific_by_abbreviation(db, abbreviation)
     if not specific:
@@ -447,9 +794,16 @@ def get_position_specific_by_abbreviation(abbreviation: str, db: Session = Depen
     return specific
 
 # Player registration with positions
+TEMP_PLAYER_PASSWORD = "temp_password_123"  # El usuario deberá cambiar su contraseña
+
 @app.post("/players/register/", response_model=schemas.PlayerOut)
-def register_player(player_data: schemas.PlayerRegistration, db: Session = Depends(get_db)):
+async def register_player(request: Request, player_data: schemas.PlayerRegistration, db: Session = Depends(get_db)):
     """Register a new player with position information"""
+    await limit_auth_attempts(request, player_data.email)
+    hashed_password = await hashing_pool.hash(TEMP_PLAYER_PASSWORD)
+    return await run_in_threadpool(create_registered_player, player_data, db, hashed_password)
+
+def create_registered_player(player_data: schemas.PlayerRegistration, db: Session, hashed_password: str):
     # Verificar que la zona de posición existe
     zone = crud.get_position_zone_by_abbreviation(db, player_data.position_zone)
     if not zone:
@@ -468,33 +822,39 @@ def register_player(player_data: schemas.PlayerRegistration, db: Session = Depen
     # Crear usuario primero
     user_data = schemas.UserCreate(
         email=player_data.email,
-        password="temp_password_123",  # El usuario deberá cambiar su contraseña
+        password=TEMP_PLAYER_PASSWORD,
         full_name=player_data.full_name,
         phone=player_data.phone,
         is_player=True
     )
     
-    # Verificar si el usuario ya existe
-    existing_user = crud.get_user_by_email(db, player_data.email)
-    if existing_user:
+    # Verificar si el usuario o un jugador ya usan el email (players.email también es único)
+    if crud.get_user_by_email(db, player_data.email) or crud.get_player_by_email(db, player_data.email):
         raise HTTPException(status_code=400, detail="El email ya está registrado")
     
-    user = crud.create_user(db, user_data)
-    
-    # Crear jugador
-    player_data_dict = player_data.dict()
-    player_data_dict["user_id"] = user.id
-    player_data_dict["position_zone_id"] = zone.id
-    player_data_dict["position_specific_id"] = specific_id
-    
-    # Remover campos que no van al modelo Player
-    del player_data_dict["position_zone"]
-    del player_data_dict["position_specific"]
-    del player_data_dict["full_name"]
-    del player_data_dict["team_id"]
-    
-    player_create = schemas.PlayerCreate(**player_data_dict)
-    player = crud.create_player(db, player_create)
+    # Usuario y jugador en una sola transacción: si falla el jugador no queda un usuario huérfano
+    try:
+        with unit_of_work(db):
+            user = crud.create_user(db, user_data, hashed_password)
+            
+            # Crear jugador
+            player_data_dict = player_data.dict()
+            player_data_dict["user_id"] = user.id
+            player_data_dict["position_zone_id"] = zone.id
+            player_data_dict["position_specific_id"] = specific_id
+            player_data_dict["name"] = player_data.full_name
+            
+            # Remover campos que no van al modelo Player
+            del player_data_dict["position_zone"]
+            del player_data_dict["position_specific"]
+            del player_data_dict["full_name"]
+            del player_data_dict["team_id"]
+            
+            player_create = schemas.PlayerCreate(**player_data_dict)
+            player = crud.create_player(db, player_create)
+    except exc.IntegrityError:
+        # Otra petición registró el mismo email entre la consulta y el INSERT
+        raise HTTPException(status_code=400, detail="El email ya está registrado")
     
     return player
 
@@ -506,21 +866,32 @@ def create_match(match: schemas.MatchCreate, db: Session = Depends(get_db), curr
     return crud.create_match(db=db, match=match)
 
 @app.get("/matches/", response_model=List[schemas.MatchOut])
-def get_matches(
+async def get_matches(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     match_type: str = None,
     status: str = None,
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(get_current_user)
+    cursor: str = None,
+    fields: str = None,
+    db: AsyncSession = Depends(get_async_read_db), 
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Obtener lista de partidos con filtros opcionales"""
-    return crud.get_matches(db=db, skip=skip, limit=limit, match_type=match_type, status=status)
+    plan = MATCH_FIELDS.plan(fields)
+    version = await crud.get_matches_version_async(db, match_type=match_type, status=status)
+    check_not_modified(request, response, version, None)  # mismos partidos para todos los usuarios
+    matches = await crud.get_matches_async(
+        db=db, skip=skip, limit=limit, match_type=match_type, status=status, cursor=cursor,
+        options=plan.options if plan else crud.MATCH_OUT_OPTIONS,
+    )
+    return list_page(response, matches, crud.MATCH_PAGE_KEYS, limit, plan, MATCH_JSON)
 
 @app.get("/matches/{match_id}", response_model=schemas.MatchOut)
-def get_match(match_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def get_match(match_id: int, db: AsyncSession = Depends(get_async_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener un partido específico"""
-    match = crud.get_match(db=db, match_id=match_id)
+    match = await crud.get_match_async(db=db, match_id=match_id)
     if match is None:
         raise HTTPException(status_code=404, detail="Partido no encontrado")
     return match
@@ -561,12 +932,34 @@ def create_player_attendance(
     if player is None:
         raise HTTPException(status_code=404, detail="Jugador no encontrado")
     
-    return crud.create_player_attendance(db=db, attendance=attendance)
+    # Una asistencia por jugador y partido: se cambia con PUT /attendance/{id} o con /bulk
+    duplicate = HTTPException(status_code=409, detail="El jugador ya tiene asistencia registrada en este partido")
+    if crud.get_attendance(db, attendance.match_id, attendance.player_id) is not None:
+        raise duplicate
+    try:
+        return crud.create_player_attendance(db=db, attendance=attendance)
+    except exc.IntegrityError:
+        # Otra petición la registró entre la consulta y el INSERT
+        db.rollback()
+        raise duplicate
+
+@app.post("/matches/{match_id}/attendance/bulk", response_model=schemas.BulkResult)
+def bulk_upsert_attendance(
+    match_id: int,
+    rows: List[Any],
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Registrar o actualizar la asistencia de varios jugadores a un partido"""
+    check_bulk_size(rows)
+    if crud.get_match(db=db, match_id=match_id) is None:
+        raise HTTPException(status_code=404, detail="Partido no encontrado")
+    return crud.bulk_upsert_attendance(db=db, match_id=match_id, rows=rows)
 
 @app.get("/matches/{match_id}/attendance/", response_model=List[schemas.PlayerAttendanceOut])
-def get_match_attendance(match_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def get_match_attendance(match_id: int, db: AsyncSession = Depends(get_async_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener lista de asistencia de un partido"""
-    return crud.get_player_attendance(db=db, match_id=match_id)
+    return await crud.get_player_attendance_async(db=db, match_id=match_id)
 
 @app.put("/attendance/{attendance_id}", response_model=schemas.PlayerAttendanceOut)
 def update_player_attendance(
@@ -582,10 +975,14 @@ def update_player_attendance(
     return db_attendance
 
 @app.get("/matches/{match_id}/confirmed-players/", response_model=List[schemas.PlayerOut])
-def get_confirmed_players(match_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+async def get_confirmed_players(match_id: int, db: AsyncSession = Depends(get_async_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener jugadores confirmados para un partido"""
-    confirmed_attendance = crud.get_confirmed_players_for_match(db=db, match_id=match_id)
-    return [att.player for att in confirmed_attendance]
+    return await crud.get_confirmed_players_for_match_async(db=db, match_id=match_id)
+
+@app.get("/matches/{match_id}/confirmed-players/summary", response_model=List[schemas.PlayerSummary])
+async def get_confirmed_player_summaries(match_id: int, db: AsyncSession = Depends(get_async_read_db), current_user: Principal = Depends(get_current_principal)):
+    """Resumen plano de los jugadores confirmados para un partido"""
+    return await crud.get_player_summaries_async(db, match_id=match_id)
 
 # ===== ENDPOINTS DE EVENTOS DE PARTIDO =====
 
@@ -604,8 +1001,21 @@ def create_match_event(
     
     return crud.create_match_event(db=db, event=event)
 
+@app.post("/matches/{match_id}/events/bulk", response_model=schemas.BulkResult)
+def bulk_create_match_events(
+    match_id: int,
+    rows: List[Any],
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    """Registrar varios eventos de un partido"""
+    check_bulk_size(rows)
+    if crud.get_match(db=db, match_id=match_id) is None:
+        raise HTTPException(status_code=404, detail="Partido no encontrado")
+    return crud.bulk_create_match_events(db=db, match_id=match_id, rows=rows)
+
 @app.get("/matches/{match_id}/events/", response_model=List[schemas.MatchEventOut])
-def get_match_events(match_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_match_events(match_id: int, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener eventos de un partido"""
     return crud.get_match_events(db=db, match_id=match_id)
 
@@ -617,12 +1027,13 @@ def create_venue(venue: schemas.VenueCreate, db: Session = Depends(get_db), curr
     return crud.create_venue(db=db, venue=venue)
 
 @app.get("/venues/", response_model=List[schemas.VenueOut])
-def get_venues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_venues(response: Response, skip: int = 0, limit: int = 100, cursor: str = None, db: Session = Depends(get_read_db)):
     """Obtener lista de canchas"""
-    return crud.get_venues(db=db, skip=skip, limit=limit)
+    venues = crud.get_venues(db=db, skip=skip, limit=limit, cursor=cursor)
+    return paginate(response, venues, crud.VENUE_PAGE_KEYS, limit)
 
 @app.get("/venues/{venue_id}", response_model=schemas.VenueOut)
-def get_venue(venue_id: int, db: Session = Depends(get_db)):
+def get_venue(venue_id: int, db: Session = Depends(get_read_db)):
     """Obtener una cancha específica"""
     venue = crud.get_venue(db=db, venue_id=venue_id)
     if venue is None:
@@ -637,7 +1048,7 @@ def create_championship(championship: schemas.ChampionshipCreate, db: Session =
     return crud.create_championship(db=db, championship=championship)
 
 @app.get("/championships/", response_model=List[schemas.ChampionshipOut])
-def get_championships(skip: int = 0, limit: int = 100, status: str = None, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_championships(skip: int = 0, limit: int = 100, status: str = None, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener lista de campeonatos"""
     try:
         print(f"🔍 DEBUG - get_championships llamado con skip={skip}, limit={limit}, status={status}")
@@ -651,7 +1062,7 @@ def get_championships(skip: int = 0, limit: int = 100, status: str = None, db: S
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 @app.get("/championships/{championship_id}", response_model=schemas.ChampionshipOut)
-def get_championship(championship_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_championship(championship_id: int, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener un campeonato específico"""
     championship = crud.get_championship(db=db, championship_id=championship_id)
     if championship is None:
@@ -659,7 +1070,7 @@ def get_championship(championship_id: int, db: Session = Depends(get_db), curren
     return championship
 
 @app.get("/championships/{championship_id}/standings/", response_model=List[schemas.ChampionshipTeamOut])
-def get_championship_standings(championship_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_championship_standings(championship_id: int, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener tabla de posiciones de un campeonato"""
     return crud.get_championship_standings(db=db, championship_id=championship_id)
 
@@ -671,12 +1082,13 @@ def create_external_team(external_team: schemas.ExternalTeamCreate, db: Session
     return crud.create_external_team(db=db, external_team=external_team)
 
 @app.get("/external-teams/", response_model=List[schemas.ExternalTeamOut])
-def get_external_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_external_teams(response: Response, skip: int = 0, limit: int = 100, cursor: str = None, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener lista de equipos externos"""
-    return crud.get_external_teams(db=db, skip=skip, limit=limit)
+    external_teams = crud.get_external_teams(db=db, skip=skip, limit=limit, cursor=cursor)
+    return paginate(response, external_teams, crud.EXTERNAL_TEAM_PAGE_KEYS, limit)
 
 @app.get("/external-teams/{external_team_id}", response_model=schemas.ExternalTeamOut)
-def get_external_team(external_team_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_external_team(external_team_id: int, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_principal)):
     """Obtener un equipo externo específico"""
     external_team = crud.get_external_team(db=db, external_team_id=external_team_id)
     if external_team is None:
@@ -691,13 +1103,17 @@ def create_notification(notification: schemas.NotificationCreate, db: Session =
     return crud.create_notification(db=db, notification=notification)
 
 @app.get("/notifications/", response_model=List[schemas.NotificationOut])
-def get_user_notifications(
+async def get_user_notifications(
+    request: Request,
+    response: Response,
     unread_only: bool = False, 
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db), 
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Obtener notificaciones del usuario actual"""
-    return crud.get_user_notifications(db=db, user_id=current_user.id, unread_only=unread_only)
+    version = await crud.get_notifications_version_async(db, current_user.id, unread_only=unread_only)
+    check_not_modified(request, response, version, current_user.id)
+    return await crud.get_user_notifications_async(db=db, user_id=current_user.id, unread_only=unread_only)
 
 @app.put("/notifications/{notification_id}/read", response_model=schemas.NotificationOut)
 def mark_notification_as_read(notification_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
@@ -713,8 +1129,8 @@ def mark_notification_as_read(notification_id: int, db: Session = Depends(get_db
 def get_available_players_for_match(
     match_id: int, 
     team_id: int = None, 
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(get_current_user)
+    db: Session = Depends(get_read_db), 
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Obtener jugadores disponibles para un partido (confirmados)"""
     return crud.get_available_players_for_match(db=db, match_id=match_id, team_id=team_id)
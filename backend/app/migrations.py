@@ -0,0 +1,358 @@
+"""
+Migraciones versionadas del esquema.
+
+Se aplican una sola vez con `python migrate.py`, fuera del arranque de los
+workers. Cada worker solo compara la versión guardada en `schema_migrations`
+con la última migración registrada aquí.
+
+Las operaciones son idempotentes (crean solo lo que falta) para que una base
+creada con los antiguos scripts ad-hoc quede en la misma versión que una nueva.
+"""
+
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+from sqlalchemy.schema import CreateIndex
+
+from . import frozen_schema, models
+from .search import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de Postgres que serializa ejecuciones concurrentes
+MIGRATION_LOCK_ID = 742018
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration:
+    def __init__(self, version: int, name: str, upgrade, transactional: bool = True):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+        # Las migraciones no transaccionales corren en AUTOCOMMIT (CREATE INDEX CONCURRENTLY)
+        self.transactional = transactional
+
+
+MIGRATIONS = []
+
+
+def migration(version: int, name: str, transactional: bool = True):
+    def register(upgrade):
+        MIGRATIONS.append(Migration(version, name, upgrade, transactional))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return upgrade
+    return register
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+# ===== OPERACIONES =====
+
+def add_column(conn, table: str, column: str, ddl_type: str):
+    """ALTER TABLE ... ADD COLUMN solo si la columna no existe"""
+    existing = {col["name"] for col in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+        logger.info("Columna %s.%s agregada", table, column)
+
+
+def index_exists(conn, table: str, name: str) -> bool:
+    """True si el índice existe y se puede usar.
+
+    En Postgres un CREATE INDEX CONCURRENTLY interrumpido deja el índice marcado
+    INVALID (pg_index.indisvalid): no sirve a las consultas pero sí se mantiene en
+    cada escritura. Se borra para que la migración lo vuelva a crear.
+    """
+    if conn.dialect.name != "postgresql":
+        return name in {ix["name"] for ix in inspect(conn).get_indexes(table)}
+    valid = conn.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if valid is None:
+        return False
+    if not valid:
+        logger.warning("Índice %s inválido (CREATE INDEX CONCURRENTLY interrumpido): se vuelve a crear", name)
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    return valid
+
+
+def create_index(conn, index):
+    """Crea un índice declarado en models.py si no existe (o quedó inválido).
+
+    En Postgres usa CREATE INDEX CONCURRENTLY para no bloquear escrituras;
+    la migración que lo llame debe ser no transaccional.
+    """
+    if index_exists(conn, index.table.name, index.name):
+        return
+    ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+    if conn.dialect.name == "postgresql":
+        ddl = re.sub(r"^CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl)
+    conn.execute(text(ddl))
+    logger.info("Índice %s creado", index.name)
+
+
+def get_index(model, name: str):
+    return next(ix for ix in model.__table__.indexes if ix.name == name)
+
+
+# ===== MIGRACIONES =====
+
+@migration(1, "baseline")
+def baseline(conn):
+    """Tablas previas a las migraciones y columnas que agregaban migrate_roles, migrate_skills y add_photo_url_*
+
+    Usa el esquema congelado de frozen_schema, no models.py: lo agregado después
+    (índices, users.token_version, players.search_name, refresh_tokens) lo crean
+    las migraciones siguientes también en una base vacía.
+    """
+    frozen_schema.metadata.create_all(bind=conn, tables=frozen_schema.BASELINE_TABLES)
+    add_column(conn, "users", "phone", "VARCHAR")
+    add_column(conn, "users", "is_player", "BOOLEAN DEFAULT false")
+    add_column(conn, "users", "role", "VARCHAR DEFAULT 'player'")
+    add_column(conn, "users", "team_id", "INTEGER REFERENCES teams(id)")
+    add_column(conn, "users", "must_change_password", "BOOLEAN DEFAULT false")
+    add_column(conn, "players", "photo_url", "VARCHAR")
+    for skill in ("rit", "tir", "pas", "reg", "defense", "fis"):
+        add_column(conn, "players", skill, "INTEGER")
+
+
+# Índices de las consultas frecuentes de crud.py
+HOT_QUERY_INDEXES = [
+    (models.Player, "ix_players_user_id"),
+    (models.Player, "ix_players_team_active"),
+    (models.Player, "ix_players_active_zone"),
+    (models.Player, "ix_players_active_specific"),
+    (models.PositionSpecific, "ix_position_specifics_active_zone"),
+    (models.Match, "ix_matches_status_type_date"),
+    (models.Match, "ix_matches_home_team_id"),
+    (models.Match, "ix_matches_away_team_id"),
+    (models.Match, "ix_matches_generated_team_a_id"),
+    (models.Match, "ix_matches_generated_team_b_id"),
+    (models.PlayerAttendance, "uq_player_attendance_match_player"),
+    (models.PlayerAttendance, "ix_player_attendance_match_status"),
+    (models.MatchEvent, "ix_match_events_match_minute"),
+    (models.ChampionshipTeam, "ix_championship_teams_championship_points"),
+    (models.Notification, "ix_notifications_recipient_read_created"),
+]
+
+
+@migration(2, "hot query indexes", transactional=False)
+def hot_query_indexes(conn):
+    # El índice único falla si hay asistencias duplicadas: se conserva la más reciente
+    conn.execute(text(
+        "DELETE FROM player_attendance WHERE id NOT IN "
+        "(SELECT MAX(id) FROM player_attendance GROUP BY match_id, player_id)"
+    ))
+    for model, name in HOT_QUERY_INDEXES:
+        create_index(conn, get_index(model, name))
+
+
+# Índices del orden (clave, id) de la paginación por cursor
+PAGINATION_INDEXES = [
+    (models.Player, "ix_players_name_id"),
+    (models.Match, "ix_matches_date_id"),
+]
+
+
+@migration(3, "keyset pagination indexes", transactional=False)
+def keyset_pagination_indexes(conn):
+    for model, name in PAGINATION_INDEXES:
+        create_index(conn, get_index(model, name))
+
+
+@migration(4, "users token_version")
+def users_token_version(conn):
+    add_column(conn, "users", "token_version", "INTEGER NOT NULL DEFAULT 0")
+
+
+@migration(5, "refresh tokens")
+def refresh_tokens(conn):
+    frozen_schema.refresh_tokens.create(bind=conn, checkfirst=True)
+
+
+# Índices de /players/search (además del de trigramas, que depende del dialecto)
+SEARCH_INDEXES = [
+    (models.Player, "ix_players_search_name"),
+    (models.Player, "ix_players_nationality"),
+    (models.Player, "ix_players_active_zone_skill"),
+    (models.Player, "ix_players_active_skill_level"),
+    (models.Player, "ix_players_active_rit"),
+    (models.Player, "ix_players_active_tir"),
+    (models.Player, "ix_players_active_pas"),
+    (models.Player, "ix_players_active_reg"),
+    (models.Player, "ix_players_active_defense"),
+    (models.Player, "ix_players_active_fis"),
+]
+
+# FTS5 de contenido externo: los triggers la mantienen al día con cualquier
+# INSERT/UPDATE/DELETE sobre players, venga del ORM o de un upsert masivo
+SQLITE_PLAYER_SEARCH = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS players_search USING fts5("
+    "search_name, content='players', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS players_search_ai AFTER INSERT ON players BEGIN "
+    "INSERT INTO players_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS players_search_ad AFTER DELETE ON players BEGIN "
+    "INSERT INTO players_search(players_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); END",
+    "CREATE TRIGGER IF NOT EXISTS players_search_au AFTER UPDATE OF search_name ON players BEGIN "
+    "INSERT INTO players_search(players_search, rowid, search_name) VALUES ('delete', old.id, old.search_name); "
+    "INSERT INTO players_search(rowid, search_name) VALUES (new.id, new.search_name); END",
+    "INSERT INTO players_search(players_search) VALUES ('rebuild')",
+]
+
+
+@migration(6, "player search", transactional=False)
+def player_search(conn):
+    """players.search_name, sus índices y el índice de trigramas (FTS5 o pg_trgm)"""
+    add_column(conn, "players", "search_name", "VARCHAR(100)")
+    # Relleno por bloques con la misma normalización que usa la aplicación
+    players = models.Player.__table__
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(players.c.id, players.c.name).where(players.c.id > last_id).order_by(players.c.id).limit(1000)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            players.update().where(players.c.id == bindparam("player_id")).values(search_name=bindparam("normalized")),
+            [{"player_id": row.id, "normalized": normalize_name(row.name)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    for model, name in SEARCH_INDEXES:
+        create_index(conn, get_index(model, name))
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        if not index_exists(conn, "players", "ix_players_search_name_trgm"):
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY ix_players_search_name_trgm "
+                "ON players USING gin (search_name gin_trgm_ops)"
+            ))
+    elif conn.dialect.name == "sqlite":
+        for statement in SQLITE_PLAYER_SEARCH:
+            conn.execute(text(statement))
+
+
+# Catálogo de posiciones (antes lo sembraba migrate_positions.py)
+POSITION_ZONES = [
+    {"abbreviation": "POR", "name_es": "Portero", "name_en": "Goalkeeper"},
+    {"abbreviation": "DEF", "name_es": "Defensa", "name_en": "Defender"},
+    {"abbreviation": "MED", "name_es": "Mediocampista", "name_en": "Midfielder"},
+    {"abbreviation": "DEL", "name_es": "Delantero", "name_en": "Forward"},
+]
+
+# (zona, abreviatura, nombre, name, descripción, description)
+POSITION_SPECIFICS = [
+    ("DEF", "LD", "Lateral Derecho", "Right Back", "Defensa que juega por la banda derecha", "Defender who plays on the right wing"),
+    ("DEF", "LI", "Lateral Izquierdo", "Left Back", "Defensa que juega por la banda izquierda", "Defender who plays on the left wing"),
+    ("DEF", "DFC", "Defensa Central", "Center Back", "Defensa que juega en el centro de la defensa", "Defender who plays in the center of defense"),
+    ("DEF", "CAI", "Carrilero Izquierdo", "Left Wing Back", "Defensa que sube por la banda izquierda", "Defender who advances on the left wing"),
+    ("DEF", "CAD", "Carrilero Derecho", "Right Wing Back", "Defensa que sube por la banda derecha", "Defender who advances on the right wing"),
+    ("MED", "MCD", "Mediocentro Defensivo", "Defensive Midfielder", "Mediocampista que se enfoca en la recuperación", "Midfielder focused on ball recovery"),
+    ("MED", "MC", "Mediocentro", "Center Midfielder", "Mediocampista que juega en el centro del campo", "Midfielder who plays in the center of the field"),
+    ("MED", "MCO", "Mediocentro Ofensivo", "Attacking Midfielder", "Mediocampista que se enfoca en el ataque", "Midfielder focused on attacking"),
+    ("MED", "MD", "Volante por la Derecha", "Right Winger", "Mediocampista que juega por la banda derecha", "Midfielder who plays on the right wing"),
+    ("MED", "MI", "Volante por la Izquierda", "Left Winger", "Mediocampista que juega por la banda izquierda", "Midfielder who plays on the left wing"),
+    ("DEL", "ED", "Extremo Derecho", "Right Winger", "Delantero que juega por la banda derecha", "Forward who plays on the right wing"),
+    ("DEL", "EI", "Extremo Izquierdo", "Left Winger", "Delantero que juega por la banda izquierda", "Forward who plays on the left wing"),
+    ("DEL", "DC", "Delantero Centro", "Center Forward", "Delantero que juega en el centro del ataque", "Forward who plays in the center of attack"),
+    ("DEL", "SD", "Segundo Delantero", "Second Striker", "Delantero que juega detrás del delantero centro", "Forward who plays behind the center forward"),
+]
+
+
+@migration(7, "position catalog")
+def position_catalog(conn):
+    """Zonas y posiciones específicas que faltan (por abreviatura); no toca las existentes"""
+    zones = models.PositionZone.__table__
+    specifics = models.PositionSpecific.__table__
+    existing = set(conn.execute(select(zones.c.abbreviation)).scalars())
+    missing = [zone for zone in POSITION_ZONES if zone["abbreviation"] not in existing]
+    if missing:
+        conn.execute(zones.insert(), missing)
+    zone_ids = dict(conn.execute(select(zones.c.abbreviation, zones.c.id)).all())
+
+    existing = set(conn.execute(select(specifics.c.abbreviation)).scalars())
+    missing = [
+        {"zone_id": zone_ids[zone], "abbreviation": abbreviation, "name_es": name_es, "name_en": name_en,
+         "description_es": description_es, "description_en": description_en}
+        for zone, abbreviation, name_es, name_en, description_es, description_en in POSITION_SPECIFICS
+        if abbreviation not in existing
+    ]
+    if missing:
+        conn.execute(specifics.insert(), missing)
+
+
+@migration(8, "refresh tokens user index", transactional=False)
+def refresh_tokens_user_index(conn):
+    create_index(conn, get_index(models.RefreshToken, "ix_refresh_tokens_user_id"))
+
+
+# ===== EJECUCIÓN =====
+
+def current_version(conn) -> int:
+    """Versión aplicada; 0 si la base nunca pasó por el runner"""
+    if not inspect(conn).has_table(schema_migrations.name):
+        return 0
+    versions = conn.execute(select(schema_migrations.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def schema_status(conn) -> dict:
+    current = current_version(conn)
+    return {
+        "current": current,
+        "latest": latest_version(),
+        "pending": [m.version for m in MIGRATIONS if m.version > current],
+    }
+
+
+def _record(conn, item: Migration):
+    conn.execute(schema_migrations.insert().values(
+        version=item.version, name=item.name, applied_at=datetime.utcnow()
+    ))
+
+
+def upgrade(bind, target: int = None) -> list:
+    """Aplica las migraciones pendientes hasta `target` (o la última)"""
+    target = latest_version() if target is None else target
+    applied = []
+    with bind.connect() as lock_conn:
+        is_postgres = bind.dialect.name == "postgresql"
+        if is_postgres:
+            lock_conn = lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            with bind.begin() as conn:
+                migration_metadata.create_all(bind=conn)
+                current = current_version(conn)
+
+            for item in MIGRATIONS:
+                if item.version <= current or item.version > target:
+                    continue
+                logger.info("Aplicando migración %s: %s", item.version, item.name)
+                if item.transactional:
+                    with bind.begin() as conn:
+                        item.upgrade(conn)
+                        _record(conn, item)
+                else:
+                    with bind.connect() as conn:
+                        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                        item.upgrade(conn)
+                        _record(conn, item)
+                applied.append(item)
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+    return applied
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, Date, Index, true
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from .database import Base
+from .search import normalize_name
 
 class User(Base):
     __tablename__ = "users"
@@ -15,6 +16,7 @@ class User(Base):
     role = Column(String, default="player")  # admin, supervisor, player, guest
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)  # Para supervisores
     must_change_password = Column(Boolean, default=False)  # Para cambio obligatorio de contraseña
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # Subirla revoca los tokens emitidos
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -48,6 +50,11 @@ class PositionSpecific(Base):
     # Relación con zona
     zone = relationship("PositionZone", back_populates="specific_positions")
 
+    __table_args__ = (
+        Index("ix_position_specifics_active_zone", "zone_id",
+              postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+    )
+
 class Team(Base):
     __tablename__ = "teams"
     id = Column(Integer, primary_key=True, index=True)
@@ -75,6 +82,7 @@ class Player(Base):
     
     # Información personal
     name = Column(String(100), nullable=False)
+    search_name = Column(String(100), nullable=True)  # name normalizado para /players/search (ver app/search.py)
     email = Column(String(100), unique=True, nullable=False)
     phone = Column(String, nullable=True)
     date_of_birth = Column(Date, nullable=True)
@@ -106,6 +114,36 @@ class Player(Base):
     position_zone = relationship("PositionZone")
     position_specific = relationship("PositionSpecific")
 
+    __table_args__ = (
+        Index("ix_players_user_id", "user_id"),
+        Index("ix_players_team_active", "team_id", "is_active"),
+        # Parciales: las búsquedas por posición solo consideran jugadores activos
+        Index("ix_players_active_zone", "position_zone_id",
+              postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_specific", "position_specific_id",
+              postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        # Orden de la paginación por cursor
+        Index("ix_players_name_id", "name", "id"),
+        # /players/search: prefijo del nombre normalizado y filtros (migración 6)
+        Index("ix_players_search_name", "search_name", postgresql_ops={"search_name": "text_pattern_ops"}),
+        Index("ix_players_nationality", "nationality"),
+        Index("ix_players_active_zone_skill", "position_zone_id", "skill_level",
+              postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_skill_level", "skill_level",
+              postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_rit", "rit", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_tir", "tir", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_pas", "pas", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_reg", "reg", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_defense", "defense", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+        Index("ix_players_active_fis", "fis", postgresql_where=is_active == true(), sqlite_where=is_active == true()),
+    )
+
+    @validates("name")
+    def _sync_search_name(self, key, name):
+        self.search_name = normalize_name(name)
+        return name
+
 class Match(Base):
     __tablename__ = "matches"
     id = Column(Integer, primary_key=True, index=True)
@@ -151,6 +189,16 @@ class Match(Base):
     attendance = relationship("PlayerAttendance", back_populates="match")
     events = relationship("MatchEvent", back_populates="match")
 
+    __table_args__ = (
+        Index("ix_matches_status_type_date", "status", "match_type", "date"),
+        Index("ix_matches_home_team_id", "home_team_id"),
+        Index("ix_matches_away_team_id", "away_team_id"),
+        Index("ix_matches_generated_team_a_id", "generated_team_a_id"),
+        Index("ix_matches_generated_team_b_id", "generated_team_b_id"),
+        # Orden de la paginación por cursor
+        Index("ix_matches_date_id", "date", "id"),
+    )
+
 class Venue(Base):
     __tablename__ = "venues"
     id = Column(Integer, primary_key=True, index=True)
@@ -182,6 +230,12 @@ class PlayerAttendance(Base):
     match = relationship("Match", back_populates="attendance")
     player = relationship("Player")
 
+    __table_args__ = (
+        # Un jugador tiene una sola fila de asistencia por partido
+        Index("uq_player_attendance_match_player", "match_id", "player_id", unique=True),
+        Index("ix_player_attendance_match_status", "match_id", "status"),
+    )
+
 class MatchEvent(Base):
     __tablename__ = "match_events"
     id = Column(Integer, primary_key=True, index=True)
@@ -203,6 +257,10 @@ class MatchEvent(Base):
     match = relationship("Match", back_populates="events")
     player = relationship("Player")
 
+    __table_args__ = (
+        Index("ix_match_events_match_minute", "match_id", "minute"),
+    )
+
 class Championship(Base):
     __tablename__ = "championships"
     id = Column(Integer, primary_key=True, index=True)
@@ -252,6 +310,10 @@ class ChampionshipTeam(Base):
     championship = relationship("Championship")
     team = relationship("Team")
 
+    __table_args__ = (
+        Index("ix_championship_teams_championship_points", "championship_id", "points"),
+    )
+
 class ExternalTeam(Base):
     __tablename__ = "external_teams"
     id = Column(Integer, primary_key=True, index=True)
@@ -296,3 +358,23 @@ class Notification(Base):
     # Relaciones
     recipient = relationship("User")
     match = relationship("Match")
+
+    __table_args__ = (
+        Index("ix_notifications_recipient_read_created", "recipient_id", "read", "created_at"),
+    )
+
+class RefreshToken(Base):
+    """Refresh tokens emitidos. Cada uso lo rota por uno nuevo de la misma familia (sesión)"""
+    __tablename__ = "refresh_tokens"
+    jti = Column(String(32), primary_key=True)
+    family_id = Column(String(32), nullable=False)  # jti del token emitido en el login
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # UTC
+    used_at = Column(DateTime, nullable=True)  # Ya rotado: volver a presentarlo es reuso
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_family_id", "family_id"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+        Index("ix_refresh_tokens_user_id", "user_id"),  # ON DELETE CASCADE al borrar un usuario
+    )
@@ -0,0 +1,80 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+El cursor es opaco para el cliente: codifica los valores de la última fila
+devuelta según el orden del listado, por ejemplo (name, id) en jugadores.
+La página siguiente se pide con WHERE (name, id) > (:name, :id), que usa el
+índice en vez de saltar filas con OFFSET.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _from_json(value, column):
+    python_type = column.type.python_type
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, keys) -> list:
+    """Valores del cursor convertidos al tipo de cada columna de orden"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise InvalidCursor(token)
+        return [_from_json(value, column) for value, column in zip(values, keys)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(token) from e
+
+
+def apply_keyset(query, keys, cursor: str = None):
+    """Ordena por las columnas de `keys` y continúa después del cursor.
+
+    Sirve tanto para Query como para select(); la última columna debe ser la
+    clave primaria para que el orden sea estable.
+    """
+    query = query.order_by(*keys)
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        if len(keys) == 1:
+            query = query.filter(keys[0] > values[0])
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+    return query
+
+
+def next_cursor(items, keys, limit: int):
+    """Cursor de la página siguiente, o None si esta es la última"""
+    if not items or limit is None or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor([last[column.key] for column in keys])
+    return encode_cursor([getattr(last, column.key) for column in keys])
@@ -0,0 +1,178 @@
+"""
+Límite de intentos para login y registro (token bucket por IP y por cuenta).
+
+Cada intento cuesta bcrypt (~250 ms de CPU), así que se limitan antes de
+hashear. Cada clave tiene un balde de `burst` fichas que se rellena a
+`per_minute` fichas por minuto; sin fichas se responde 429 con Retry-After.
+
+Backends:
+- "local": en memoria del proceso; con varios workers cada uno lleva su cuenta.
+- "redis": compartido entre workers (cualquier servidor con protocolo Redis).
+  Requiere `pip install redis`; si el servidor no responde se deja pasar.
+- "off": sin límite.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from .config import (
+    RATE_LIMIT_ACCOUNT_BURST,
+    RATE_LIMIT_ACCOUNT_PER_MINUTE,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_IP_BURST,
+    RATE_LIMIT_IP_PER_MINUTE,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_REDIS_URL,
+    RATE_LIMIT_TRUST_FORWARDED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """Sin fichas en el balde de `scope`"""
+
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"Demasiados intentos ({scope}), reintentar en {retry_after}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class LocalBuckets:
+    """Baldes en memoria, LRU acotado a `max_keys` claves.
+
+    El reloj se puede inyectar para probar sin esperar.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        """Consume una ficha; devuelve 0 o los segundos hasta la próxima"""
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# El mismo cálculo que LocalBuckets.take, atómico en el servidor y con su reloj
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Baldes en un servidor Redis, compartidos entre workers"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio  # dependencia opcional, solo con RATE_LIMIT_BACKEND=redis
+
+        self.prefix = prefix
+        self._client = redis.asyncio.from_url(url)
+        self._take = self._client.register_script(TAKE_SCRIPT)
+        self.errors = 0
+
+    async def take(self, key: str, capacity: float, rate: float) -> float:
+        try:
+            return float(await self._take(keys=[self.prefix + key], args=[capacity, rate]))
+        except Exception as e:  # Redis caído: no bloquear los logins
+            self.errors += 1
+            logger.warning("Rate limit sin Redis, se deja pasar: %s", e)
+            return 0.0
+
+
+class RateLimiter:
+    """Aplica las reglas (balde por alcance) y cuenta los rechazos"""
+
+    def __init__(self, backend, rules: dict):
+        self.backend = backend
+        # alcance -> (capacidad, fichas por segundo)
+        self.rules = {scope: (burst, per_minute / 60) for scope, (burst, per_minute) in rules.items()}
+        self.allowed = 0
+        self.rejected = {scope: 0 for scope in rules}
+
+    async def check(self, **keys):
+        """Consume una ficha por alcance (p. ej. ip=..., account=...); lanza RateLimited"""
+        if self.backend is None:
+            return
+        for scope, value in keys.items():
+            if value is None:
+                continue
+            capacity, rate = self.rules[scope]
+            wait = await self.backend.take(f"{scope}:{value}", capacity, rate)
+            if wait > 0:
+                self.rejected[scope] += 1
+                raise RateLimited(scope, max(1, math.ceil(wait)))
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        stats = {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "rules": {scope: {"burst": c, "per_minute": r * 60} for scope, (c, r) in self.rules.items()},
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+        }
+        if isinstance(self.backend, LocalBuckets):
+            stats["keys"] = len(self.backend)
+        if isinstance(self.backend, RedisBuckets):
+            stats["backend_errors"] = self.backend.errors
+        return stats
+
+
+def account_key(email: str) -> str:
+    """Clave de la cuenta sin guardar el email en claro"""
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+def client_ip(request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def build_backend(name: str = RATE_LIMIT_BACKEND):
+    if name == "off":
+        return None
+    if name == "redis":
+        return RedisBuckets(RATE_LIMIT_REDIS_URL)
+    return LocalBuckets(RATE_LIMIT_MAX_KEYS)
+
+
+auth_limiter = RateLimiter(build_backend(), {
+    "ip": (RATE_LIMIT_IP_BURST, RATE_LIMIT_IP_PER_MINUTE),
+    "account": (RATE_LIMIT_ACCOUNT_BURST, RATE_LIMIT_ACCOUNT_PER_MINUTE),
+})
@@ -181,6 +181,29 @@ class PlayerOut(PlayerBase):
 class TeamWithPlayers(TeamOut):
     players: List[PlayerOut] = []
 
+# Resumen de jugador (generador de equipos, tablas de plantel): columnas planas, sin relaciones
+class PlayerSummary(BaseModel):
+    id: int
+    name: str
+    team_id: Optional[int] = None
+    jersey_number: Optional[int] = None
+    skill_level: Optional[int] = None
+    rit: Optional[int] = None
+    tir: Optional[int] = None
+    pas: Optional[int] = None
+    reg: Optional[int] = None
+    defense: Optional[int] = None
+    fis: Optional[int] = None
+    position_zone: str  # abreviatura (POR, DEF, MED, DEL)
+    position_specific: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class PlayerSearchResult(PlayerSummary):
+    match: Optional[str] = None  # prefix, word, contains o fuzzy; None sin búsqueda por nombre
+    score: Optional[float] = None  # similitud por trigramas (0 a 1)
+
 # Player Registration (Formulario de registro)
 class PlayerRegistration(BaseModel):
     full_name: str
@@ -455,3 +478,14 @@ class MatchWithEvents(MatchOut):
 class MatchWithFullDetails(MatchOut):
     attendance: List[PlayerAttendanceOut] = []
     events: List[MatchEventOut] = []
+
+# ===== OPERACIONES MASIVAS =====
+
+class BulkRowError(BaseModel):
+    index: int  # posición de la fila en el lote
+    errors: List[str]
+
+class BulkResult(BaseModel):
+    processed: int  # filas insertadas o actualizadas
+    failed: int
+    errors: List[BulkRowError] = []
@@ -0,0 +1,126 @@
+"""
+Búsqueda de jugadores por nombre: sin tildes ni mayúsculas, por prefijo y aproximada.
+
+`players.search_name` guarda el nombre normalizado (minúsculas, sin tildes, solo
+letras y números separados por un espacio) y se indexa por trigramas:
+- SQLite: tabla FTS5 `players_search` con tokenizer trigram, de contenido externo
+  sobre players y sincronizada con triggers (migración 6);
+- PostgreSQL: índice GIN `gin_trgm_ops` (extensión pg_trgm).
+
+crud.search_players_async pide a la base pocos candidatos ya filtrados por los
+índices, en etapas que paran apenas hay suficientes: nombres que empiezan con la
+búsqueda, nombres que contienen todas sus palabras y, si aún faltan,
+coincidencias aproximadas por trigramas. El orden final se calcula aquí sobre
+esos candidatos.
+"""
+
+import math
+import re
+import unicodedata
+from itertools import combinations
+from typing import Optional
+
+from sqlalchemy import column, table
+
+# Tabla virtual FTS5 (solo SQLite)
+players_search = table("players_search", column("rowid"), column("search_name"))
+
+# Trigramas que debe compartir cada palabra en la etapa aproximada: la mitad, hasta 3
+FUZZY_MIN_SHARED = 3
+
+# Orden de las coincidencias, de mejor a peor
+MATCH_KINDS = ("prefix", "word", "contains", "fuzzy")
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """'  José  MARTÍNEZ-Peña ' -> 'jose martinez pena'"""
+    if name is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_WORD.findall(stripped.casefold()))
+
+
+def trigrams(text: str) -> set:
+    """Trigramas por palabra con el relleno de pg_trgm: 'jose' -> {'  j', ' jo', 'jos', 'ose', 'se '}"""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: str, name: str) -> float:
+    """Parte de los trigramas de la búsqueda presentes en el nombre (0 a 1)"""
+    wanted = trigrams(query)
+    return len(wanted & trigrams(name)) / len(wanted) if wanted else 0.0
+
+
+def _fts_words(text: str) -> list:
+    # El tokenizer trigram no indexa cadenas de menos de 3 caracteres
+    return [word for word in text.split() if len(word) >= 3]
+
+
+def fts_contains_query(text: str) -> Optional[str]:
+    """MATCH de FTS5: el nombre contiene cada palabra (de 3 o más letras)"""
+    words = _fts_words(text)
+    return " AND ".join(f'"{word}"' for word in words) if words else None
+
+
+def fts_fuzzy_query(text: str, max_words: int, max_clauses: int) -> Optional[str]:
+    """MATCH de FTS5: cada palabra comparte al menos la mitad de sus trigramas (hasta 3).
+
+    'martnez' -> ("art" AND "mar" AND "nez") OR ("art" AND "mar" AND "rtn") OR ...
+    Un OR de trigramas sueltos trae casi toda la tabla y ordenarla por bm25 cuesta
+    más que el presupuesto; así los candidatos ya son parecidos y basta un LIMIT.
+
+    Las combinaciones crecen con el cubo del largo de la palabra: con más de
+    `max_words` palabras o más de `max_clauses` combinaciones en total devuelve
+    None y la búsqueda se queda con prefijo y contenido.
+    """
+    words = _fts_words(text)
+    if len(words) > max_words:
+        return None
+    grams_by_word = []
+    for word in words:
+        grams = sorted({word[i:i + 3] for i in range(len(word) - 2)})
+        grams_by_word.append((grams, min(math.ceil(len(grams) / 2), FUZZY_MIN_SHARED)))
+    if sum(math.comb(len(grams), shared) for grams, shared in grams_by_word) > max_clauses:
+        return None
+    clauses = []
+    for grams, shared in grams_by_word:
+        options = [" AND ".join(f'"{gram}"' for gram in combo) for combo in combinations(grams, shared)]
+        clauses.append("(" + " OR ".join(f"({option})" for option in options) + ")")
+    return " AND ".join(clauses) if clauses else None
+
+
+def classify(query: str, name: str, min_similarity: float):
+    """(tipo de coincidencia, puntaje) o None si el nombre no alcanza el umbral"""
+    score = word_similarity(query, name)
+    if name.startswith(query):
+        return "prefix", score
+    if f" {query}" in f" {name}":
+        return "word", score
+    if all(word in name for word in query.split()):
+        return "contains", score
+    if score >= min_similarity:
+        return "fuzzy", score
+    return None
+
+
+def rank(query: str, rows, limit: int, min_similarity: float) -> list:
+    """Filas (con search_name) ordenadas por tipo de coincidencia y similitud, sin repetidos"""
+    ranked, seen = [], set()
+    for row in rows:
+        if row.id in seen:
+            continue
+        seen.add(row.id)
+        found = classify(query, row.search_name or "", min_similarity)
+        if found is None:
+            continue
+        kind, score = found
+        ranked.append(((MATCH_KINDS.index(kind), -score, len(row.search_name), row.id), row, kind, score))
+    ranked.sort(key=lambda item: item[0])
+    return [(row, kind, round(score, 3)) for _, row, kind, score in ranked[:limit]]
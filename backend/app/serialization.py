@@ -0,0 +1,115 @@
+"""
+Serialización rápida de listados grandes (FAST_JSON_RESPONSES).
+
+El camino normal de FastAPI valida cada fila contra `response_model`, la vuelve
+a recorrer para pasarla a tipos JSON y después la codifica con `json`. Los
+objetos del ORM ya vienen de la base, así que aquí se recorren una sola vez:
+cada esquema se compila al importar en una función objeto -> dict que lee los
+atributos que el esquema declara (con sus valores por defecto y relaciones
+anidadas) y orjson codifica el resultado. orjson está en requirements.txt; si
+falta se codifica con `json`, con las fechas en el mismo formato que pydantic,
+y ENCODER lo indica (se informa al arrancar y en /admin/cache).
+
+Solo sirve para esquemas sin validadores, serializadores ni alias: `ORMSerializer`
+lo comprueba al construirse.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from types import UnionType
+from typing import List, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # instalación sin requirements.txt completo
+    orjson = None
+
+ENCODER = "orjson" if orjson is not None else "json"
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if value.utcoffset() == timedelta(0) else text  # pydantic usa Z para UTC
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} no es serializable a JSON")
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _unwrap(annotation):
+    """(tipo, es_lista) sin Optional; tipo es el modelo si el campo anida uno"""
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    if get_origin(annotation) in (list, List):
+        (item,) = get_args(annotation)
+        return item, True
+    return annotation, False
+
+
+def _check(schema):
+    decorators = schema.__pydantic_decorators__
+    hooks = [
+        kind for kind in ("validators", "field_validators", "root_validators", "model_validators",
+                          "field_serializers", "model_serializers", "computed_fields")
+        if getattr(decorators, kind)
+    ]
+    aliased = [name for name, field in schema.model_fields.items() if field.alias or field.serialization_alias]
+    if hooks or aliased:
+        raise TypeError(f"{schema.__name__} no admite la serialización rápida ({', '.join(hooks + aliased)})")
+
+
+def compile_schema(schema, _compiled=None):
+    """Función objeto del ORM -> dict con las claves de `schema`, en su orden"""
+    _compiled = {} if _compiled is None else _compiled
+    if schema in _compiled:
+        return _compiled[schema]
+    _check(schema)
+
+    fields = []  # (nombre, por defecto, requerido, sub-serializador, es_lista)
+    for name, field in schema.model_fields.items():
+        target, many = _unwrap(field.annotation)
+        nested = isinstance(target, type) and issubclass(target, BaseModel)
+        required = field.is_required()
+        default = None if required else field.get_default(call_default_factory=True)
+        fields.append([name, default, required, target if nested else None, many])
+
+    def serialize(obj):
+        data = {}
+        for name, default, required, nested, many in fields:
+            value = getattr(obj, name) if required else getattr(obj, name, default)
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if many else nested(value)
+            data[name] = value
+        return data
+
+    _compiled[schema] = serialize
+    # Los modelos anidados se compilan después para admitir referencias circulares
+    for field in fields:
+        if field[3] is not None:
+            field[3] = compile_schema(field[3], _compiled)
+    return serialize
+
+
+class ORMSerializer:
+    """Serializador prearmado de un esquema de salida: `dump_json(obj)` y `dump_json_list(items)`"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._serialize = compile_schema(schema)
+
+    def dump_json(self, obj) -> bytes:
+        return dumps(self._serialize(obj))
+
+    def dump_json_list(self, items) -> bytes:
+        serialize = self._serialize
+        return dumps([serialize(item) for item in items])
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+CPU contra bytes al comprimir respuestas representativas:
+- `/players/` con 300 PlayerOut (usuario, equipo y posiciones anidados),
+- `/teams/{id}` con un plantel (20 jugadores).
+
+Para cada nivel de gzip (y de brotli, si está instalado) informa tamaño, CPU por
+respuesta y el tiempo total estimado (CPU + transferencia) en un enlace lento.
+
+Uso:
+    python benchmark_compression.py [--players 300] [--link-mbps 1.5] [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.compression import brotli, compress_once
+from app.serialization import ORMSerializer
+from benchmark_serialization import seed
+
+GZIP_LEVELS = (1, 3, 5, 6, 9)
+BROTLI_LEVELS = (1, 4, 5, 6, 9, 11)
+
+
+def payloads(players: int) -> dict:
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'compression.db')}")
+    seed(engine, players)  # 20 jugadores por equipo
+    with Session(engine) as db:
+        rows = db.query(models.Player).options(*crud.PLAYER_OUT_OPTIONS).order_by(*crud.PLAYER_PAGE_KEYS).all()
+        team = db.query(models.Team).options(*crud.TEAM_WITH_PLAYERS_OPTIONS).first()
+        return {
+            f"/players/ ({len(rows)})": ORMSerializer(schemas.PlayerOut).dump_json_list(rows),
+            f"/teams/{{id}} ({len(team.players)})": ORMSerializer(schemas.TeamWithPlayers).dump_json(team),
+        }
+
+
+def cpu_ms(coding: str, data: bytes, level: int, rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        compress_once(coding, data, level)
+    return (time.process_time() - start) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--link-mbps", type=float, default=1.5, help="enlace móvil lento para estimar la transferencia")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    bytes_per_ms = args.link_mbps * 1e6 / 8 / 1000
+    variants = [("identity", 0)] + [("gzip", level) for level in GZIP_LEVELS]
+    if brotli is not None:
+        variants += [("br", level) for level in BROTLI_LEVELS]
+    else:
+        print("brotli no está instalado (pip install brotli): solo gzip\n")
+
+    for name, data in payloads(args.players).items():
+        print(f"🚀 {name}: {len(data) / 1024:.0f} KB sin comprimir, enlace de {args.link_mbps} Mbit/s")
+        print(f"  {'algoritmo':10} {'KB':>7} {'ratio':>6} {'CPU ms':>7} {'total ms':>9}")
+        for coding, level in variants:
+            if coding == "identity":
+                size, cost = len(data), 0.0
+            else:
+                size, cost = len(compress_once(coding, data, level)), cpu_ms(coding, data, level, args.rounds)
+            label = coding if coding == "identity" else f"{coding}-{level}"
+            print(f"  {label:10} {size / 1024:7.1f} {size / len(data):6.3f} {cost:7.2f} {cost + size / bytes_per_ms:9.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de logins concurrentes mientras corren lecturas síncronas
+(GET /venues/, atendido por el threadpool de Starlette).
+
+Compara bcrypt en el threadpool compartido (comportamiento anterior,
+HASH_POOL_WORKERS=0) con el pool de procesos de app/hashing.py.
+
+Uso:
+    python benchmark_login.py --logins 60 --readers 10 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.db')}")
+os.environ.setdefault("SCHEMA_CHECK", "off")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "off")  # mide bcrypt, no el límite de intentos
+
+import httpx
+
+from app import hashing, migrations, models
+from app.config import HASH_POOL_WORKERS
+from app.database import SessionLocal, engine
+from app.main import app
+
+
+def seed(users: int):
+    migrations.upgrade(engine)
+    db = SessionLocal()
+    hashed_password = hashing.hash_password("secret")
+    for i in range(users):
+        db.add(models.User(email=f"bench{i}@prosoccer.cl", hashed_password=hashed_password))
+    for i in range(20):
+        db.add(models.Venue(name=f"Cancha {i}"))
+    db.commit()
+    db.close()
+
+
+async def run(pool: hashing.HashingPool, users: int, logins: int, readers: int, seconds: float):
+    hashing.hashing_pool = pool
+    await pool.start()
+    counters = {"logins": 0, "rejected": 0}
+    read_latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=60) as client:
+        async def login_loop(n):
+            i = n
+            while time.perf_counter() < deadline:
+                r = await client.post("/auth/login", json={"email": f"bench{i % users}@prosoccer.cl", "password": "secret"})
+                if r.status_code == 200:
+                    counters["logins"] += 1
+                elif r.status_code == 503:
+                    counters["rejected"] += 1
+                    await asyncio.sleep(float(r.headers.get("retry-after", 1)))
+                i += logins
+
+        async def read_loop():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                r = await client.get("/venues/")
+                r.raise_for_status()
+                read_latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(login_loop(n) for n in range(logins)), *(read_loop() for _ in range(readers)))
+
+    pool.shutdown()
+    read_latencies.sort()
+    return {
+        "logins_per_s": counters["logins"] / seconds,
+        "rejected": counters["rejected"],
+        "reads_per_s": len(read_latencies) / seconds,
+        "read_p50_ms": statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+        "read_p95_ms": read_latencies[int(len(read_latencies) * 0.95)] * 1000 if read_latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--logins", type=int, default=60, help="logins concurrentes")
+    parser.add_argument("--readers", type=int, default=10, help="lectores concurrentes")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=HASH_POOL_WORKERS or os.cpu_count())
+    args = parser.parse_args()
+
+    seed(args.users)
+    scenarios = [
+        ("threadpool compartido (anterior)", hashing.HashingPool(0, max_pending=10_000)),
+        (f"pool de procesos ({args.workers} workers)", hashing.HashingPool(args.workers, max_pending=10_000)),
+    ]
+    print(f"🚀 {args.logins} logins + {args.readers} lectores concurrentes durante {args.seconds:.0f}s por escenario\n")
+    for name, pool in scenarios:
+        result = await run(pool, args.users, args.logins, args.readers, args.seconds)
+        print(name)
+        print(f"  logins/s:            {result['logins_per_s']:8.1f}  (503: {result['rejected']})")
+        print(f"  lecturas/s:          {result['reads_per_s']:8.1f}")
+        print(f"  lectura p50 / p95:   {result['read_p50_ms']:8.1f} / {result['read_p95_ms']:.1f} ms\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de las consultas más frecuentes: Query legado (se construye y
+compila en cada llamada) contra las lambda_stmt cacheadas de crud.py.
+
+Uso:
+    python benchmark_lookups.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import get_statement_cache_stats, track_statement_cache
+
+
+def seed(db: Session, users: int):
+    zone = models.PositionZone(abbreviation="MED", name_es="Mediocampo", name_en="Midfield")
+    db.add(zone)
+    db.flush()
+    db.add(models.PositionSpecific(abbreviation="MC", name_es="Mediocentro", name_en="Central midfielder", zone_id=zone.id))
+    for i in range(users):
+        user = models.User(email=f"bench{i}@prosoccer.cl", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(models.Player(user_id=user.id, position_zone_id=zone.id, name=f"Jugador {i}", email=user.email))
+    db.commit()
+
+
+# Las mismas consultas tal como estaban antes, con db.query()
+def legacy_user_by_email(db, email):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def legacy_player_by_user_id(db, user_id):
+    return db.query(models.Player).filter(models.Player.user_id == user_id).first()
+
+
+def legacy_zone_by_abbreviation(db, abbreviation):
+    return db.query(models.PositionZone).filter(
+        models.PositionZone.abbreviation == abbreviation,
+        models.PositionZone.is_active == True
+    ).first()
+
+
+def legacy_specific_by_abbreviation(db, abbreviation):
+    return db.query(models.PositionSpecific).filter(
+        models.PositionSpecific.abbreviation == abbreviation,
+        models.PositionSpecific.is_active == True
+    ).first()
+
+
+LOOKUPS = [
+    ("get_user_by_email", legacy_user_by_email, crud.get_user_by_email, lambda i, n: f"bench{i % n}@prosoccer.cl"),
+    ("get_player_by_user_id", legacy_player_by_user_id, crud.get_player_by_user_id, lambda i, n: i % n + 1),
+    ("get_position_zone_by_abbreviation", legacy_zone_by_abbreviation, crud.get_position_zone_by_abbreviation, lambda i, n: "MED"),
+    ("get_position_specific_by_abbreviation", legacy_specific_by_abbreviation, crud.get_position_specific_by_abbreviation, lambda i, n: "MC"),
+]
+
+
+def per_call_us(db, function, argument, calls: int, users: int) -> float:
+    for i in range(100):  # calentamiento
+        function(db, argument(i, users))
+    start = time.perf_counter()
+    for i in range(calls):
+        function(db, argument(i, users))
+        if i % 500 == 0:
+            db.expunge_all()  # que el mapa de identidad no crezca sin límite
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    bench_engine = track_statement_cache(create_engine("sqlite://"))
+    models.Base.metadata.create_all(bind=bench_engine)
+    db = Session(bind=bench_engine)
+    seed(db, args.users)
+
+    print(f"🚀 {args.calls} llamadas por consulta (SQLite en memoria)\n")
+    print(f"{'consulta':40} {'Query (µs)':>12} {'lambda_stmt (µs)':>18} {'mejora':>8}")
+    for name, legacy, cached, argument in LOOKUPS:
+        before = per_call_us(db, legacy, argument, args.calls, args.users)
+        after = per_call_us(db, cached, argument, args.calls, args.users)
+        print(f"{name:40} {before:12.1f} {after:18.1f} {before / after:7.2f}x")
+
+    print(f"\nCaché de sentencias compiladas: {get_statement_cache_stats(bench_engine)}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Latencia de /players/search (crud.search_players_async) sobre una base SQLite
+migrada con muchos jugadores de nombres hispanos con tildes.
+
+Para cada tipo de búsqueda (prefijo, palabra, con error de tipeo, con filtros,
+solo filtros) informa p50/p95 y los compara con el presupuesto.
+
+Uso:
+    python benchmark_search.py [--players 100000] [--rounds 50] [--budget-ms 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app import crud, migrations, models
+from app.search import normalize_name
+
+FIRST = ["José", "María", "Ángel", "Martín", "Sebastián", "Matías", "Nicolás", "Benjamín", "Joaquín", "Tomás",
+         "Agustín", "Lucía", "Sofía", "Valentín", "Cristóbal", "Ignacio", "Andrés", "Iñaki", "Raúl", "Rubén"]
+LAST = ["Martínez", "González", "Muñoz", "Rodríguez", "Pérez", "Núñez", "Peña", "Gómez", "Sánchez", "Díaz",
+        "Fernández", "López", "Hernández", "Ramírez", "Jiménez", "Álvarez", "Ibáñez", "Zúñiga", "Valdés", "Cortés"]
+NATIONALITIES = ["Chile", "Argentina", "Perú", "Uruguay", "Colombia"]
+
+# nombre -> argumentos de search_players_async
+QUERIES = {
+    "prefijo": {"q": "jose mar"},
+    "palabra": {"q": "nunez"},
+    "tipeo": {"q": "zuniga ibanes"},
+    "q + filtros": {"q": "martin", "nationality": "Chile", "skill_min": 60, "skill_max": 80},
+    "solo filtros": {"position_zone_id": 3, "minimums": {"rit": 80, "pas": 70}},
+}
+
+
+def seed(players: int) -> str:
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    migrations.upgrade(engine)  # siembra las zonas 1-4
+    random.seed(7)
+    with engine.begin() as conn:
+        conn.execute(insert(models.User.__table__), [{"id": 1, "email": "admin@prosoccer.cl", "hashed_password": "x"}])
+        rows = []
+        for i in range(1, players + 1):
+            name = f"{random.choice(FIRST)} {random.choice(LAST)} {random.choice(LAST)}"
+            rows.append({
+                "id": i, "user_id": 1, "name": name, "search_name": normalize_name(name), "email": f"j{i}@prosoccer.cl",
+                "nationality": random.choice(NATIONALITIES), "position_zone_id": random.randint(1, 4),
+                "skill_level": random.randint(1, 100), "is_active": i % 10 != 0,
+                **{skill: random.randint(1, 100) for skill in crud.PLAYER_SKILLS},
+            })
+        conn.execute(insert(models.Player.__table__), rows)  # los triggers llenan players_search
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+    return path
+
+
+async def measure(path: str, rounds: int) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    timings = {}
+    async with AsyncSession(engine) as db:
+        for name, kwargs in QUERIES.items():
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                results = await crud.search_players_async(db, limit=20, **kwargs)
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[name] = (samples, len(results))
+    await engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = seed(args.players)
+    print(f"🚀 {args.players} jugadores sembrados en {time.perf_counter() - start:.1f}s, presupuesto p95 {args.budget_ms:.0f} ms\n")
+    print(f"  {'búsqueda':14} {'filas':>5} {'p50 ms':>7} {'p95 ms':>7}")
+    for name, (samples, rows) in asyncio.run(measure(path, args.rounds)).items():
+        p50 = statistics.median(samples)
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        verdict = "✅" if p95 <= args.budget_ms else "❌"
+        print(f"  {name:14} {rows:5} {p50:7.2f} {p95:7.2f} {verdict}")
+
+
+if __name__ == "__main__":
+    main()
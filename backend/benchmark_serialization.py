@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+CPU por cada 1.000 filas de PlayerOut al serializar un listado:
+- camino de FastAPI (validación con response_model + json.dumps),
+- TypeAdapter prearmado (validación y JSON en pydantic-core),
+- ORMSerializer (FAST_JSON_RESPONSES), con orjson si está instalado y si no con json.
+
+Los jugadores se cargan una vez desde SQLite con sus relaciones; solo se mide la
+serialización. También comprueba que las tres salidas son el mismo JSON.
+
+Uso:
+    python benchmark_serialization.py --players 2000 --rounds 5 [--no-orjson]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app import serialization
+from app.serialization import ORMSerializer
+
+
+def seed(engine, players: int):
+    models.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        zone = models.PositionZone(abbreviation="MED", name_es="Mediocampo", name_en="Midfield")
+        specific = models.PositionSpecific(abbreviation="MC", name_es="Medio centro", name_en="Central midfielder", zone=zone)
+        teams = [models.Team(name=f"Equipo {i}", description="Equipo de prueba") for i in range(max(1, players // 20))]
+        db.add_all([zone, specific, *teams])
+        db.flush()
+        for i in range(players):
+            user = models.User(email=f"jugador{i}@prosoccer.cl", hashed_password="x", full_name=f"Jugador {i}")
+            db.add(models.Player(
+                user=user, team_id=teams[i % len(teams)].id, position_zone_id=zone.id, position_specific_id=specific.id,
+                name=f"Jugador {i}", email=user.email, date_of_birth=date(1990, 1, 1 + i % 28), nationality="Chile",
+                jersey_number=i % 99, height=175, weight=72, skill_level=1 + i % 10,
+                rit=70, tir=65, pas=80, reg=75, defense=60, fis=70,
+            ))
+        db.commit()
+
+
+def fastapi_path(field, players) -> bytes:
+    # Lo que hace FastAPI con response_model=List[PlayerOut] y JSONResponse
+    content = asyncio.run(serialize_response(field=field, response_content=players))
+    return JSONResponse(content).body
+
+
+def cpu_ms_per_1000(function, players, rounds: int) -> float:
+    function(players)  # calentamiento
+    start = time.process_time()
+    for _ in range(rounds):
+        function(players)
+    return (time.process_time() - start) * 1000 / rounds / len(players) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--no-orjson", action="store_true", help="codificar con json aunque orjson esté instalado")
+    args = parser.parse_args()
+    if args.no_orjson:
+        serialization.orjson = None
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serialization.db')}")
+    seed(engine, args.players)
+    with Session(engine) as db:
+        players = db.query(models.Player).options(*crud.PLAYER_OUT_OPTIONS).order_by(*crud.PLAYER_PAGE_KEYS).all()
+
+        field = create_response_field(name="Response_get_players", type_=List[schemas.PlayerOut], mode="serialization")
+        adapter = TypeAdapter(List[schemas.PlayerOut])
+        serializer = ORMSerializer(schemas.PlayerOut)
+        paths = {
+            "FastAPI (response_model + json)": lambda rows: fastapi_path(field, rows),
+            "TypeAdapter prearmado": lambda rows: adapter.dump_json(adapter.validate_python(rows, from_attributes=True)),
+            "ORMSerializer": serializer.dump_json_list,
+        }
+
+        outputs = {name: json.loads(function(players)) for name, function in paths.items()}
+        reference = outputs["FastAPI (response_model + json)"]
+        assert all(output == reference for output in outputs.values()), "Las salidas JSON no coinciden"
+
+        print(f"🚀 {len(players)} jugadores (PlayerOut), {args.rounds} rondas; orjson: {'sí' if serialization.orjson else 'no'}\n")
+        baseline = None
+        for name, function in paths.items():
+            cost = cpu_ms_per_1000(function, players, args.rounds)
+            baseline = baseline or cost
+            print(f"  {name:34} {cost:8.1f} ms CPU / 1.000 filas  ({baseline / cost:4.1f}x)")
+        size = len(serializer.dump_json_list(players))
+        print(f"\nRespuesta: {size / 1024:.0f} KB; salidas idénticas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrencia SQLite: confirmaciones de asistencia simultáneas con
+lecturas de plantel en paralelo, con la configuración por defecto de SQLite
+(rollback journal) y con el perfil de producción de app/database.py (WAL).
+
+Uso:
+    python benchmark_sqlite.py --writers 8 --readers 8 --seconds 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import configure_sqlite, engine_options, sqlite_pragmas
+
+ROLLBACK_JOURNAL = {"journal_mode": "DELETE", "synchronous": "FULL", "foreign_keys": "ON"}
+
+
+def seed(url: str, players: int):
+    seed_engine = create_engine(url)
+    models.Base.metadata.create_all(bind=seed_engine)
+    Session = sessionmaker(bind=seed_engine)
+    db = Session()
+    zone = models.PositionZone(abbreviation="DEL", name_es="Delantera", name_en="Forward")
+    team = models.Team(name="Equipo benchmark")
+    admin = models.User(email="admin@prosoccer.cl", hashed_password="x", is_admin=True)
+    db.add_all([zone, team, admin])
+    db.flush()
+    match = models.Match(title="Partido benchmark", date=datetime.utcnow(), match_type="internal_friendly", created_by=admin.id)
+    db.add(match)
+    db.flush()
+    for i in range(players):
+        user = models.User(email=f"bench{i}@prosoccer.cl", hashed_password="x")
+        db.add(user)
+        db.flush()
+        player = models.Player(user_id=user.id, team_id=team.id, position_zone_id=zone.id, name=f"Jugador {i}", email=user.email)
+        db.add(player)
+        db.flush()
+        db.add(models.PlayerAttendance(match_id=match.id, player_id=player.id))
+    match_id, team_id = match.id, team.id
+    db.commit()
+    db.close()
+    seed_engine.dispose()
+    return match_id, team_id
+
+
+def run(url: str, pragmas: dict, production_pool: bool, writers: int, readers: int, seconds: float, match_id: int, team_id: int):
+    if production_pool:
+        bench_engine = configure_sqlite(create_engine(url, **engine_options(url)), pragmas)
+    else:
+        # Configuración original: create_engine(DATABASE_URL) sin más
+        bench_engine = configure_sqlite(create_engine(url, connect_args={"check_same_thread": False}), pragmas)
+    Session = sessionmaker(bind=bench_engine, autoflush=False)
+    counters = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def count(key):
+        with lock:
+            counters[key] += 1
+
+    def writer(n):
+        i = n
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                # Mismo patrón que update_player_attendance: leer, modificar, confirmar
+                attendance = db.query(models.PlayerAttendance).filter(
+                    models.PlayerAttendance.match_id == match_id
+                ).offset(i % 50).first()
+                attendance.status = "confirmed" if attendance.status != "confirmed" else "maybe"
+                attendance.confirmed_at = datetime.utcnow()
+                db.commit()
+                count("writes")
+            except exc.OperationalError as e:
+                db.rollback()
+                if "locked" in str(e) or "busy" in str(e):
+                    count("locked")
+                else:
+                    raise
+            finally:
+                db.close()
+            i += writers
+
+    def reader():
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                db.query(models.Player).filter(models.Player.team_id == team_id).all()
+                db.query(models.PlayerAttendance).filter(
+                    models.PlayerAttendance.match_id == match_id,
+                    models.PlayerAttendance.status == "confirmed"
+                ).all()
+                count("reads")
+            except exc.OperationalError as e:
+                if "locked" in str(e) or "busy" in str(e):
+                    count("locked")
+                else:
+                    raise
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bench_engine.dispose()
+    return counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("rollback journal (por defecto)", ROLLBACK_JOURNAL, False),
+        ("perfil de producción (WAL)", sqlite_pragmas(), True),
+    ]
+    print(f"🚀 {args.writers} escritores + {args.readers} lectores durante {args.seconds:.0f}s por escenario\n")
+    for name, pragmas, production_pool in scenarios:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_sqlite.db')}"
+        match_id, team_id = seed(url, args.players)
+        result = run(url, pragmas, production_pool, args.writers, args.readers, args.seconds, match_id, team_id)
+        print(f"{name}")
+        print(f"  confirmaciones/s: {result['writes'] / args.seconds:8.1f}")
+        print(f"  lecturas/s:       {result['reads'] / args.seconds:8.1f}")
+        print(f"  'database is locked': {result['locked']}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de decodificación de JWT: jwt.decode directo contra
+auth.decode_token con acierto y con fallo de la caché de tokens.
+
+Uso:
+    python benchmark_tokens.py --calls 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from jose import jwt
+
+from app import auth
+from app.cache import token_cache
+from app.config import ALGORITHM, SECRET_KEY
+
+
+def claims(i: int) -> dict:
+    return {"sub": f"bench{i}@prosoccer.cl", "uid": i, "role": "player", "team_id": 1, "adm": False, "ver": 0}
+
+
+def per_call_us(function, tokens) -> float:
+    start = time.perf_counter()
+    for token in tokens:
+        function(token)
+    return (time.perf_counter() - start) * 1e6 / len(tokens)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Tokens distintos para los fallos; uno repetido para los aciertos
+    distinct = [auth.create_access_token(claims(i)) for i in range(args.calls)]
+    repeated = [distinct[0]] * args.calls
+
+    raw = per_call_us(lambda token: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), distinct)
+    token_cache.clear()
+    miss = per_call_us(auth.decode_token, distinct)
+    token_cache.clear()
+    auth.decode_token(repeated[0])
+    hit = per_call_us(auth.decode_token, repeated)
+
+    print(f"🚀 {args.calls} decodificaciones por escenario\n")
+    print(f"  jwt.decode sin caché:         {raw:8.2f} µs/llamada")
+    print(f"  decode_token, fallo de caché: {miss:8.2f} µs/llamada")
+    print(f"  decode_token, acierto:        {hit:8.2f} µs/llamada  ({raw / hit:.0f}x más rápido)")
+    print(f"\nCaché de tokens: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Configuración común de pytest.
+
+app.database crea los motores con DATABASE_URL al importarse, así que aquí se
+apunta a una base SQLite temporal antes de que ningún test importe la app: las
+pruebas nunca tocan prosoccer.db. Sin límite de intentos de login y con bcrypt
+en el threadpool (HASH_POOL_WORKERS=0).
+
+Fixture `api`: base migrada y vacía (salvo el catálogo de posiciones), cachés
+en blanco y un TestClient con los usuarios y jugadores de seed().
+"""
+
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["RATE_LIMIT_BACKEND"] = "off"
+os.environ["HASH_POOL_WORKERS"] = "0"
+
+import pytest
+from passlib.hash import bcrypt
+
+PASSWORD = "secreto123"
+# Un solo hash y con el costo mínimo: verificarlo en cada login toma ~1 ms
+PASSWORD_HASH = bcrypt.using(rounds=4).hash(PASSWORD)
+
+# Tablas que la migración siembra y los tests no escriben
+KEEP_TABLES = {"position_zones", "position_specifics"}
+
+
+@dataclass
+class Api:
+    client: object
+    ids: dict
+
+    def login(self, email: str) -> dict:
+        """Respuesta de /auth/login: access_token y refresh_token"""
+        response = self.client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def headers(self, email: str) -> dict:
+        return {"Authorization": f"Bearer {self.login(email)['access_token']}"}
+
+
+def reset_database(engine):
+    from app import models
+    from app.auth import revoked_refresh_families, token_versions
+    from app.cache import token_cache, user_cache
+
+    with engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            if table.name not in KEEP_TABLES:
+                conn.execute(table.delete())
+        token_versions.load(conn)
+        revoked_refresh_families.load(conn)
+    user_cache.clear()
+    token_cache.clear()
+
+
+def seed(engine) -> dict:
+    """Dos equipos; admin, supervisor del equipo Uno y un jugador por equipo (más uno sin usuario)"""
+    from sqlalchemy.orm import Session
+
+    from app import models
+
+    with Session(engine) as db:
+        zone = db.query(models.PositionZone).filter_by(abbreviation="MED").one()
+        uno, dos = models.Team(name="Uno"), models.Team(name="Dos")
+        db.add_all([uno, dos])
+        db.flush()
+        users = {
+            "admin": models.User(email="admin@prosoccer.cl", role="admin", is_admin=True),
+            "supervisor": models.User(email="supervisor@prosoccer.cl", role="supervisor", team_id=uno.id),
+            "player": models.User(email="jugador@prosoccer.cl", role="player", is_player=True),
+            "rival": models.User(email="rival@prosoccer.cl", role="player", is_player=True),
+        }
+        for user in users.values():
+            user.hashed_password = PASSWORD_HASH
+        db.add_all(users.values())
+        db.flush()
+        players = {
+            "player": models.Player(user_id=users["player"].id, team_id=uno.id, name="Ana Uno", email="ana@prosoccer.cl"),
+            "teammate": models.Player(user_id=users["admin"].id, team_id=uno.id, name="Bea Uno", email="bea@prosoccer.cl"),
+            "rival": models.Player(user_id=users["rival"].id, team_id=dos.id, name="Carla Dos", email="carla@prosoccer.cl"),
+        }
+        for player in players.values():
+            player.position_zone_id = zone.id
+        db.add_all(players.values())
+        db.commit()
+        return {
+            "team": uno.id, "other_team": dos.id, "zone": zone.id,
+            **{f"{name}_user": user.id for name, user in users.items()},
+            **{name: player.id for name, player in players.items()},
+        }
+
+
+@pytest.fixture
+def api():
+    from fastapi.testclient import TestClient
+
+    from app import migrations
+    from app.database import engine
+    from app.main import app
+
+    migrations.upgrade(engine)
+    reset_database(engine)
+    ids = seed(engine)
+    with TestClient(app) as client:
+        yield Api(client, ids)
@@ -7,15 +7,15 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import engine, Base
-from app.models import User, PositionZone, PositionSpecific, Team, Player
+from app.database import engine
+from app import migrations
 
 def init_database():
     """Inicializa la base de datos con todas las tablas"""
     
     try:
-        # Crear todas las tablas
-        Base.metadata.create_all(bind=engine)
+        # Crear todas las tablas (migraciones versionadas)
+        migrations.upgrade(engine)
         print("✅ Base de datos inicializada exitosamente")
         print("✅ Todas las tablas creadas incluyendo el campo photo_url")
         
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Aplica las migraciones versionadas del esquema (app/migrations.py).
+
+Ejecutar una vez por despliegue, antes de arrancar los workers:
+    python migrate.py            # aplica todas las pendientes
+    python migrate.py --status   # muestra la versión actual
+    python migrate.py --to 2     # aplica hasta la versión indicada
+
+Reemplaza a los antiguos migrate_positions.py, migrate_roles.py, migrate_skills.py,
+add_photo_url_*.py y create_matches_tables.py: la migración 1 crea sus tablas y columnas y
+la 7 siembra el catálogo de posiciones. Los datos de ejemplo de partidos siguen en
+create_matches_sample_data.py.
+"""
+
+import argparse
+import logging
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app import migrations
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de ProSoccer")
+    parser.add_argument("--status", action="store_true", help="solo mostrar la versión actual")
+    parser.add_argument("--to", type=int, default=None, help="versión objetivo")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    with engine.connect() as conn:
+        status = migrations.schema_status(conn)
+    print(f"📋 Esquema en versión {status['current']} (última disponible: {status['latest']})")
+
+    if args.status:
+        for item in migrations.MIGRATIONS:
+            mark = "✅" if item.version <= status["current"] else "⏳"
+            print(f"   {mark} {item.version:04d} {item.name}")
+        return
+
+    if not status["pending"]:
+        print("✅ No hay migraciones pendientes")
+        return
+
+    try:
+        applied = migrations.upgrade(engine, target=args.to)
+    except Exception as e:
+        print(f"❌ Error durante la migración: {e}")
+        sys.exit(1)
+
+    for item in applied:
+        print(f"✅ {item.version:04d} {item.name}")
+    print("🎉 Migración completada")
+
+if __name__ == "__main__":
+    main()
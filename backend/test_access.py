@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Alcance de lectura de app/access.py en los endpoints: un jugador ve solo su
+equipo (listados, resumen, búsqueda, generador de equipos) y recibe 403 con
+jugadores o equipos ajenos; el supervisor ve el equipo asignado; el
+administrador ve todo; un invitado, nada.
+
+    python -m pytest test_access.py
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import engine
+
+LISTS = ("/players/", "/players/summary", "/players/search", "/team-generator/players/")
+
+
+def names(api, path: str, headers: dict) -> set:
+    response = api.client.get(path, headers=headers)
+    assert response.status_code == 200, (path, response.text)
+    return {row["name"] for row in response.json()}
+
+
+def test_player_sees_only_own_team(api):
+    headers = api.headers("jugador@prosoccer.cl")
+    for path in LISTS:
+        assert names(api, path, headers) == {"Ana Uno", "Bea Uno"}, path
+    assert names(api, "/teams/", headers) == {"Uno"}
+    assert names(api, "/team-generator/teams/", headers) == {"Uno"}
+
+    assert api.client.get(f"/players/{api.ids['teammate']}", headers=headers).status_code == 200
+    assert api.client.get(f"/teams/{api.ids['team']}", headers=headers).status_code == 200
+    for path in (f"/players/{api.ids['rival']}", f"/teams/{api.ids['other_team']}"):
+        response = api.client.get(path, headers=headers)
+        assert response.status_code == 403, path
+
+
+def test_player_scope_follows_team_change(api):
+    # El equipo del jugador se resuelve en cada consulta, no viene en el token
+    headers = api.headers("jugador@prosoccer.cl")
+    with Session(engine) as db:
+        db.get(models.Player, api.ids["player"]).team_id = api.ids["other_team"]
+        db.commit()
+    assert names(api, "/players/", headers) == {"Ana Uno", "Carla Dos"}
+    assert api.client.get(f"/teams/{api.ids['team']}", headers=headers).status_code == 403
+
+
+def test_supervisor_admin_and_guest(api):
+    headers = api.headers("supervisor@prosoccer.cl")
+    assert names(api, "/players/", headers) == {"Ana Uno", "Bea Uno"}
+    assert api.client.get(f"/players/{api.ids['rival']}", headers=headers).status_code == 403
+
+    headers = api.headers("admin@prosoccer.cl")
+    for path in LISTS:
+        assert names(api, path, headers) == {"Ana Uno", "Bea Uno", "Carla Dos"}, path
+    assert names(api, "/teams/", headers) == {"Uno", "Dos"}
+    assert api.client.get(f"/players/{api.ids['rival']}", headers=headers).status_code == 200
+    assert api.client.get(f"/teams/{api.ids['other_team']}", headers=headers).status_code == 200
+    assert api.client.get("/players/999", headers=headers).status_code == 404
+
+    # Un jugador sin perfil de jugador (o invitado) no ve ninguno
+    with Session(engine) as db:
+        db.query(models.Player).filter_by(id=api.ids["rival"]).delete()
+        db.commit()
+    headers = api.headers("rival@prosoccer.cl")
+    assert names(api, "/players/", headers) == set()
+    assert names(api, "/teams/", headers) == set()
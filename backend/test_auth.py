@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Autenticación sobre la app completa: caché de usuarios de get_current_user,
+revocación de access tokens (también los que ya están en token_cache) y
+rotación, reuso, logout y depuración de refresh tokens.
+
+    python -m pytest test_auth.py
+"""
+
+import hashlib
+import os
+import sys
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import Session
+
+from app import auth, main, models
+from app.cache import token_cache, user_cache
+from app.database import engine
+
+SUPERVISOR = "supervisor@prosoccer.cl"
+
+
+def update_user(email: str, **changes):
+    """Cambio directo por el ORM, como lo haría otro endpoint o un script"""
+    with Session(engine) as db:
+        user = db.query(models.User).filter_by(email=email).one()
+        for field, value in changes.items():
+            setattr(user, field, value)
+        db.commit()
+
+
+def test_user_update_evicts_cached_snapshot(api):
+    headers = api.headers(SUPERVISOR)
+    assert api.client.get("/me", headers=headers).json()["full_name"] is None
+    assert user_cache.get(SUPERVISOR) is not None
+
+    # Un campo que no está en los claims: el mismo token sigue valiendo y ve el cambio
+    update_user(SUPERVISOR, full_name="Sofía Supervisora")
+    assert user_cache.get(SUPERVISOR) is None
+    assert api.client.get("/me", headers=headers).json()["full_name"] == "Sofía Supervisora"
+
+    # Cambio de rol: el token anterior queda revocado y el nuevo ve el rol vigente
+    update_user(SUPERVISOR, role="admin", is_admin=True, team_id=None)
+    assert user_cache.get(SUPERVISOR) is None
+    assert api.client.get("/me", headers=headers).status_code == 401
+    assert api.client.get("/me", headers=api.headers(SUPERVISOR)).json()["is_admin"] is True
+
+
+def test_deleted_user_is_not_served_from_cache(api):
+    # users no tiene is_active: dar de baja a alguien es borrar su fila
+    headers = api.headers(SUPERVISOR)
+    assert api.client.get("/me", headers=headers).status_code == 200
+    with Session(engine) as db:
+        db.delete(db.query(models.User).filter_by(email=SUPERVISOR).one())
+        db.commit()
+    response = api.client.get("/me", headers=headers)
+    assert response.status_code == 401 and response.json()["detail"] == "Usuario no encontrado"
+
+
+def cached_token(api, email: str) -> dict:
+    """Cabeceras con un access token ya verificado y guardado en token_cache"""
+    token = api.login(email)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert api.client.get("/players/", headers=headers).status_code == 200
+    assert token_cache.get(hashlib.sha256(token.encode()).digest()) is not None
+    return headers
+
+
+def test_revoke_tokens_endpoint(api):
+    headers = cached_token(api, "jugador@prosoccer.cl")
+    session = api.login("jugador@prosoccer.cl")
+    other = cached_token(api, SUPERVISOR)
+    admin = api.headers("admin@prosoccer.cl")
+
+    response = api.client.post(f"/admin/users/{api.ids['player_user']}/revoke-tokens", headers=admin)
+    assert response.status_code == 200 and response.json()["token_version"] == 1
+    # Con y sin lectura de users (claims o get_current_user)
+    for path in ("/players/", "/me"):
+        response = api.client.get(path, headers=headers)
+        assert response.status_code == 401 and response.json()["detail"] == "Token revocado"
+    assert api.client.get("/players/", headers=other).status_code == 200
+    assert api.client.get("/players/", headers=api.headers("jugador@prosoccer.cl")).status_code == 200
+
+    assert refresh(api, session["refresh_token"]).status_code == 401
+
+    assert api.client.post(f"/admin/users/{api.ids['player_user']}/revoke-tokens", headers=other).status_code == 403
+    assert api.client.post("/admin/users/999/revoke-tokens", headers=admin).status_code == 404
+
+
+def test_claim_changes_revoke_tokens(api):
+    # users no tiene is_active; los campos de los claims son email, role, team_id e is_admin
+    for changes in ({"role": "guest"}, {"team_id": None}, {"is_admin": True}):
+        headers = cached_token(api, SUPERVISOR)
+        update_user(SUPERVISOR, **changes)
+        for path in ("/players/", "/me"):
+            assert api.client.get(path, headers=headers).status_code == 401, (changes, path)
+
+    # Un cambio fuera de los claims no revoca
+    headers = cached_token(api, SUPERVISOR)
+    update_user(SUPERVISOR, phone="+56 9 1234 5678")
+    assert api.client.get("/players/", headers=headers).status_code == 200
+
+
+def refresh(api, refresh_token: str):
+    return api.client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def refresh_rows(family_id: str) -> dict:
+    with Session(engine) as db:
+        return {row.jti: row for row in db.query(models.RefreshToken).filter_by(family_id=family_id)}
+
+
+def test_refresh_rotation_issues_new_jti(api):
+    first = api.login(SUPERVISOR)["refresh_token"]
+    response = refresh(api, first)
+    assert response.status_code == 200, response.text
+    second = response.json()["refresh_token"]
+    old, new = auth.verify_token(first), auth.verify_token(second)
+    assert new["jti"] != old["jti"] and new["fam"] == old["fam"] == old["jti"]
+    rows = refresh_rows(old["fam"])
+    assert rows[old["jti"]].used_at is not None and rows[new["jti"]].used_at is None
+    assert api.client.get("/me", headers={"Authorization": f"Bearer {response.json()['access_token']}"}).status_code == 200
+    # El siguiente también rota
+    assert refresh(api, second).status_code == 200
+
+
+def test_refresh_reuse_revokes_whole_family(api):
+    first = api.login(SUPERVISOR)["refresh_token"]
+    other_session = api.login(SUPERVISOR)["refresh_token"]
+    second = refresh(api, first).json()["refresh_token"]
+
+    # Presentar otra vez el ya usado revoca la sesión, incluido el sucesor sin usar
+    assert refresh(api, first).status_code == 401
+    assert refresh(api, second).status_code == 401
+    family = auth.verify_token(first)["fam"]
+    assert family in auth.revoked_refresh_families
+    assert all(row.revoked_at is not None for row in refresh_rows(family).values())
+    # Otras sesiones del mismo usuario siguen vivas
+    assert refresh(api, other_session).status_code == 200
+
+
+def test_logout_revokes_refresh(api, monkeypatch):
+    first = api.login(SUPERVISOR)["refresh_token"]
+    second = refresh(api, first).json()["refresh_token"]
+    assert api.client.post("/auth/logout", json={"refresh_token": second}).status_code == 200
+    for token in (first, second):
+        response = refresh(api, token)
+        assert response.status_code == 401 and response.json()["detail"] == "Refresh token revocado"
+    # Un worker que no vio la revocación en memoria también responde 401: manda la tabla
+    monkeypatch.setattr(main, "revoked_refresh_families", auth.RevokedRefreshFamilies())
+    assert refresh(api, second).status_code == 401
+    assert api.client.post("/auth/logout", json={"refresh_token": "basura"}).status_code == 401
+
+
+def test_purge_deletes_expired_rows(api):
+    live = auth.verify_token(api.login(SUPERVISOR)["refresh_token"])
+    now = datetime.utcnow()
+    table = models.RefreshToken.__table__
+    with engine.begin() as conn:
+        conn.execute(table.insert(), [
+            {"jti": "vencido", "family_id": "vencido", "user_id": api.ids["supervisor_user"], "expires_at": now - timedelta(days=1)},
+            {"jti": "revocado", "family_id": "revocado", "user_id": api.ids["supervisor_user"],
+             "expires_at": now - timedelta(minutes=1), "revoked_at": now - timedelta(days=2)},
+        ])
+        auth.revoked_refresh_families.add("revocado", now - timedelta(minutes=1))
+        main.compact_refresh_tokens(conn)
+        assert set(conn.execute(table.select().with_only_columns(table.c.jti)).scalars()) == {live["jti"]}
+    # La sesión revocada ya venció: deja de ocupar memoria
+    assert "revocado" not in auth.revoked_refresh_families
+
+
+def test_refresh_token_is_not_an_access_token(api):
+    tokens = api.login(SUPERVISOR)
+    payload = auth.verify_token(tokens["refresh_token"])
+    # Solo identifica la sesión: sin uid, rol, equipo, adm ni ver
+    assert set(payload) == {"sub", "jti", "fam", "exp", "type"}
+    assert auth.verify_token(tokens["access_token"])["type"] == "access"
+
+    bearer = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    for path in ("/players/", "/me"):
+        response = api.client.get(path, headers=bearer)
+        assert response.status_code == 401 and response.json()["detail"] == "Token inválido"
+    # Revocado (logout) tampoco
+    assert api.client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+    for path in ("/players/", "/me"):
+        assert api.client.get(path, headers=bearer).status_code == 401
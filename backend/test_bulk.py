@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Endpoints masivos (/players/bulk, /matches/{id}/attendance/bulk,
+/matches/{id}/events/bulk): errores por fila con su índice, claves repetidas en
+el lote, upsert que solo toca los campos enviados y tope BULK_MAX_ROWS (413).
+También la asistencia individual repetida (409, la misma clave única).
+
+    python -m pytest test_bulk.py
+"""
+
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import Session
+
+from app import crud, main, models
+from app.database import engine
+
+
+def player_row(api, email: str, **fields) -> dict:
+    return {"user_id": api.ids["admin_user"], "position_zone_id": api.ids["zone"], "name": email.split("@")[0], "email": email, **fields}
+
+
+def create_match(api) -> int:
+    with Session(engine) as db:
+        match = models.Match(title="Amistoso", date=datetime(2024, 5, 1, 20, 0), match_type="internal_friendly", created_by=api.ids["admin_user"])
+        db.add(match)
+        db.commit()
+        return match.id
+
+
+def test_players_bulk_reports_rows_and_upserts(api):
+    headers = api.headers("admin@prosoccer.cl")
+    rows = [
+        player_row(api, "nueva@prosoccer.cl", nationality="Chile"),
+        {"email": "sin-nombre@prosoccer.cl"},  # esquema
+        player_row(api, "otra@prosoccer.cl", team_id=999),  # FK inexistente
+        "no soy un objeto",
+        player_row(api, "nueva@prosoccer.cl", name="Repetida"),  # misma clave en el lote
+        player_row(api, "ana@prosoccer.cl", name="Ana Actualizada", skill_level=9),  # ya existe: upsert
+    ]
+    response = api.client.post("/players/bulk", json=rows, headers=headers)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["processed"], result["failed"]) == (2, 4)
+    errors = {error["index"]: error["errors"] for error in result["errors"]}
+    assert sorted(errors) == [1, 2, 3, 4]
+    assert any(message.startswith("name:") for message in errors[1])
+    assert errors[2] == ["team_id: 999 no existe"]
+    assert errors[3] == ["la fila debe ser un objeto"]
+    assert errors[4] == ["email duplicado en el lote"]
+
+    with Session(engine) as db:
+        new = db.query(models.Player).filter_by(email="nueva@prosoccer.cl").one()
+        assert new.name == "nueva" and new.nationality == "Chile" and new.search_name == "nueva"
+        updated = db.get(models.Player, api.ids["player"])
+        # Solo cambian los campos enviados: el equipo se conserva
+        assert (updated.name, updated.skill_level, updated.team_id) == ("Ana Actualizada", 9, api.ids["team"])
+        assert updated.search_name == "ana actualizada" and updated.updated_at is not None
+        assert db.query(models.Player).filter(models.Player.email.in_(["otra@prosoccer.cl", "sin-nombre@prosoccer.cl"])).count() == 0
+
+
+def test_attendance_and_events_bulk(api):
+    headers = api.headers("admin@prosoccer.cl")
+    match_id = create_match(api)
+    player, rival = api.ids["player"], api.ids["rival"]
+
+    response = api.client.post(f"/matches/{match_id}/attendance/bulk", headers=headers, json=[
+        {"player_id": player, "status": "maybe"},
+        {"player_id": rival, "status": "confirmed"},
+        {"player_id": player, "status": "declined"},
+        {"player_id": 999},
+    ])
+    result = response.json()
+    assert (result["processed"], result["failed"]) == (2, 2)
+    assert {error["index"]: error["errors"] for error in result["errors"]} == {2: ["player_id duplicado en el lote"], 3: ["player_id: 999 no existe"]}
+
+    # Segundo lote sobre las mismas filas: actualiza sin duplicar
+    api.client.post(f"/matches/{match_id}/attendance/bulk", headers=headers, json=[{"player_id": player, "status": "confirmed", "notes": "llega tarde"}])
+    with Session(engine) as db:
+        rows = {row.player_id: row for row in db.query(models.PlayerAttendance).filter_by(match_id=match_id)}
+        assert len(rows) == 2
+        assert (rows[player].status, rows[player].notes) == ("confirmed", "llega tarde") and rows[player].confirmed_at is not None
+        assert rows[rival].confirmed_at is not None
+
+    response = api.client.post(f"/matches/{match_id}/events/bulk", headers=headers, json=[
+        {"player_id": player, "event_type": "goal", "minute": 10, "team_side": "home"},
+        {"player_id": player, "event_type": "goal", "minute": "diez", "team_side": "home"},
+        {"player_id": player, "event_type": "goal", "minute": 80, "team_side": "home"},  # los eventos se repiten
+    ])
+    result = response.json()
+    assert (result["processed"], result["failed"]) == (2, 1) and result["errors"][0]["index"] == 1
+
+    assert api.client.post("/matches/999/events/bulk", headers=headers, json=[]).status_code == 404
+
+
+def test_bulk_max_rows(api, monkeypatch):
+    monkeypatch.setattr(main, "BULK_MAX_ROWS", 2)
+    headers = api.headers("admin@prosoccer.cl")
+    rows = [player_row(api, f"j{i}@prosoccer.cl") for i in range(3)]
+    response = api.client.post("/players/bulk", json=rows, headers=headers)
+    assert response.status_code == 413 and response.json() == {"detail": "Máximo 2 filas por petición"}
+    # Nada se escribió
+    with Session(engine) as db:
+        assert db.query(models.Player).filter(models.Player.email.like("j_@prosoccer.cl")).count() == 0
+
+    assert api.client.post("/players/bulk", json=rows[:2], headers=headers).json()["processed"] == 2
+    # Solo administradores
+    assert api.client.post("/players/bulk", json=rows[:1], headers=api.headers("jugador@prosoccer.cl")).status_code == 403
+
+
+def test_duplicate_attendance_is_409(api):
+    headers = api.headers("admin@prosoccer.cl")
+    match_id = create_match(api)
+    body = {"match_id": match_id, "player_id": api.ids["player"], "status": "confirmed"}
+    first = api.client.post(f"/matches/{match_id}/attendance/", json=body, headers=headers)
+    assert first.status_code == 200, first.text
+    response = api.client.post(f"/matches/{match_id}/attendance/", json={**body, "status": "declined"}, headers=headers)
+    assert response.status_code == 409 and response.json()["detail"] == "El jugador ya tiene asistencia registrada en este partido"
+    with Session(engine) as db:
+        rows = db.query(models.PlayerAttendance).filter_by(match_id=match_id).all()
+        assert [(row.id, row.status) for row in rows] == [(first.json()["id"], "confirmed")]
+
+
+def test_attendance_insert_race_is_409(api, monkeypatch):
+    # La consulta previa no la ve (otra petición aún no confirmaba); el índice único sí
+    headers = api.headers("admin@prosoccer.cl")
+    match_id = create_match(api)
+    body = {"match_id": match_id, "player_id": api.ids["player"]}
+    assert api.client.post(f"/matches/{match_id}/attendance/", json=body, headers=headers).status_code == 200
+    monkeypatch.setattr(crud, "get_attendance", lambda db, match_id, player_id: None)
+    assert api.client.post(f"/matches/{match_id}/attendance/", json=body, headers=headers).status_code == 409
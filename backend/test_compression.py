@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+CompressionMiddleware (app/compression.py) sobre una app mínima: umbral, tipos
+de contenido, Accept-Encoding y respuestas en streaming.
+
+    python -m pytest test_compression.py
+"""
+
+import gzip
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, parse_accept_encoding
+
+PAYLOAD = b'[' + b",".join(b'{"id":%d,"name":"Jugador %d"}' % (i, i) for i in range(200)) + b']'
+
+
+def make_client():
+    app = FastAPI()
+    stats = {"compressed": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=5, brotli_level=0, content_types=("application/json", "text/"), stats=stats)
+
+    @app.get("/big")
+    def big():
+        return Response(PAYLOAD, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/image")
+    def image():
+        return Response(PAYLOAD, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"linea %d\n" % i for i in range(1000)), media_type="text/csv")
+
+    return TestClient(app), stats
+
+
+def test_accept_encoding_quality():
+    assert parse_accept_encoding("gzip;q=0.5, br, *;q=0") == {"gzip": 0.5, "br": 1.0, "*": 0.0}
+
+
+def test_compresses_allowed_types_over_threshold():
+    client, stats = make_client()
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and response.headers["vary"] == "Accept-Encoding"
+    assert response.content == PAYLOAD  # httpx descomprime
+    assert int(response.headers["content-length"]) < len(PAYLOAD) / 3
+
+    for path, headers in [("/small", {"Accept-Encoding": "gzip"}), ("/image", {"Accept-Encoding": "gzip"}), ("/big", {"Accept-Encoding": "identity"})]:
+        response = client.get(path, headers=headers)
+        assert "content-encoding" not in response.headers, path
+    assert stats["compressed"] == 1
+
+
+def test_streaming_is_compressed_per_chunk():
+    client, stats = make_client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip" and "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"".join(b"linea %d\n" % i for i in range(1000))
+    assert stats["bytes_out"] == len(raw)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Motores de app/database.py: estadísticas del pool instrumentado y lecturas en
+réplica con dos archivos SQLite (retraso, lectura después de escribir por
+cliente y réplica en el resto de los casos).
+
+    python -m pytest test_database.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine, exc, select
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from app.database import (
+    LAST_WRITE_HEADER,
+    InstrumentedQueuePool,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    RoutingSession,
+    client_last_write,
+    get_pool_stats,
+)
+
+NoteBase = declarative_base()
+
+
+class Note(NoteBase):
+    __tablename__ = "notes"
+    id = Column(Integer, primary_key=True)
+    body = Column(String, nullable=False)
+
+
+def test_pool_counts_only_obtained_connections():
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    engine = create_engine(f"sqlite:///{path}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = get_pool_stats(engine)
+    assert stats["checkouts"] == 1 and stats["timeouts"] == 1, stats
+    # La espera del intento fallido (~100 ms) no entra en los promedios
+    assert stats["wait_time_max_ms"] < 50, stats
+
+    held.close()
+    with engine.connect():
+        pass
+    stats = get_pool_stats(engine)
+    assert stats["checkouts"] == 2 and stats["timeouts"] == 1 and stats["checked_out"] == 0, stats
+    engine.dispose()
+
+
+def replica_setup():
+    """Primario y réplica en dos archivos; cada uno dice de dónde se leyó"""
+    directory = tempfile.mkdtemp()
+    engines = {}
+    for name in ("primary", "replica"):
+        engines[name] = create_engine(f"sqlite:///{os.path.join(directory, name + '.db')}", connect_args={"check_same_thread": False})
+        NoteBase.metadata.create_all(engines[name])
+        with engines[name].begin() as conn:
+            conn.execute(Note.__table__.insert().values(id=1, body=name))
+    router = ReplicaRouter(enabled=True, max_lag=5, sticky_seconds=5)
+    factory = sessionmaker(class_=RoutingSession, info={"engines": engines, "router": router})
+    return router, factory
+
+
+def read_from(factory) -> str:
+    with factory() as db:
+        return db.execute(select(Note.body).where(Note.id == 1)).scalar()
+
+
+def test_replica_lag_falls_back_to_primary():
+    router, factory = replica_setup()
+    assert read_from(factory) == "replica"
+    router.set_lag(10)  # sobre max_lag
+    assert read_from(factory) == "primary"
+    router.set_lag(None)  # réplica caída
+    assert read_from(factory) == "primary" and router.status()["reading_from"] == "primary"
+    router.set_lag(0.5)
+    assert read_from(factory) == "replica"
+
+
+def test_reads_after_write_stick_to_primary():
+    router, factory = replica_setup()
+    with factory() as db:
+        db.add(Note(id=2, body="nueva"))
+        db.flush()
+        # La misma sesión ve lo que escribió
+        assert db.execute(select(Note.body).where(Note.id == 1)).scalar() == "primary"
+        db.commit()
+
+    # Otra sesión: depende de la última escritura del cliente, no del proceso
+    assert read_from(factory) == "replica"
+    token = client_last_write.set(time.time())
+    try:
+        assert read_from(factory) == "primary"
+    finally:
+        client_last_write.reset(token)
+    token = client_last_write.set(time.time() - 10)  # pasó REPLICA_STICKY_SECONDS
+    try:
+        assert read_from(factory) == "replica"
+    finally:
+        client_last_write.reset(token)
+
+
+def test_middleware_marks_the_writing_client():
+    router, factory = replica_setup()
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=5)
+
+    def get_session():
+        with factory() as db:
+            yield db
+
+    @app.post("/notes")
+    def create_note(db=Depends(get_session)):
+        db.add(Note(body="nota"))
+        db.commit()
+        return {"ok": True}
+
+    @app.get("/source")
+    def source(db=Depends(get_session)):
+        return {"read_from": db.execute(select(Note.body).where(Note.id == 1)).scalar()}
+
+    writer, other = TestClient(app), TestClient(app)
+    response = writer.get("/source")
+    assert response.json()["read_from"] == "replica" and LAST_WRITE_HEADER not in response.headers
+
+    response = writer.post("/notes")
+    assert LAST_WRITE_HEADER in response.headers and "last_write" in writer.cookies
+    # El cliente que escribió lee del primario (cookie); los demás siguen en la réplica
+    assert writer.get("/source").json()["read_from"] == "primary"
+    assert other.get("/source").json()["read_from"] == "replica"
+    # Sin cookies (otro worker, cliente móvil) basta con devolver la cabecera
+    headers = {LAST_WRITE_HEADER: response.headers[LAST_WRITE_HEADER]}
+    assert other.get("/source", headers=headers).json()["read_from"] == "primary"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+GET condicional de /players/ y /teams/{id}: 304 con If-None-Match, ETag nuevo
+tras escribir en el listado o en una tabla anidada (también el catálogo de
+posiciones) y ETag distinto según el alcance de quien pregunta.
+
+    python -m pytest test_etag.py
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import engine
+
+
+def etag(api, path: str, headers: dict) -> str:
+    response = api.client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    return response.headers["ETag"]
+
+
+def test_if_none_match_returns_304(api):
+    headers = api.headers("admin@prosoccer.cl")
+    for path in ("/players/", f"/teams/{api.ids['team']}", "/teams/"):
+        tag = etag(api, path, headers)
+        assert tag.startswith('W/"')
+        response = api.client.get(path, headers={**headers, "If-None-Match": tag})
+        assert response.status_code == 304 and response.content == b"" and response.headers["ETag"] == tag
+        # Otra query string es otro listado
+        assert api.client.get(path, params={"limit": 1}, headers={**headers, "If-None-Match": tag}).status_code == 200
+
+
+def test_etag_changes_after_writes(api):
+    headers = api.headers("admin@prosoccer.cl")
+    paths = ("/players/", f"/teams/{api.ids['team']}")
+    tags = {path: etag(api, path, headers) for path in paths}
+
+    def assert_changed(reason: str):
+        for path in paths:
+            tag = etag(api, path, headers)
+            assert tag != tags[path], (reason, path)
+            tags[path] = tag
+
+    response = api.client.put(f"/players/{api.ids['player']}", json={"nationality": "Chile"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert_changed("jugador editado")
+
+    with Session(engine) as db:
+        db.query(models.User).filter_by(id=api.ids["admin_user"]).one().full_name = "Admin"
+        db.commit()
+    assert_changed("usuario anidado")
+
+    # Posición agregada al catálogo (lo que hace una migración)
+    with Session(engine) as db:
+        db.add(models.PositionSpecific(abbreviation="LIB", name_es="Líbero", name_en="Sweeper", zone_id=api.ids["zone"]))
+        db.commit()
+    assert_changed("catálogo de posiciones")
+
+
+def test_etag_depends_on_scope(api):
+    player, supervisor = api.headers("jugador@prosoccer.cl"), api.headers("supervisor@prosoccer.cl")
+    # Mismas filas visibles (equipo Uno) pero distinto alcance: el 304 de uno no sirve al otro
+    tag = etag(api, "/players/", player)
+    assert etag(api, "/players/", supervisor) != tag
+    assert api.client.get("/players/", headers={**supervisor, "If-None-Match": tag}).status_code == 200
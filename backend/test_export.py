@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Exports en streaming de app/export.py: formato NDJSON/CSV, filtro por partido y
+memoria acotada por el tamaño de bloque (el pico no crece con las filas).
+
+    python -m pytest test_export.py
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.export import export_statement, stream_export
+
+BATCH = 500
+
+
+def seed(players: int) -> str:
+    path = os.path.join(tempfile.mkdtemp(), "export.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.PositionZone.__table__), [{"id": 1, "abbreviation": "MED", "name_es": "Medio", "name_en": "Mid"}])
+        conn.execute(insert(models.Team.__table__), [{"id": 1, "name": "Equipo"}])
+        conn.execute(insert(models.User.__table__), [{"id": 1, "email": "admin@prosoccer.cl", "hashed_password": "x"}])
+        conn.execute(insert(models.Match.__table__), [{"id": 1, "title": "Partido", "date": datetime(2026, 1, 1), "match_type": "internal_friendly", "created_by": 1}])
+        conn.execute(insert(models.Player.__table__), [
+            {"id": i, "user_id": 1, "team_id": 1, "position_zone_id": 1, "name": f"Jugador {i}", "email": f"j{i}@prosoccer.cl", "nationality": "Chile"}
+            for i in range(1, players + 1)
+        ])
+        conn.execute(insert(models.PlayerAttendance.__table__), [{"match_id": 1, "player_id": i, "status": "confirmed"} for i in range(1, 11)])
+    engine.dispose()
+    return path
+
+
+async def collect(path: str, resource: str, format: str, match_id: int = None, measure: bool = False):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = sessionmaker(engine, class_=AsyncSession)
+    chunks, sizes = 0, 0
+    body = []
+    if measure:
+        tracemalloc.start()
+    async for chunk in stream_export(export_statement(resource, match_id), format, session_factory, batch_size=BATCH):
+        chunks += 1
+        sizes += len(chunk)
+        if not measure:
+            body.append(chunk)
+    peak = tracemalloc.get_traced_memory()[1] if measure else None
+    if measure:
+        tracemalloc.stop()
+    await engine.dispose()
+    return b"".join(body), chunks, sizes, peak
+
+
+def test_ndjson_and_csv():
+    path = seed(1200)
+    body, chunks, _, _ = asyncio.run(collect(path, "players", "ndjson"))
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert len(lines) == 1200 and chunks == 3  # bloques de 500
+    assert lines[0]["name"] == "Jugador 1" and lines[0]["team_name"] == "Equipo" and lines[0]["position_zone"] == "MED"
+
+    body, _, _, _ = asyncio.run(collect(path, "attendance", "csv", match_id=1))
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert len(rows) == 10 and rows[0]["player_name"] == "Jugador 1" and rows[0]["status"] == "confirmed"
+
+
+def test_memory_does_not_grow_with_rows():
+    small, large = seed(2000), seed(40000)
+    _, _, small_bytes, small_peak = asyncio.run(collect(small, "players", "ndjson", measure=True))
+    _, _, large_bytes, large_peak = asyncio.run(collect(large, "players", "ndjson", measure=True))
+    print(f"pico: {small_peak / 1024:.0f} KB (2.000 filas) / {large_peak / 1024:.0f} KB (40.000 filas)")
+    assert large_bytes > 15 * small_bytes
+    assert large_peak < 2 * small_peak, (small_peak, large_peak)
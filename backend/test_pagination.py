@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Paginación por cursor de app/pagination.py: ida y vuelta del cursor con cada
+tipo de columna, recorrido completo con empates en la clave de orden (mismo
+nombre o misma fecha, desempata el id) y 400 con cursores inválidos.
+
+    python -m pytest test_pagination.py
+"""
+
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import engine
+from app.pagination import NEXT_CURSOR_HEADER, InvalidCursor, decode_cursor, encode_cursor
+
+
+def walk(api, path: str, headers: dict, limit: int) -> list:
+    """Ids de todas las páginas siguiendo X-Next-Cursor"""
+    ids, params = [], {"limit": limit}
+    while True:
+        response = api.client.get(path, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page) <= limit
+        ids.extend(row["id"] for row in page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_cursor_round_trip():
+    date = datetime(2024, 5, 1, 20, 30)
+    cursor = encode_cursor([date, 7])
+    assert "=" not in cursor  # sin relleno: va tal cual en la query string
+    assert decode_cursor(cursor, crud.MATCH_PAGE_KEYS) == [date, 7]
+    assert decode_cursor(encode_cursor(["Ñúñez José", 3]), crud.PLAYER_PAGE_KEYS) == ["Ñúñez José", 3]
+    assert decode_cursor(encode_cursor([12]), crud.VENUE_PAGE_KEYS) == [12]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", encode_cursor([1]), encode_cursor(["x", "y"])])
+def test_invalid_cursor(api, cursor):
+    # Ilegible, con otra cantidad de valores o con tipos que no convierten
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, crud.PLAYER_PAGE_KEYS)
+    response = api.client.get("/players/", params={"cursor": cursor}, headers=api.headers("admin@prosoccer.cl"))
+    assert response.status_code == 400 and response.json() == {"detail": "Cursor de paginación inválido"}
+
+
+def test_player_pages_with_tied_names(api):
+    with Session(engine) as db:
+        db.add_all([
+            models.Player(user_id=api.ids["admin_user"], team_id=api.ids["team"], position_zone_id=api.ids["zone"],
+                          name="Bea Uno", email=f"bea{i}@prosoccer.cl")
+            for i in range(5)
+        ])
+        db.commit()
+        expected = [player.id for player in db.query(models.Player).order_by(models.Player.name, models.Player.id)]
+
+    headers = api.headers("admin@prosoccer.cl")
+    # Los seis "Bea Uno" quedan repartidos en varias páginas: ninguno se salta ni se repite
+    for limit in (1, 2, 4):
+        assert walk(api, "/players/", headers, limit) == expected
+    assert walk(api, "/players/summary", headers, 2) == expected
+
+
+def test_match_pages_with_tied_dates(api):
+    same_day, later = datetime(2024, 5, 1, 20, 0), datetime(2024, 5, 8, 20, 0)
+    with Session(engine) as db:
+        db.add_all([
+            models.Match(title=f"Partido {i}", date=later if i % 3 == 0 else same_day, match_type="internal_friendly",
+                         created_by=api.ids["admin_user"])
+            for i in range(7)
+        ])
+        db.commit()
+        expected = [match.id for match in db.query(models.Match).order_by(models.Match.date, models.Match.id)]
+
+    assert walk(api, "/matches/", api.headers("admin@prosoccer.cl"), 3) == expected
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Cuenta las consultas de los listados que alimentan PlayerOut, MatchOut y
+compañía, incluida la serialización. Con las opciones *_OUT_OPTIONS de crud.py
+el número es fijo: el mismo con 4 filas que con 24 (sin N+1 por lazy loading).
+
+    python -m pytest test_query_counts.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.fields import FieldPlan, SparseFields
+
+SIZES = (4, 24)
+
+# `?fields=`: load_only + solo las relaciones pedidas; leer una columna diferida fallaría
+PLAYER_PLAN = SparseFields(schemas.PlayerOut, models.Player, crud.PLAYER_RELATION_OPTIONS, always=crud.PLAYER_PAGE_KEYS).plan("id,name,team,position_specific")
+MATCH_PLAN = SparseFields(schemas.MatchOut, models.Match, crud.MATCH_RELATION_OPTIONS, always=crud.MATCH_PAGE_KEYS).plan("title,venue")
+
+# (nombre, llamada a crud con los ids sembrados, esquema de la respuesta)
+SYNC_CASES = [
+    ("get_all_players", lambda db, ids: crud.get_all_players(db), List[schemas.PlayerOut]),
+    ("get_players_by_team", lambda db, ids: crud.get_players_by_team(db, ids["team"]), List[schemas.PlayerOut]),
+    ("get_available_players_for_match", lambda db, ids: crud.get_available_players_for_match(db, ids["match"]), List[schemas.PlayerOut]),
+    ("get_team_with_players", lambda db, ids: crud.get_team_with_players(db, ids["team"]), schemas.TeamWithPlayers),
+    ("get_matches", lambda db, ids: crud.get_matches(db), List[schemas.MatchOut]),
+    ("get_player_attendance", lambda db, ids: crud.get_player_attendance(db, ids["match"]), List[schemas.PlayerAttendanceOut]),
+    ("get_confirmed_players_for_match", lambda db, ids: crud.get_confirmed_players_for_match(db, ids["match"]), List[schemas.PlayerAttendanceOut]),
+    ("get_match_events", lambda db, ids: crud.get_match_events(db, ids["match"]), List[schemas.MatchEventOut]),
+    ("get_championship_standings", lambda db, ids: crud.get_championship_standings(db, ids["championship"]), List[schemas.ChampionshipTeamOut]),
+    ("get_user_notifications", lambda db, ids: crud.get_user_notifications(db, ids["user"]), List[schemas.NotificationOut]),
+]
+
+ASYNC_CASES = [
+    ("get_players_async", lambda db, ids: crud.get_players_async(db), List[schemas.PlayerOut]),
+    ("get_players_by_team_async", lambda db, ids: crud.get_players_by_team_async(db, ids["team"]), List[schemas.PlayerOut]),
+    ("get_team_with_players_async", lambda db, ids: crud.get_team_with_players_async(db, ids["team"]), schemas.TeamWithPlayers),
+    ("get_matches_async", lambda db, ids: crud.get_matches_async(db), List[schemas.MatchOut]),
+    ("get_player_attendance_async", lambda db, ids: crud.get_player_attendance_async(db, ids["match"]), List[schemas.PlayerAttendanceOut]),
+    ("get_confirmed_players_for_match_async", lambda db, ids: crud.get_confirmed_players_for_match_async(db, ids["match"]), List[schemas.PlayerOut]),
+    ("get_user_notifications_async", lambda db, ids: crud.get_user_notifications_async(db, ids["user"]), List[schemas.NotificationOut]),
+    ("get_player_summaries_async", lambda db, ids: crud.get_player_summaries_async(db), List[schemas.PlayerSummary]),
+    ("get_players_async(fields)", lambda db, ids: crud.get_players_async(db, options=PLAYER_PLAN.options), PLAYER_PLAN),
+    ("get_matches_async(fields)", lambda db, ids: crud.get_matches_async(db, options=MATCH_PLAN.options), MATCH_PLAN),
+    ("get_player_summaries_async(match_id)", lambda db, ids: crud.get_player_summaries_async(db, match_id=ids["match"]), List[schemas.PlayerSummary]),
+]
+
+
+def seed(db: Session, size: int) -> dict:
+    """`size` jugadores, cada uno con usuario, equipo y posición propios en lo posible"""
+    zone = models.PositionZone(abbreviation="MED", name_es="Mediocampo", name_en="Midfield")
+    specifics = [models.PositionSpecific(abbreviation=f"M{i}", name_es=f"Medio {i}", name_en=f"Mid {i}", zone=zone) for i in range(3)]
+    teams = [models.Team(name=f"Equipo {i}") for i in range(size // 2 + 1)]
+    championship = models.Championship(name="Liga", season="2026", start_date=datetime(2026, 1, 1), end_date=datetime(2026, 12, 31))
+    db.add_all([zone, *specifics, *teams, championship])
+    db.flush()
+
+    users, players, matches = [], [], []
+    for i in range(size):
+        user = models.User(email=f"jugador{i}@prosoccer.cl", hashed_password="x")
+        # La mitad en el primer equipo, el resto repartido
+        team = teams[0] if i < size // 2 else teams[1 + i % (len(teams) - 1)]
+        player = models.Player(
+            user=user, team_id=team.id, position_zone_id=zone.id, position_specific_id=specifics[i % 3].id,
+            name=f"Jugador {i}", email=user.email,
+        )
+        venue = models.Venue(name=f"Cancha {i}")
+        match = models.Match(
+            title=f"Partido {i}", date=datetime(2026, 1, 1) + timedelta(days=i), match_type="internal_friendly",
+            venue=venue, creator=user, home_team_id=team.id, away_team_id=teams[0].id,
+        )
+        users.append(user)
+        players.append(player)
+        matches.append(match)
+    db.add_all(users + players + matches)
+    db.flush()
+
+    first_match = matches[0]
+    for i, player in enumerate(players):
+        db.add(models.PlayerAttendance(match_id=first_match.id, player_id=player.id, status="confirmed"))
+        db.add(models.MatchEvent(match_id=first_match.id, player_id=player.id, event_type="goal", minute=i, team_side="home"))
+        db.add(models.Notification(type="match_update", title="t", message="m", recipient_id=users[0].id, match_id=matches[i].id))
+    for team in teams:
+        db.add(models.ChampionshipTeam(championship_id=championship.id, team_id=team.id))
+    db.commit()
+    return {"team": teams[0].id, "match": first_match.id, "championship": championship.id, "user": users[0].id}
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def serialize(schema, result):
+    if isinstance(schema, FieldPlan):
+        return schema.dump_json(result)
+    return TypeAdapter(schema).validate_python(result, from_attributes=True)
+
+
+def measure(size: int) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "counts.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        ids = seed(db, size)
+
+    counts = {}
+    counter = QueryCounter(engine)
+    for name, call, schema in SYNC_CASES:
+        with Session(engine) as db:
+            counter.count = 0
+            result = call(db, ids)
+            serialize(schema, result)
+            counts[name] = counter.count
+
+    async def measure_async():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async_counter = QueryCounter(async_engine.sync_engine)
+        for name, call, schema in ASYNC_CASES:
+            async with AsyncSession(async_engine) as db:
+                async_counter.count = 0
+                result = await call(db, ids)
+                serialize(schema, result)  # un lazy load aquí fallaría con MissingGreenlet
+                counts[name] = async_counter.count
+        await async_engine.dispose()
+
+    asyncio.run(measure_async())
+    engine.dispose()
+    return counts
+
+
+def test_query_count_does_not_grow_with_rows():
+    small, large = (measure(size) for size in SIZES)
+    for name in small:
+        print(f"{name:40} {small[name]:3} consultas")
+    grown = {name: (small[name], large[name]) for name in small if large[name] != small[name]}
+    assert not grown, f"Consultas que crecen con las filas ({SIZES[0]} -> {SIZES[1]}): {grown}"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Token bucket de app/rate_limit.py con el backend local y un reloj simulado.
+
+    python -m pytest test_rate_limit.py
+"""
+
+import asyncio
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app.rate_limit import LocalBuckets, RateLimited, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock, max_keys=100):
+    return RateLimiter(LocalBuckets(max_keys, clock=clock), {"ip": (3, 60), "account": (2, 6)})
+
+
+def test_burst_then_retry_after():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.check(ip="10.0.0.1")
+        with pytest.raises(RateLimited) as rejected:
+            await limiter.check(ip="10.0.0.1")
+        assert rejected.value.scope == "ip" and rejected.value.retry_after == 1  # 1 ficha por segundo
+        await limiter.check(ip="10.0.0.2")  # otra IP tiene su propio balde
+        clock.now += 1
+        await limiter.check(ip="10.0.0.1")
+
+    asyncio.run(scenario())
+    assert limiter.allowed == 5 and limiter.rejected == {"ip": 1, "account": 0}
+
+
+def test_account_limit_applies_across_ips():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    async def scenario():
+        await limiter.check(ip="10.0.0.1", account="a")
+        await limiter.check(ip="10.0.0.2", account="a")
+        with pytest.raises(RateLimited) as rejected:
+            await limiter.check(ip="10.0.0.3", account="a")
+        assert rejected.value.scope == "account" and rejected.value.retry_after == 10  # 6 por minuto
+
+    asyncio.run(scenario())
+
+
+def test_local_backend_is_bounded():
+    clock = FakeClock()
+    limiter = make_limiter(clock, max_keys=10)
+
+    async def scenario():
+        for i in range(50):
+            await limiter.check(ip=f"10.0.0.{i}")
+
+    asyncio.run(scenario())
+    assert limiter.stats()["keys"] == 10
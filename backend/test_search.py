@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Búsqueda de jugadores (crud.search_players_async, app/search.py) sobre una base
+SQLite migrada: sin tildes ni mayúsculas, prefijo antes que coincidencias
+aproximadas, filtros, alcance por equipo, triggers de la tabla FTS5, planes
+de consulta que usan los índices y topes para búsquedas largas.
+
+    python -m pytest test_search.py
+"""
+
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app import crud, migrations, models
+from app.config import SEARCH_FUZZY_MAX_CLAUSES, SEARCH_FUZZY_MAX_WORDS, SEARCH_MAX_QUERY_LENGTH
+from app.search import fts_fuzzy_query, normalize_name
+
+NAMES = [
+    ("José Martínez", "Chile", 1, 70),
+    ("Josefina Peña", "Chile", 2, 60),
+    ("Ángel Di María", "Argentina", 3, 85),
+    ("María José Ñúñez", "Chile", 2, 40),
+    ("Pedro Josué Rojas", "Perú", 4, 55),
+    ("Martín Gómez", "Argentina", 1, 65),
+]
+
+
+def seed() -> str:
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    migrations.upgrade(engine)  # siembra las zonas: 1 POR, 2 DEF, 3 MED, 4 DEL
+    with engine.begin() as conn:
+        conn.execute(insert(models.Team.__table__), [{"id": 1, "name": "Uno"}, {"id": 2, "name": "Dos"}])
+        conn.execute(insert(models.User.__table__), [{"id": 1, "email": "admin@prosoccer.cl", "hashed_password": "x"}])
+    # Por el ORM, para que @validates calcule search_name
+    with Session(engine) as db:
+        db.add_all([
+            models.Player(id=i, user_id=1, team_id=1 + i % 2, name=name, email=f"j{i}@prosoccer.cl",
+                          nationality=nationality, position_zone_id=zone, skill_level=skill, rit=skill)
+            for i, (name, nationality, zone, skill) in enumerate(NAMES, start=1)
+        ])
+        db.add(models.Player(user_id=1, name="José Inactivo", email="inactivo@prosoccer.cl", position_zone_id=1, is_active=False))
+        db.commit()
+    engine.dispose()
+    return path
+
+
+def search(path: str, **kwargs):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with AsyncSession(engine) as db:
+            results = await crud.search_players_async(db, **kwargs)
+        await engine.dispose()
+        return [(row.name, kind) for row, kind, _ in results]
+    return asyncio.run(run())
+
+
+def test_normalize_name():
+    assert normalize_name("  José  MARTÍNEZ-Peña ") == "jose martinez pena"
+    assert normalize_name("Ñúñez") == "nunez"
+
+
+def test_accents_prefix_and_fuzzy():
+    path = seed()
+    results = search(path, q="JOSE")
+    # Primero los que empiezan con "jose", luego palabra completa, luego contenido
+    assert results[:2] == [("José Martínez", "prefix"), ("Josefina Peña", "prefix")]
+    assert ("María José Ñúñez", "word") in results and ("Pedro Josué Rojas", "contains") not in results
+    assert "José Inactivo" not in [name for name, _ in results]
+
+    assert search(path, q="nunez") == [("María José Ñúñez", "word")]
+    # Error de tipeo: solo por trigramas
+    assert search(path, q="martnez")[0] == ("José Martínez", "fuzzy")
+
+
+def test_filters_and_scope():
+    path = seed()
+    assert [name for name, _ in search(path, q="mar", nationality="Argentina")] == ["Martín Gómez", "Ángel Di María"]
+    # Sin q el orden es el de /players/ (name, id), que depende de la intercalación
+    assert {name for name, _ in search(path, skill_min=60, skill_max=70)} == {"José Martínez", "Josefina Peña", "Martín Gómez"}
+    assert [name for name, _ in search(path, position_zone_id=2, minimums={"rit": 50})] == ["Josefina Peña"]
+    assert search(path, q="jose", scope=models.Player.team_id == 2) == [("José Martínez", "prefix"), ("Pedro Josué Rojas", "fuzzy")]
+
+
+def test_triggers_follow_updates():
+    path = seed()
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as db:
+        db.get(models.Player, 6).name = "Martín Zúñiga"
+        db.commit()
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM players WHERE id = 2"))
+    engine.dispose()
+    assert search(path, q="zuniga") == [("Martín Zúñiga", "word")]
+    assert "Josefina Peña" not in [name for name, _ in search(path, q="josefina")]
+
+
+def test_query_plans_use_indexes():
+    path = seed()
+    engine = create_engine(f"sqlite:///{path}")
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    async def run():
+        async with AsyncSession(async_engine) as db:
+            await crud.search_players_async(db, q="martnez", limit=5)
+        await async_engine.dispose()
+    asyncio.run(run())
+
+    assert len(statements) == 3  # prefijo, contiene, trigramas
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            # players se lee por índice o por rowid; la tabla FTS5 se recorre con MATCH
+            assert not any(step.split()[:2] == ["SCAN", "players"] for step in plan), plan
+    engine.dispose()
+
+
+def test_fuzzy_query_caps():
+    # 4 trigramas por palabra, comparten 2: C(4, 2) + C(4, 2) = 12 combinaciones
+    assert fts_fuzzy_query("zuniga ibanes", SEARCH_FUZZY_MAX_WORDS, SEARCH_FUZZY_MAX_CLAUSES).count(" OR ") == 10
+    # 26 trigramas distintos darían C(26, 3) = 2.600 combinaciones; cinco palabras superan el tope
+    assert fts_fuzzy_query((string.ascii_lowercase * 3)[:60], SEARCH_FUZZY_MAX_WORDS, SEARCH_FUZZY_MAX_CLAUSES) is None
+    assert fts_fuzzy_query("ana bea eva ivo uma", SEARCH_FUZZY_MAX_WORDS, SEARCH_FUZZY_MAX_CLAUSES) is None
+
+
+def test_long_random_query_is_fast_or_rejected(api):
+    headers = api.headers("admin@prosoccer.cl")
+    random.seed(25)
+    letters = string.ascii_lowercase
+    queries = [
+        "".join(random.choices(letters, k=SEARCH_MAX_QUERY_LENGTH)),
+        " ".join("".join(random.choices(letters, k=12)) for _ in range(5)),
+        "".join(random.choices(letters, k=14)) + " ana",
+    ]
+    for q in queries:
+        start = time.perf_counter()
+        response = api.client.get("/players/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200 and time.perf_counter() - start < 1, q
+    assert [row["name"] for row in api.client.get("/players/search", params={"q": "carla dos"}, headers=headers).json()] == ["Carla Dos"]
+
+    response = api.client.get("/players/search", params={"q": "a" * (SEARCH_MAX_QUERY_LENGTH + 1)}, headers=headers)
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+ORMSerializer (FAST_JSON_RESPONSES) debe producir el mismo JSON que pydantic
+para los esquemas de los listados grandes, con y sin orjson.
+
+    python -m pytest test_serialization.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas, serialization
+from app.serialization import ORMSerializer
+from test_query_counts import seed
+
+
+def pydantic_json(schema, value):
+    adapter = TypeAdapter(schema)
+    return json.loads(adapter.dump_json(adapter.validate_python(value, from_attributes=True)))
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_same_json_as_pydantic(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson no está instalado")
+
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serialization.db')}")
+    models.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        ids = seed(db, 6)
+    with Session(engine) as db:
+        players = crud.get_all_players(db)
+        matches = crud.get_matches(db)
+        team = crud.get_team_with_players(db, ids["team"])
+
+        assert json.loads(ORMSerializer(schemas.PlayerOut).dump_json_list(players)) == pydantic_json(List[schemas.PlayerOut], players)
+        assert json.loads(ORMSerializer(schemas.MatchOut).dump_json_list(matches)) == pydantic_json(List[schemas.MatchOut], matches)
+        assert json.loads(ORMSerializer(schemas.TeamWithPlayers).dump_json(team)) == pydantic_json(schemas.TeamWithPlayers, team)
+    engine.dispose()
+
+
+def test_active_encoder_is_reported(api):
+    response = api.client.get("/admin/cache", headers=api.headers("admin@prosoccer.cl"))
+    expected = "orjson" if serialization.orjson is not None else "json"
+    assert serialization.ENCODER == expected and response.json()["json"]["encoder"] == expected
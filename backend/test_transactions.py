@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Escrituras de varias filas en una sola transacción (database.unit_of_work):
+registro de jugador (usuario + jugador) y generación de equipos (partido + dos
+equipos + jugadores reasignados). Si algo falla no queda nada a medias.
+
+    python -m pytest test_transactions.py
+"""
+
+import os
+import sys
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import engine, unit_of_work
+
+
+def registration(api, email: str) -> dict:
+    return {"full_name": "Nueva Jugadora", "email": email, "position_zone": "MED", "team_id": api.ids["team"]}
+
+
+def users_with_email(email: str) -> int:
+    with Session(engine) as db:
+        return db.query(models.User).filter_by(email=email).count()
+
+
+def test_nested_units_commit_once():
+    commits = []
+    with Session(engine) as db:
+        event.listen(db, "after_commit", lambda session: commits.append(session))
+        with unit_of_work(db):
+            with unit_of_work(db):
+                pass
+            assert commits == []
+        assert len(commits) == 1
+
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                raise RuntimeError("falla")
+        assert len(commits) == 1 and db.info["unit_of_work"] == 0
+
+
+def test_register_player_commits_user_and_player(api):
+    response = api.client.post("/players/register/", json=registration(api, "nueva@prosoccer.cl"))
+    assert response.status_code == 200, response.text
+    with Session(engine) as db:
+        user = db.query(models.User).filter_by(email="nueva@prosoccer.cl").one()
+        player = db.get(models.Player, response.json()["id"])
+        assert (player.user_id, player.email) == (user.id, "nueva@prosoccer.cl")
+
+    # El mismo email otra vez, ahora como usuario existente
+    assert api.client.post("/players/register/", json=registration(api, "nueva@prosoccer.cl")).status_code == 400
+
+
+def test_register_with_existing_player_email(api):
+    # ana@ es el email de un jugador, no de un usuario (su usuario es jugador@)
+    assert users_with_email("ana@prosoccer.cl") == 0
+    response = api.client.post("/players/register/", json=registration(api, "ana@prosoccer.cl"))
+    assert response.status_code == 400 and response.json()["detail"] == "El email ya está registrado"
+    assert users_with_email("ana@prosoccer.cl") == 0
+
+
+def test_failing_player_insert_leaves_no_user(api, monkeypatch):
+    # Sin la consulta previa el INSERT del jugador choca con el índice único: rollback del usuario
+    monkeypatch.setattr(crud, "get_player_by_email", lambda db, email: None)
+    response = api.client.post("/players/register/", json=registration(api, "ana@prosoccer.cl"))
+    assert response.status_code == 400 and response.json()["detail"] == "El email ya está registrado"
+    assert users_with_email("ana@prosoccer.cl") == 0
+
+
+def create_match(api) -> int:
+    with Session(engine) as db:
+        match = models.Match(title="Pichanga", date=datetime(2024, 5, 1, 20, 0), match_type="internal_friendly", created_by=api.ids["admin_user"])
+        db.add(match)
+        db.commit()
+        return match.id
+
+
+def test_generate_teams_commits_match_and_teams(api):
+    match_id = create_match(api)
+    body = {"team_a_players": [api.ids["player"], api.ids["teammate"]], "team_b_players": [api.ids["rival"]]}
+    response = api.client.post(f"/matches/{match_id}/generate-teams/", json=body, headers=api.headers("admin@prosoccer.cl"))
+    assert response.status_code == 200, response.text
+
+    with Session(engine) as db:
+        match = db.get(models.Match, response.json()["id"])
+        assert match.id != match_id and match.title == "Pichanga"
+        team_a, team_b = db.get(models.Team, match.generated_team_a_id), db.get(models.Team, match.generated_team_b_id)
+        assert (team_a.name, team_b.name) == ("Equipo A - Pichanga", "Equipo B - Pichanga")
+        teams = {player.id: player.team_id for player in db.query(models.Player)}
+        assert teams == {api.ids["player"]: team_a.id, api.ids["teammate"]: team_a.id, api.ids["rival"]: team_b.id}
+
+
+def test_failed_team_generation_writes_nothing(api, monkeypatch):
+    match_id = create_match(api)
+
+    def failing_save(db, *instances):
+        raise RuntimeError("falla al confirmar")
+
+    # El partido y los equipos ya tienen id (flush) cuando falla el último paso
+    monkeypatch.setattr(crud, "save", failing_save)
+    with Session(engine) as db:
+        match_data = {"title": "Pichanga", "date": datetime(2024, 5, 1, 20, 0), "match_type": "internal_friendly", "created_by": api.ids["admin_user"]}
+        with pytest.raises(RuntimeError):
+            crud.create_match_with_teams(db, match_data, [api.ids["player"]], [api.ids["rival"]])
+
+    with Session(engine) as db:
+        assert [match.id for match in db.query(models.Match)] == [match_id]
+        assert db.query(models.Team).filter(models.Team.name.like("Equipo %")).count() == 0
+        assert db.get(models.Player, api.ids["rival"]).team_id == api.ids["other_team"]